@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of building the response of "/api/credential".
+
+Compares Auth.credential with the former lazy-loading and "NOT IN" based query
+on a SQLite database with many applications.
+
+    python -m benchmarks.credential [num_applications]
+"""
+
+
+import os
+import sys
+import tempfile
+import timeit
+
+from rekcurd_dashboard.auth import Auth
+from rekcurd_dashboard.core import create_app
+from rekcurd_dashboard.models import (
+    db, ProjectModel, ApplicationModel, UserModel, ProjectUserRoleModel, ProjectRole,
+    ApplicationUserRoleModel, ApplicationRole
+)
+
+
+USER_ID = 1
+SETTINGS = """
+port: 18080
+kube_config_dir: kube-config
+db:
+  mode: sqlite
+evaluation_cache:
+  max_size_mb: 0
+"""
+
+
+def credential_with_not_in(user_id):
+    user_model = db.session.query(UserModel).filter(UserModel.user_id == user_id).one_or_none()
+    projects = [{'project_id': pr.project_id, 'project_role': pr.project_role.name}
+                for pr in user_model.project_roles]
+    applications = [{'application_id': ar.application_id, 'application_role': ar.application_role.name}
+                    for ar in user_model.application_roles]
+    application_ids = db.session.query(ApplicationUserRoleModel.application_id).distinct().all()
+    ids = [application_id for application_id, in application_ids]
+    public_applications = db.session.query(ApplicationModel).filter(
+        ~ApplicationModel.application_id.in_(ids)).all()
+    applications += [
+        {'application_id': application.application_id, 'role': ApplicationRole.admin.name}
+        for application in public_applications]
+    return {'user': user_model.serialize, 'projects': projects, 'applications': applications}
+
+
+def populate(num_applications: int):
+    db.create_all()
+    db.session.add(ProjectModel(project_id=1, display_name='benchmark'))
+    db.session.add(UserModel(user_id=USER_ID, auth_id='benchmark', user_name='benchmark'))
+    db.session.add(UserModel(user_id=USER_ID + 1, auth_id='other', user_name='other'))
+    db.session.flush()
+    db.session.add(ProjectUserRoleModel(project_id=1, user_id=USER_ID, project_role=ProjectRole.admin))
+    db.session.bulk_save_objects([
+        ApplicationModel(application_id='application-{}'.format(i), application_name='application-{}'.format(i),
+                         project_id=1)
+        for i in range(num_applications)])
+    # a tenth of the applications have ACL, and the user has roles of half of them
+    db.session.add_all([
+        ApplicationUserRoleModel(application_id='application-{}'.format(i), user_id=USER_ID + i % 20 // 10,
+                                 application_role=ApplicationRole.editor)
+        for i in range(0, num_applications, 10)])
+    db.session.commit()
+
+
+def main(num_applications: int = 10000, repeat: int = 5):
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['REKCURD_DASHBOARD_ROOT'] = directory
+        config_file = os.path.join(directory, 'settings.yml')
+        with open(config_file, 'w') as f:
+            f.write(SETTINGS)
+        app, _ = create_app(config_file)
+        auth = Auth()
+        with app.app_context():
+            populate(num_applications)
+
+            def credential():
+                # roles are cached across requests, so measure a request with a cold cache
+                auth.role_cache.invalidate()
+                return auth.credential(USER_ID)
+
+            def sort(response):
+                return sorted(response['applications'], key=lambda application: application['application_id'])
+
+            assert sort(credential_with_not_in(USER_ID)) == sort(credential())
+            for name, func in (('NOT IN', credential_with_not_in),
+                               ('Auth.credential', lambda _: credential())):
+                def run():
+                    with app.app_context():
+                        func(USER_ID)
+                        db.session.remove()
+                elapsed = min(timeit.repeat(run, number=1, repeat=repeat))
+                print('{:<20}{:>10.1f} ms'.format(name, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of decoding EvaluationResultResponse into detail dicts.
+
+Compares RekcurdDashboardClient.decode_evaluation_details with the former
+protobuf_to_dict based decoding.
+
+    python -m benchmarks.evaluation_result_decoding [num_details]
+"""
+
+
+import sys
+import timeit
+
+from protobuf_to_dict import protobuf_to_dict
+
+from rekcurd_dashboard.core import RekcurdDashboardClient
+from rekcurd_dashboard.protobuf import rekcurd_pb2
+
+
+def get_value_from_io(io: rekcurd_pb2.IO):
+    val = io.str.val if io.WhichOneof('io_oneof') == 'str' else io.tensor.val
+    return val[0] if len(val) == 1 else list(val)
+
+
+def decode_with_protobuf_to_dict(raw_response: rekcurd_pb2.EvaluationResultResponse):
+    details = []
+    for detail in raw_response.detail:
+        details.append(dict(
+            protobuf_to_dict(detail, including_default_value_fields=True),
+            input=get_value_from_io(detail.input),
+            label=get_value_from_io(detail.label),
+            output=get_value_from_io(detail.output),
+            score=detail.score[0] if len(detail.score) == 1 else list(detail.score)
+        ))
+    response = protobuf_to_dict(raw_response, including_default_value_fields=True)
+    response['detail'] = details
+    return response['detail']
+
+
+def create_response(num_details: int) -> rekcurd_pb2.EvaluationResultResponse:
+    details = []
+    for i in range(num_details):
+        if i % 2 == 0:
+            details.append(rekcurd_pb2.EvaluationResultResponse.Detail(
+                input=rekcurd_pb2.IO(str=rekcurd_pb2.ArrString(val=['input text {}'.format(i)])),
+                label=rekcurd_pb2.IO(str=rekcurd_pb2.ArrString(val=['label'])),
+                output=rekcurd_pb2.IO(str=rekcurd_pb2.ArrString(val=['label'])),
+                score=[0.9], is_correct=True))
+        else:
+            details.append(rekcurd_pb2.EvaluationResultResponse.Detail(
+                input=rekcurd_pb2.IO(tensor=rekcurd_pb2.Tensor(shape=[8], val=[0.1 * j for j in range(8)])),
+                label=rekcurd_pb2.IO(tensor=rekcurd_pb2.Tensor(shape=[2], val=[0.0, 1.0])),
+                output=rekcurd_pb2.IO(tensor=rekcurd_pb2.Tensor(shape=[2], val=[1.0, 0.0])),
+                score=[0.6, 0.4], is_correct=False))
+    return rekcurd_pb2.EvaluationResultResponse(detail=details)
+
+
+def main(num_details: int = 10000, repeat: int = 5):
+    raw_response = create_response(num_details)
+    assert decode_with_protobuf_to_dict(raw_response) == RekcurdDashboardClient.decode_evaluation_details(raw_response)
+    for name, func in (('protobuf_to_dict', decode_with_protobuf_to_dict),
+                       ('decode_evaluation_details', RekcurdDashboardClient.decode_evaluation_details)):
+        elapsed = min(timeit.repeat(lambda: func(raw_response), number=1, repeat=repeat))
+        print('{:<28}{:>10.1f} ms  ({:.2f} us/detail)'.format(name, elapsed * 1000, elapsed * 1e6 / num_details))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -317,24 +317,39 @@ export interface EvaluateParam {
   modelId: number
   evaluationId: number
 }
-export async function evaluate(params: EvaluateParam) {
+const EVALUATION_JOB_POLLING_INTERVAL = 3000
+
+/**
+ * Submit an evaluation job and wait for it to finish
+ *
+ * Evaluation runs in background on the server, so that the request does not
+ * hit proxy timeouts for large evaluation data. The job is polled until it succeeds or fails.
+ */
+async function runEvaluationJob(params: EvaluateParam, overwrite: boolean) {
+  const entryPoint = `${process.env.API_HOST}:${process.env.API_PORT}/api/projects/${params.projectId}/applications/${params.applicationId}/evaluation_jobs`
   const requestBody = {
-    ...params
+    ...params,
+    overwrite
   }
 
-  const convert = (result) => result.status
+  const jobId: number = await APICore.formDataRequest(entryPoint, requestBody, (result) => result.job_id, 'POST')
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, EVALUATION_JOB_POLLING_INTERVAL))
+    const job = await APICore.getRequest(`${entryPoint}/${jobId}`)
+    if (job.status === 'succeeded') {
+      return true
+    } else if (job.status === 'failed') {
+      throw new APICore.APIError(job.message || 'Evaluation failed')
+    }
+  }
+}
 
-  return APICore.formDataRequest(`${process.env.API_HOST}:${process.env.API_PORT}/api/projects/${params.projectId}/applications/${params.applicationId}/evaluate`, requestBody, convert, 'POST')
+export async function evaluate(params: EvaluateParam) {
+  return runEvaluationJob(params, false)
 }
 
 export async function reEvaluate(params: EvaluateParam) {
-  const requestBody = {
-    ...params
-  }
-
-  const convert = (result) => result.status
-
-  return APICore.formDataRequest(`${process.env.API_HOST}:${process.env.API_PORT}/api/projects/${params.projectId}/applications/${params.applicationId}/evaluate`, requestBody, convert, 'PUT')
+  return runEvaluationJob(params, true)
 }
 
 // GET APIs
@@ -1,8 +1,11 @@
 from flask_jwt_simple import get_jwt_identity
 from flask_restplus import Resource, Namespace, fields, reqparse
 
-from rekcurd_dashboard.models import db, UserModel, ApplicationRole, ProjectUserRoleModel, ApplicationUserRoleModel
+from rekcurd_dashboard.models import (
+    db, UserModel, ApplicationRole, ProjectUserRoleModel, ApplicationUserRoleModel, update_acl_enabled
+)
 from rekcurd_dashboard.utils import RekcurdDashboardException
+from rekcurd_dashboard.auth import auth
 from . import status_model
 
 
@@ -61,6 +64,7 @@ class ApiProjectIdACL(Resource):
                 project_role=role)
             db.session.add(project_user_role_model)
             db.session.commit()
+            auth.role_cache.invalidate(user_model.user_id)
             db.session.close()
             return {"status": True, "message": "Success."}, 200
         else:
@@ -79,6 +83,7 @@ class ApiProjectIdACL(Resource):
             ProjectUserRoleModel.user_id == user_model.user_id).first_or_404()
         project_user_role_model.project_role = args['role']
         db.session.commit()
+        auth.role_cache.invalidate(user_model.user_id)
         db.session.close()
         return {"status": True, "message": "Success."}, 200
 
@@ -95,6 +100,7 @@ class ApiProjectIdUserIdACL(Resource):
             ProjectUserRoleModel.project_id == project_id,
             ProjectUserRoleModel.user_id == user_model.user_id).delete()
         db.session.commit()
+        auth.role_cache.invalidate(user_model.user_id)
         db.session.close()
         return {"status": True, "message": "Success."}, 200
 
@@ -146,6 +152,8 @@ class ApiApplicationIdACL(Resource):
             db.session.add(application_user_role_model)
             db.session.commit()
             db.session.close()
+            # the first role of an application changes the roles of all the users
+            auth.role_cache.invalidate()
             return {"status": True, "message": "Success."}, 200
         else:
             raise RekcurdDashboardException("Already assigned.")
@@ -163,6 +171,7 @@ class ApiApplicationIdACL(Resource):
             ApplicationUserRoleModel.user_id == user_model.user_id).first_or_404()
         application_user_role_model.application_role = args['role']
         db.session.commit()
+        auth.role_cache.invalidate(user_model.user_id)
         db.session.close()
         return {"status": True, "message": "Success."}, 200
 
@@ -178,6 +187,9 @@ class ApiApplicationIdUserIdACL(Resource):
         ApplicationUserRoleModel.query.filter(
             ApplicationUserRoleModel.application_id == application_id,
             ApplicationUserRoleModel.user_id == user_model.user_id).delete()
+        update_acl_enabled(db.session.connection(), application_id)
         db.session.commit()
         db.session.close()
+        # removing the last role of an application changes the roles of all the users
+        auth.role_cache.invalidate()
         return {"status": True, "message": "Success."}, 200
@@ -7,6 +7,7 @@ from . import api, status_model, delete_kubernetes_deployment, delete_secret, GI
 from rekcurd_dashboard.models import db, ProjectModel, ApplicationModel, ApplicationUserRoleModel, ApplicationRole, KubernetesModel, ServiceModel
 from rekcurd_dashboard.utils import RekcurdDashboardException
 from rekcurd_dashboard.apis import DatetimeToTimestamp
+from rekcurd_dashboard.auth import auth
 
 
 application_api_namespace = Namespace('applications', description='Application API Endpoint.')
@@ -83,6 +84,9 @@ class ApiApplications(Resource):
 
         db.session.commit()
         db.session.close()
+        if api.dashboard_config.IS_ACTIVATE_AUTH:
+            # other users regard an application without roles as theirs
+            auth.role_cache.invalidate()
         return {"status": True, "message": "Success."}
 
 
@@ -1,6 +1,7 @@
 from flask_restplus import Namespace, fields, Resource, reqparse, inputs
 
 from . import status_model
+from rekcurd_dashboard.data_servers import DataServer
 from rekcurd_dashboard.models import db, DataServerModel, DataServerModeEnum
 from rekcurd_dashboard.utils import RekcurdDashboardException
 from rekcurd_dashboard.apis import DatetimeToTimestamp
@@ -285,6 +286,7 @@ class ApiDataServers(Resource):
 
         if is_updated:
             db.session.commit()
+            DataServer.invalidate_clients(project_id)
         db.session.close()
         return {"status": True, "message": "Success."}
 
@@ -293,5 +295,6 @@ class ApiDataServers(Resource):
         """delete_data_server"""
         db.session.query(DataServerModel).filter(DataServerModel.project_id == project_id).delete()
         db.session.commit()
+        DataServer.invalidate_clients(project_id)
         db.session.close()
         return {"status": True, "message": "Success."}
@@ -1,23 +1,26 @@
+import base64
 import datetime
-import tempfile
-from itertools import chain
-import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from typing import Optional, Tuple
 
-from flask import abort, send_file
-from flask_restplus import Namespace, fields, Resource, reqparse
+from flask import abort, current_app, request, Response, stream_with_context
+from flask_restplus import Namespace, fields, inputs, marshal, Resource, reqparse
 from flask_jwt_simple import get_jwt_identity
-from werkzeug.datastructures import FileStorage
-from werkzeug.exceptions import NotFound
+from werkzeug.datastructures import FileStorage, Headers, ContentRange
+from werkzeug.exceptions import NotFound, RequestedRangeNotSatisfiable
 
-from . import DatetimeToTimestamp, status_model
+from . import api, DatetimeToTimestamp, Heartbeat, status_model
 from .api_model import model_model_params
 from rekcurd_dashboard.data_servers import DataServer
 from rekcurd_dashboard.models import (db, ApplicationModel, ServiceModel, EvaluationModel,
                                       EvaluationResultModel, DataServerModel, DataServerModeEnum,
-                                      ApplicationRole, ModelModel)
-from rekcurd_dashboard.core import RekcurdDashboardClient
-from rekcurd_dashboard.utils import HashUtil, RekcurdDashboardException, ApplicationUserRoleException
+                                      ApplicationRole, ModelModel, EvaluationJobModel, EvaluationJobStatus)
+from rekcurd_dashboard.core import RekcurdDashboardClient, evaluation_detail_cache
+from rekcurd_dashboard.utils import HashUtil, HashingReader, ConcurrentUtil, RekcurdDashboardException, ApplicationUserRoleException
 from rekcurd_dashboard.auth import auth, fetch_application_role
 
 
@@ -103,8 +106,98 @@ evaluation_detail = evaluation_api_namespace.model('EvaluationDetail', {
 evaluation_detail_params = evaluation_api_namespace.model('EvaluationResultDetail', {
     'status': fields.Boolean(required=True),
     'metrics': fields.Nested(eval_metrics, readOnly=True),
-    'details': fields.List(fields.Nested(evaluation_detail, readOnly=True), readOnly=True)
+    'details': fields.List(fields.Nested(evaluation_detail, readOnly=True), readOnly=True),
+    'next_offset': fields.Integer(description='Offset of the next page. Null if there are no more details.')
 })
+evaluation_summary = evaluation_api_namespace.model('EvaluationResultSummary', {
+    'evaluation_result_id': fields.Integer(readOnly=True, description='Evaluation Result ID.'),
+    'model_id': fields.Integer(readOnly=True, description='Model ID.'),
+    'evaluation_id': fields.Integer(readOnly=True, description='Evaluation ID.'),
+    'num': fields.Integer(readOnly=True, description='number of evaluated data'),
+    'accuracy': fields.Float(readOnly=True, description='accuracy of evaluation'),
+    'fvalue_mean': fields.Float(readOnly=True, description='mean of F-values of labels'),
+    'register_date': DatetimeToTimestamp(readOnly=True, description='Register date'),
+    'result': fields.Nested(eval_metrics, readOnly=True, allow_null=True,
+                            description='Given if "include_result" is true.')
+})
+evaluation_summary_params = evaluation_api_namespace.model('EvaluationResultSummaries', {
+    'results': fields.List(fields.Nested(evaluation_summary)),
+    'next_cursor': fields.String(description='Cursor of the next page. Null if there are no more results.')
+})
+evaluation_job_submitted = evaluation_api_namespace.model('EvaluationJobSubmitted', {
+    'status': fields.Boolean(required=True),
+    'message': fields.String(required=False),
+    'job_id': fields.Integer(required=True, description='ID of evaluation job')
+})
+evaluation_job_params = evaluation_api_namespace.model('EvaluationJob', {
+    'job_id': fields.Integer(
+        readOnly=True,
+        description='Evaluation job ID.'
+    ),
+    'application_id': fields.String(
+        readOnly=True,
+        description='Application ID.'
+    ),
+    'model_id': fields.Integer(
+        readOnly=True,
+        description='Model ID.'
+    ),
+    'evaluation_id': fields.Integer(
+        readOnly=True,
+        description='Evaluation ID.'
+    ),
+    'evaluation_result_id': fields.Integer(
+        readOnly=True,
+        description='Evaluation Result ID. Given when the job succeeded.'
+    ),
+    'status': fields.String(
+        readOnly=True,
+        description='One of queued/running/succeeded/failed.',
+        attribute=lambda job: job.status.name
+    ),
+    'progress': fields.Float(
+        readOnly=True,
+        description='Progress from 0.0 to 1.0. Rekcurd reports no intermediate progress of an evaluation.'
+    ),
+    'message': fields.String(
+        readOnly=True,
+        description='Error message of a failed job.'
+    ),
+    'register_date': DatetimeToTimestamp(
+        readOnly=True,
+        description='Register date'
+    ),
+    'started_date': DatetimeToTimestamp(
+        readOnly=True,
+        description='Start date'
+    ),
+    'finished_date': DatetimeToTimestamp(
+        readOnly=True,
+        description='Finish date'
+    )
+})
+evaluation_batch_result = evaluation_api_namespace.model('EvaluationBatchResult', {
+    'model_id': fields.Integer(required=True, description='Model ID.'),
+    'evaluation_id': fields.Integer(required=True, description='Evaluation ID.'),
+    'status': fields.Boolean(required=True),
+    'message': fields.String(required=False),
+    'result': fields.Nested(eval_metrics, allow_null=True)
+})
+evaluation_batch_params = evaluation_api_namespace.model('EvaluationBatch', {
+    'status': fields.Boolean(required=True, description='True if all the evaluations succeeded.'),
+    'results': fields.List(fields.Nested(evaluation_batch_result))
+})
+
+
+EVALUATION_JOB_MAX_WORKERS = 4
+EVALUATION_BATCH_MAX_PAIRS = 100
+EVALUATION_BATCH_MAX_WORKERS = 32
+evaluation_job_executor = ThreadPoolExecutor(max_workers=EVALUATION_JOB_MAX_WORKERS,
+                                             thread_name_prefix='evaluation-job')
+evaluation_detail_cache_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='evaluation-detail-cache')
+
+
+evaluation_job_heartbeat = Heartbeat(EvaluationJobModel.job_id, EvaluationJobModel.heartbeat_date)
 
 
 @evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluations')
@@ -120,17 +213,6 @@ class ApiEvaluations(Resource):
         args = self.upload_parser.parse_args()
         file = args['filepath']
         description = args['description']
-        checksum = HashUtil.checksum(file)
-
-        evaluation_model = db.session.query(EvaluationModel).filter(
-            EvaluationModel.application_id == application_id,
-            EvaluationModel.checksum == checksum).one_or_none()
-        if evaluation_model is not None:
-            return {"status": True,
-                    "message": 'The file already exists. Description: {}'.format(
-                        evaluation_model.description),
-                    "evaluation_id": evaluation_model.evaluation_id}
-
         application_model: ApplicationModel = db.session.query(ApplicationModel).filter(
             ApplicationModel.application_id == application_id).first_or_404()
         data_server_model: DataServerModel = db.session.query(
@@ -138,6 +220,11 @@ class ApiEvaluations(Resource):
 
         if data_server_model.data_server_mode == DataServerModeEnum.LOCAL:
             """Only if DataServerModeEnum.LOCAL, send file to the server."""
+            # Rekcurd workers cannot delete uploaded files, so check duplicates before uploading.
+            checksum = HashUtil.checksum(file)
+            evaluation_model = self._find_duplicate(application_id, checksum)
+            if evaluation_model is not None:
+                return self._duplicated(evaluation_model)
             service_model: ServiceModel = db.session.query(ServiceModel).filter(
                 ServiceModel.application_id == application_id).first_or_404()
             rekcurd_dashboard_client = RekcurdDashboardClient(
@@ -149,12 +236,16 @@ class ApiEvaluations(Resource):
             if not response_body['status']:
                 raise RekcurdDashboardException('Failed to upload')
         else:
-            """Otherwise, upload file."""
-            with tempfile.NamedTemporaryFile() as fp:
-                fp.write(file.read())
-                fp.flush()
-                data_server = DataServer()
-                eval_data_path = data_server.upload_evaluation_data(data_server_model, application_model, fp.name)
+            """Otherwise, upload file. The checksum is computed while uploading."""
+            data_server = DataServer(
+                api.dashboard_config.DATA_SERVER_PART_SIZE, api.dashboard_config.DATA_SERVER_MAX_CONCURRENCY)
+            stream = HashingReader(file.stream)
+            eval_data_path = data_server.upload_evaluation_data(data_server_model, application_model, stream=stream)
+            checksum = stream.hexdigest()
+            evaluation_model = self._find_duplicate(application_id, checksum)
+            if evaluation_model is not None:
+                data_server.delete_file(data_server_model, eval_data_path)
+                return self._duplicated(evaluation_model)
 
         evaluation_model = EvaluationModel(
             checksum=checksum, application_id=application_id, data_path=eval_data_path, description=description)
@@ -165,6 +256,16 @@ class ApiEvaluations(Resource):
         db.session.close()
         return {"status": True, "evaluation_id": evaluation_id}
 
+    def _find_duplicate(self, application_id: str, checksum: str) -> Optional[EvaluationModel]:
+        return db.session.query(EvaluationModel).filter(
+            EvaluationModel.application_id == application_id,
+            EvaluationModel.checksum == checksum).one_or_none()
+
+    def _duplicated(self, evaluation_model: EvaluationModel) -> dict:
+        return {"status": True,
+                "message": 'The file already exists. Description: {}'.format(evaluation_model.description),
+                "evaluation_id": evaluation_model.evaluation_id}
+
     @evaluation_api_namespace.marshal_list_with(evaluation_params)
     def get(self, project_id: int, application_id: str):
         """get_evaluations"""
@@ -187,6 +288,9 @@ class ApiEvaluationId(Resource):
             DataServerModel).filter(DataServerModel.project_id == project_id).first_or_404()
         data_server = DataServer()
         data_server.delete_file(data_server_model, evaluation_model.data_path)
+        for evaluation_result_model in db.session.query(EvaluationResultModel).filter(
+                EvaluationResultModel.evaluation_id == evaluation_id):
+            evaluation_detail_cache.invalidate(evaluation_result_model.evaluation_result_id)
 
         eval_query.delete()
         db.session.commit()
@@ -212,15 +316,24 @@ class ApiEvaluationIdDownload(Resource):
         data_server_model: DataServerModel = db.session.query(
             DataServerModel).filter(DataServerModel.project_id == project_id).first_or_404()
         data_server = DataServer()
-        with tempfile.NamedTemporaryFile() as fp:
-            data_server.download_file(data_server_model,
-                                      evaluation_model.data_path,
-                                      fp.name)
-
-            response = send_file(open(fp.name, 'rb'), as_attachment=True,
-                                 attachment_filename='evaluation_{}.txt'.format(evaluation_id),
-                                 mimetype='text/plain')
-            return response
+        status = 200
+        headers = Headers()
+        if request.range is None:
+            chunks, content_length = data_server.open_file(data_server_model, evaluation_model.data_path)
+        else:
+            size = data_server.get_file_size(data_server_model, evaluation_model.data_path)
+            byte_range = request.range.range_for_length(size)
+            if byte_range is None:
+                raise RequestedRangeNotSatisfiable(length=size)
+            start, stop = byte_range
+            chunks, content_length = data_server.open_file(
+                data_server_model, evaluation_model.data_path, start, stop - 1)
+            status = 206
+            headers.set('Content-Range', ContentRange('bytes', start, stop, size).to_header())
+        headers.set('Content-Length', content_length)
+        headers.set('Accept-Ranges', 'bytes')
+        headers.set('Content-Disposition', 'attachment', filename='evaluation_{}.txt'.format(evaluation_id))
+        return Response(chunks, status=status, headers=headers, mimetype='text/plain', direct_passthrough=True)
 
 
 @evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluate')
@@ -242,13 +355,8 @@ class ApiEvaluate(Resource):
 
         response_body, eval_result_path = self._evaluate(application_id, service_model, evaluation_model)
         if response_body['status']:
-            evaluation_result_model = EvaluationResultModel(
-                model_id=service_model.model_id,
-                data_path=eval_result_path,
-                evaluation_id=evaluation_model.evaluation_id,
-                result=response_body)
-            db.session.add(evaluation_result_model)
-            db.session.flush()
+            evaluation_result_model = self._save_result(
+                service_model, evaluation_model, None, response_body, eval_result_path)
             response_body = evaluation_result_model.result
             db.session.commit()
 
@@ -268,17 +376,16 @@ class ApiEvaluate(Resource):
 
         response_body, eval_result_path = self._evaluate(application_id, service_model, evaluation_model)
         if response_body['status']:
-            evaluation_result_model.data_path = eval_result_path
-            evaluation_result_model.result = response_body
-            evaluation_result_model.register_date = datetime.datetime.utcnow()
-            db.session.flush()
+            evaluation_result_model = self._save_result(
+                service_model, evaluation_model, evaluation_result_model, response_body, eval_result_path)
             response_body = evaluation_result_model.result
             db.session.commit()
 
         db.session.close()
         return response_body
 
-    def _get_models(self, application_id: str, model_id: int,
+    @staticmethod
+    def _get_models(application_id: str, model_id: int,
                     eval_id: Optional[int]) -> Tuple[ServiceModel, EvaluationModel, Optional[EvaluationResultModel]]:
         if eval_id:
             evaluation_model = EvaluationModel.query.filter_by(
@@ -303,7 +410,8 @@ class ApiEvaluate(Resource):
 
         return service_model, evaluation_model, evaluation_result_model
 
-    def _evaluate(self, application_id: str, service_model: ServiceModel, evaluation_model: EvaluationModel):
+    @staticmethod
+    def _evaluate(application_id: str, service_model: ServiceModel, evaluation_model: EvaluationModel):
         eval_result_path = "eval-result-{0:%Y%m%d%H%M%S}.pkl".format(datetime.datetime.utcnow())
         application_model: ApplicationModel = db.session.query(ApplicationModel).filter(
             ApplicationModel.application_id == application_id).first_or_404()
@@ -312,6 +420,198 @@ class ApiEvaluate(Resource):
             service_level=service_model.service_level, rekcurd_grpc_version=service_model.version)
         return rekcurd_dashboard_client.run_evaluate_model(evaluation_model.data_path, eval_result_path), eval_result_path
 
+    @staticmethod
+    def _save_result(service_model: ServiceModel, evaluation_model: EvaluationModel,
+                     evaluation_result_model: Optional[EvaluationResultModel],
+                     response_body: dict, eval_result_path: str) -> EvaluationResultModel:
+        if evaluation_result_model is None:
+            evaluation_result_model = EvaluationResultModel(
+                model_id=service_model.model_id,
+                data_path=eval_result_path,
+                evaluation_id=evaluation_model.evaluation_id,
+                result=response_body)
+            db.session.add(evaluation_result_model)
+        else:
+            evaluation_result_model.data_path = eval_result_path
+            evaluation_result_model.result = response_body
+            evaluation_result_model.register_date = datetime.datetime.utcnow()
+            evaluation_detail_cache.invalidate(evaluation_result_model.evaluation_result_id)
+        db.session.flush()
+        return evaluation_result_model
+
+
+@evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluate_batch')
+class ApiEvaluateBatch(Resource):
+    batch_parser = reqparse.RequestParser()
+    batch_parser.add_argument('model_ids', location='form', type=int, action='append', required=True)
+    batch_parser.add_argument('evaluation_ids', location='form', type=int, action='append', required=False,
+                              help='The latest evaluation data is used if not given.')
+    batch_parser.add_argument('overwrite', location='form', type=inputs.boolean, default=False,
+                              help='Re-evaluate if the evaluation result already exists.')
+    batch_parser.add_argument('max_concurrency', location='form', type=inputs.int_range(1, EVALUATION_BATCH_MAX_WORKERS),
+                              default=8, help='Number of evaluations running at the same time.')
+    batch_parser.add_argument('max_concurrency_per_service', location='form', type=inputs.positive, default=1,
+                              help='Number of evaluations running at the same time on each service.')
+
+    @evaluation_api_namespace.expect(batch_parser)
+    @evaluation_api_namespace.marshal_with(evaluation_batch_params)
+    def post(self, project_id: int, application_id: str):
+        """evaluate models against evaluation data concurrently"""
+        args = self.batch_parser.parse_args()
+        model_ids = list(dict.fromkeys(args['model_ids']))
+        evaluation_ids = list(dict.fromkeys(args.get('evaluation_ids') or [None]))
+        if len(model_ids) * len(evaluation_ids) > EVALUATION_BATCH_MAX_PAIRS:
+            raise RekcurdDashboardException(
+                "Too many evaluations. At most {} pairs of model and evaluation data.".format(EVALUATION_BATCH_MAX_PAIRS))
+        application_model: ApplicationModel = db.session.query(ApplicationModel).filter(
+            ApplicationModel.application_id == application_id).first_or_404()
+
+        targets = [ApiEvaluate._get_models(application_id, model_id, eval_id)
+                   for model_id in model_ids for eval_id in evaluation_ids]
+        semaphores = dict()
+        tasks = list()
+        for service_model, evaluation_model, evaluation_result_model in targets:
+            if evaluation_result_model is not None and not args['overwrite']:
+                continue
+            rekcurd_dashboard_client = RekcurdDashboardClient(
+                host=service_model.insecure_host, port=service_model.insecure_port,
+                application_name=application_model.application_name,
+                service_level=service_model.service_level, rekcurd_grpc_version=service_model.version)
+            semaphore = semaphores.setdefault(
+                service_model.service_id, threading.BoundedSemaphore(args['max_concurrency_per_service']))
+            eval_result_path = "eval-result-{0:%Y%m%d%H%M%S}-{1}-{2}.pkl".format(
+                datetime.datetime.utcnow(), service_model.model_id, evaluation_model.evaluation_id)
+            tasks.append(((service_model.model_id, evaluation_model.evaluation_id), partial(
+                self._evaluate, semaphore, rekcurd_dashboard_client, evaluation_model.data_path, eval_result_path)))
+        task_results = {task_result.key: task_result
+                        for task_result in ConcurrentUtil.run(tasks, max_workers=args['max_concurrency'])}
+
+        results = list()
+        for service_model, evaluation_model, evaluation_result_model in targets:
+            key = (service_model.model_id, evaluation_model.evaluation_id)
+            result = {"model_id": key[0], "evaluation_id": key[1], "status": True}
+            task_result = task_results.get(key)
+            if task_result is None:
+                result.update(message="The evaluation result already exists", result=evaluation_result_model.result)
+            elif not task_result.status:
+                result.update(status=False, message=str(task_result.error))
+            elif not task_result.result[0]['status']:
+                result.update(status=False, message=task_result.result[0].get('message', 'Failed to evaluate.'))
+            else:
+                response_body, eval_result_path = task_result.result
+                evaluation_result_model = ApiEvaluate._save_result(
+                    service_model, evaluation_model, evaluation_result_model, response_body, eval_result_path)
+                result.update(result=evaluation_result_model.result)
+            results.append(result)
+        db.session.commit()
+        db.session.close()
+        return {"status": all(result["status"] for result in results), "results": results}
+
+    @staticmethod
+    def _evaluate(semaphore, rekcurd_dashboard_client: RekcurdDashboardClient, data_path: str, eval_result_path: str):
+        with semaphore:
+            return rekcurd_dashboard_client.run_evaluate_model(data_path, eval_result_path), eval_result_path
+
+
+def run_evaluation_job(app, job_id: int) -> None:
+    """
+    Run an evaluation job on a worker thread. The result and the job status are saved to DB.
+    :param app: Flask application. The job runs in an application context of its own.
+    :param job_id:
+    :return:
+    """
+    with app.app_context():
+        job_model: EvaluationJobModel = db.session.query(EvaluationJobModel).get(job_id)
+        job_model.status = EvaluationJobStatus.running
+        job_model.started_date = job_model.heartbeat_date = datetime.datetime.utcnow()
+        db.session.commit()
+        try:
+            service_model, evaluation_model, evaluation_result_model = ApiEvaluate._get_models(
+                job_model.application_id, job_model.model_id, job_model.evaluation_id)
+            response_body, eval_result_path = ApiEvaluate._evaluate(
+                job_model.application_id, service_model, evaluation_model)
+            if response_body['status']:
+                evaluation_result_model = ApiEvaluate._save_result(
+                    service_model, evaluation_model, evaluation_result_model, response_body, eval_result_path)
+                job_model.evaluation_result_id = evaluation_result_model.evaluation_result_id
+                job_model.status = EvaluationJobStatus.succeeded
+            else:
+                job_model.status = EvaluationJobStatus.failed
+                job_model.message = response_body.get('message', 'Failed to evaluate.')
+        except Exception as error:
+            api.logger.error("Evaluation job {} failed: {}".format(job_id, error))
+            db.session.rollback()
+            job_model = db.session.query(EvaluationJobModel).get(job_id)
+            job_model.status = EvaluationJobStatus.failed
+            job_model.message = str(error)
+        job_model.progress = 1.0
+        job_model.finished_date = datetime.datetime.utcnow()
+        db.session.commit()
+
+
+@evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluation_jobs')
+class ApiEvaluationJobs(Resource):
+    job_parser = reqparse.RequestParser()
+    job_parser.add_argument('model_id', location='form', type=int, required=True)
+    job_parser.add_argument('evaluation_id', location='form', type=int, required=False)
+    job_parser.add_argument('overwrite', location='form', type=inputs.boolean, default=False,
+                            help='Re-evaluate if the evaluation result already exists.')
+
+    @evaluation_api_namespace.expect(job_parser)
+    @evaluation_api_namespace.marshal_with(evaluation_job_submitted)
+    def post(self, project_id: int, application_id: str):
+        """submit an evaluation job, which evaluates the model in background"""
+        args = self.job_parser.parse_args()
+        service_model, evaluation_model, evaluation_result_model = ApiEvaluate._get_models(
+            application_id, args['model_id'], args.get('evaluation_id', None))
+        if evaluation_result_model is not None and not args['overwrite']:
+            raise RekcurdDashboardException("The evaluation result already exists")
+
+        now = datetime.datetime.utcnow()
+        active_jobs = db.session.query(EvaluationJobModel).filter(
+            EvaluationJobModel.model_id == service_model.model_id,
+            EvaluationJobModel.evaluation_id == evaluation_model.evaluation_id,
+            EvaluationJobModel.status.in_([EvaluationJobStatus.queued, EvaluationJobStatus.running]))
+        stale_before = now - datetime.timedelta(seconds=Heartbeat.STALE_SECONDS)
+        active_jobs.filter(
+            (EvaluationJobModel.heartbeat_date.is_(None)) | (EvaluationJobModel.heartbeat_date < stale_before)
+        ).update({EvaluationJobModel.status: EvaluationJobStatus.failed,
+                  EvaluationJobModel.message: "The process running the job has exited.",
+                  EvaluationJobModel.finished_date: now}, synchronize_session=False)
+        job_model = active_jobs.first()
+        if job_model is not None:
+            return {"status": True, "message": "The evaluation job is already submitted.",
+                    "job_id": job_model.job_id}
+
+        job_model = EvaluationJobModel(
+            application_id=application_id, model_id=service_model.model_id,
+            evaluation_id=evaluation_model.evaluation_id, status=EvaluationJobStatus.queued, progress=0.0,
+            heartbeat_date=now)
+        db.session.add(job_model)
+        db.session.flush()
+        job_id = job_model.job_id
+        db.session.commit()
+        db.session.close()
+        app = current_app._get_current_object()
+        evaluation_job_heartbeat.add(app, job_id)
+        future = evaluation_job_executor.submit(run_evaluation_job, app, job_id)
+        future.add_done_callback(lambda _: evaluation_job_heartbeat.remove(job_id))
+        return {"status": True, "job_id": job_id}
+
+    @evaluation_api_namespace.marshal_list_with(evaluation_job_params)
+    def get(self, project_id: int, application_id: str):
+        """get evaluation jobs"""
+        return EvaluationJobModel.query.filter_by(
+            application_id=application_id).order_by(EvaluationJobModel.job_id.desc()).all()
+
+
+@evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluation_jobs/<int:job_id>')
+class ApiEvaluationJobId(Resource):
+    @evaluation_api_namespace.marshal_with(evaluation_job_params)
+    def get(self, project_id: int, application_id: str, job_id: int):
+        """get an evaluation job to poll its status"""
+        return EvaluationJobModel.query.filter_by(application_id=application_id, job_id=job_id).first_or_404()
+
 
 @evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluation_results')
 class ApiEvaluationResults(Resource):
@@ -331,11 +631,168 @@ class ApiEvaluationResults(Resource):
         return results
 
 
+@evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluation_results/summary')
+class ApiEvaluationResultSummary(Resource):
+    SORT_COLUMNS = {
+        'evaluation_result_id': EvaluationResultModel.evaluation_result_id,
+        'num': EvaluationResultModel.num,
+        'accuracy': EvaluationResultModel.accuracy,
+        'fvalue_mean': EvaluationResultModel.fvalue_mean,
+    }
+    summary_parser = reqparse.RequestParser()
+    summary_parser.add_argument('sort', location='args', choices=tuple(SORT_COLUMNS), default='evaluation_result_id')
+    summary_parser.add_argument('order', location='args', choices=('asc', 'desc'), default='desc')
+    summary_parser.add_argument('model_id', location='args', type=int, required=False)
+    summary_parser.add_argument('evaluation_id', location='args', type=int, required=False)
+    summary_parser.add_argument('min_accuracy', location='args', type=float, required=False)
+    summary_parser.add_argument('limit', location='args', type=inputs.int_range(1, 1000), default=100)
+    summary_parser.add_argument('cursor', location='args', type=str, required=False,
+                                help='"next_cursor" of the previous page.')
+    summary_parser.add_argument('include_result', location='args', type=inputs.boolean, default=False,
+                                help='Include all the metrics.')
+
+    @evaluation_api_namespace.expect(summary_parser)
+    @evaluation_api_namespace.marshal_with(evaluation_summary_params)
+    def get(self, project_id: int, application_id: str):
+        """get evaluation results sorted and filtered by their metrics"""
+        args = self.summary_parser.parse_args()
+
+        columns = [EvaluationResultModel.evaluation_result_id, EvaluationResultModel.model_id,
+                   EvaluationResultModel.evaluation_id, EvaluationResultModel.num, EvaluationResultModel.accuracy,
+                   EvaluationResultModel.fvalue_mean, EvaluationResultModel.register_date]
+        if args['include_result']:
+            columns.append(EvaluationResultModel._result)
+        query = db.session.query(*columns)\
+            .join(EvaluationModel, EvaluationResultModel.evaluation_id == EvaluationModel.evaluation_id)\
+            .filter(EvaluationModel.application_id == application_id)
+        if args['model_id'] is not None:
+            query = query.filter(EvaluationResultModel.model_id == args['model_id'])
+        if args['evaluation_id'] is not None:
+            query = query.filter(EvaluationResultModel.evaluation_id == args['evaluation_id'])
+        if args['min_accuracy'] is not None:
+            query = query.filter(EvaluationResultModel.accuracy >= args['min_accuracy'])
+
+        sort_column = self.SORT_COLUMNS[args['sort']]
+        id_column = EvaluationResultModel.evaluation_result_id
+        descending = args['order'] == 'desc'
+        if sort_column is not id_column:
+            query = query.filter(sort_column.isnot(None))
+        if args['cursor']:
+            value, last_id = self._decode_cursor(args['cursor'])
+            if descending:
+                query = query.filter((sort_column < value) | ((sort_column == value) & (id_column < last_id)))
+            else:
+                query = query.filter((sort_column > value) | ((sort_column == value) & (id_column > last_id)))
+        if descending:
+            query = query.order_by(sort_column.desc(), id_column.desc())
+        else:
+            query = query.order_by(sort_column.asc(), id_column.asc())
+        rows = query.limit(args['limit'] + 1).all()
+
+        results = []
+        for row in rows[:args['limit']]:
+            result = dict(zip(('evaluation_result_id', 'model_id', 'evaluation_id', 'num', 'accuracy',
+                               'fvalue_mean', 'register_date'), row))
+            if args['include_result']:
+                result['result'] = dict(json.loads(row._result), result_id=row.evaluation_result_id)
+            results.append(result)
+        next_cursor = None
+        if len(rows) > args['limit']:
+            last = results[-1]
+            next_cursor = self._encode_cursor(last[args['sort']], last['evaluation_result_id'])
+        return {'results': results, 'next_cursor': next_cursor}
+
+    @staticmethod
+    def _encode_cursor(value, evaluation_result_id: int) -> str:
+        return base64.urlsafe_b64encode(json.dumps([value, evaluation_result_id]).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[float, int]:
+        try:
+            value, evaluation_result_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return float(value), int(evaluation_result_id)
+        except (ValueError, TypeError):
+            raise RekcurdDashboardException("Invalid cursor.")
+
+
+class EvaluationDetailCollector:
+    """
+    Iterator of the responses of "run_evaluation_data", which collects their details to be cached.
+    The details are cached when the responses are read to the end, unless a response failed or they are too large
+    to be cached, so that a result is read from the Rekcurd service only by the requests themselves.
+    """
+
+    def __init__(self, responses, evaluation_result_id: int, register_date: datetime.datetime):
+        self.__responses = responses
+        self.evaluation_result_id = evaluation_result_id
+        self.register_date = register_date
+        self.builder = evaluation_detail_cache.builder(evaluation_result_id, register_date)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            response = next(self.__responses)
+        except StopIteration:
+            if self.builder is not None:
+                evaluation_detail_cache.put_built(self.evaluation_result_id, self.register_date, self.builder)
+                self.builder = None
+            raise
+        except Exception:
+            self.builder = None
+            raise
+        if self.builder is not None:
+            if not response['status']:
+                self.builder = None
+            elif not all(self.builder.add(detail) for detail in response['detail']):
+                evaluation_detail_cache.put_built(self.evaluation_result_id, self.register_date, self.builder)
+                self.builder = None
+        return response
+
+    def close(self):
+        self.builder = None
+        self.__responses.close()
+
+    def release(self):
+        """
+        Close the responses after the request. If details are still being collected, the rest of the responses
+        are read in the background to cache them.
+        :return:
+        """
+        if self.builder is None:
+            self.close()
+        else:
+            evaluation_detail_cache_executor.submit(self.drain)
+
+    def drain(self):
+        try:
+            for _ in self:
+                pass
+        except Exception as error:
+            api.logger.error("Failed to cache the evaluation result {}: {}".format(self.evaluation_result_id, error))
+        finally:
+            self.close()
+
+
 @evaluation_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/evaluation_results/<int:eval_result_id>')
 class ApiEvaluationResultId(Resource):
-    @evaluation_api_namespace.marshal_with(evaluation_detail_params)
+    detail_parser = reqparse.RequestParser()
+    detail_parser.add_argument('offset', location='args', type=inputs.natural, default=0,
+                               help='Number of details to skip.')
+    detail_parser.add_argument('limit', location='args', type=inputs.natural, required=False,
+                               help='Maximum number of details. All details if not given.')
+    detail_parser.add_argument('only_incorrect', location='args', type=inputs.boolean, default=False,
+                               help='Return only incorrectly predicted details.')
+    detail_parser.add_argument('format', location='args', choices=('json', 'ndjson'), default='json',
+                               help='"ndjson" streams details as newline-delimited JSON.')
+
+    @evaluation_api_namespace.expect(detail_parser)
+    @evaluation_api_namespace.response(200, 'Success', evaluation_detail_params)
+    @evaluation_api_namespace.produces(['application/json', 'application/x-ndjson'])
     def get(self, project_id: int, application_id: str, eval_result_id: int):
         """get detailed evaluation result"""
+        args = self.detail_parser.parse_args()
         eval_with_result = db.session.query(EvaluationModel, EvaluationResultModel)\
             .filter(EvaluationModel.application_id == application_id,
                     EvaluationResultModel.evaluation_id == EvaluationModel.evaluation_id,
@@ -353,16 +810,94 @@ class ApiEvaluationResultId(Resource):
         evaluation_model = eval_with_result.EvaluationModel
         evaluation_result_model = eval_with_result.EvaluationResultModel
 
-        response_body = list(rekcurd_dashboard_client.run_evaluation_data(
-            evaluation_model.data_path, evaluation_result_model.data_path))
-        if len(response_body) == 0:
+        metrics = evaluation_result_model.result
+        ndjson = args['format'] == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson'
+        cached_details = evaluation_detail_cache.get(
+            evaluation_result_model.evaluation_result_id, evaluation_result_model.register_date)
+        if cached_details is not None:
+            db.session.close()
+            limit = args['limit']
+            indices = cached_details.select(
+                args['only_incorrect'], args['offset'], None if limit is None else limit + 1)
+            if ndjson:
+                return Response((json.dumps(marshal(cached_details.row(i), evaluation_detail)) + '\n'
+                                 for i in indices[:limit]), mimetype='application/x-ndjson')
+            return marshal({
+                'status': True,
+                'metrics': metrics,
+                'details': [cached_details.row(i) for i in indices[:limit]],
+                'next_offset': args['offset'] + limit if limit is not None and len(indices) > limit else None
+            }, evaluation_detail_params)
+
+        responses = EvaluationDetailCollector(
+            rekcurd_dashboard_client.run_evaluation_data(evaluation_model.data_path, evaluation_result_model.data_path),
+            evaluation_result_model.evaluation_result_id, evaluation_result_model.register_date)
+        first_response = next(responses, None)
+        if first_response is None:
             raise NotFound("Result Not Found.")
+        db.session.close()
 
-        return {
-            'status': all(r['status'] for r in response_body),
-            'metrics': evaluation_result_model.result,
-            'details': list(chain.from_iterable(r['detail'] for r in response_body))
-        }
+        details = self._iter_details(
+            chain([first_response], responses), args['only_incorrect'], args['offset'])
+        if ndjson:
+            return Response(stream_with_context(self._stream_details(responses, details, args['limit'])),
+                            mimetype='application/x-ndjson')
+
+        status = True
+        page = list()
+        next_offset = None
+        try:
+            for response_status, detail in details:
+                if args['limit'] is not None and len(page) >= args['limit']:
+                    next_offset = args['offset'] + len(page)
+                    break
+                status = status and response_status
+                page.append(detail)
+        finally:
+            responses.release()
+        return marshal({
+            'status': status,
+            'metrics': metrics,
+            'details': page,
+            'next_offset': next_offset
+        }, evaluation_detail_params)
+
+    @staticmethod
+    def _iter_details(responses, only_incorrect: bool, offset: int):
+        """
+        Iterate details of the streamed responses without holding all of them.
+        :param responses: Responses of "run_evaluation_data".
+        :param only_incorrect: Skip correctly predicted details.
+        :param offset: Number of details to skip.
+        :return: Iterator of (status of the response, detail).
+        """
+        for response in responses:
+            for detail in response['detail']:
+                if only_incorrect and detail['is_correct']:
+                    continue
+                if offset > 0:
+                    offset -= 1
+                    continue
+                yield response['status'], detail
+
+    @staticmethod
+    def _stream_details(responses, details, limit: int = None):
+        """
+        Stream details as newline-delimited JSON. The response status has already been sent,
+        so a failure on the way is reported as a last line {"status": false, "message": ...}.
+        :param responses: EvaluationDetailCollector. Released at the end.
+        :param details: Iterator of "_iter_details".
+        :param limit: Maximum number of details.
+        :return: Iterator of lines.
+        """
+        try:
+            for _, detail in islice(details, limit):
+                yield json.dumps(marshal(detail, evaluation_detail)) + '\n'
+        except Exception as error:
+            api.logger.error(str(error))
+            yield json.dumps({'status': False, 'message': str(error)}) + '\n'
+        finally:
+            responses.release()
 
     @evaluation_api_namespace.marshal_with(success_or_not)
     def delete(self, project_id: int, application_id: str, eval_result_id: int):
@@ -382,5 +917,6 @@ class ApiEvaluationResultId(Resource):
         db.session.query(EvaluationResultModel).filter(
             EvaluationResultModel.evaluation_result_id == eval_result_id).delete()
         db.session.commit()
+        evaluation_detail_cache.invalidate(eval_result_id)
         db.session.close()
         return {"status": True, "message": "Success."}
@@ -10,7 +10,7 @@ from . import (
     api, DatetimeToTimestamp, status_model, update_kubernetes_deployment_info,
     save_kubernetes_access_file, remove_kubernetes_access_file, backup_kubernetes_deployment,
     backup_istio_routing, load_kubernetes_deployment_info, apply_rekcurd_to_kubernetes,
-    check_kubernetes_configfile
+    check_kubernetes_configfile, evict_api_client
 )
 from rekcurd_dashboard.models import (
     db, KubernetesModel, ProjectUserRoleModel, ProjectRole, ApplicationModel, ServiceModel
@@ -222,6 +222,7 @@ class ApiKubernetesId(Resource):
             try:
                 check_kubernetes_configfile(kubernetes_model.config_path)
                 remove_kubernetes_access_file(prev_config_path)
+                evict_api_client(kubernetes_id)
             except Exception as error:
                 remove_kubernetes_access_file(config_path)
                 raise error
@@ -235,5 +236,6 @@ class ApiKubernetesId(Resource):
         """delete_kubernetes_id"""
         db.session.query(KubernetesModel).filter(KubernetesModel.kubernetes_id == kubernetes_id).delete()
         db.session.commit()
+        evict_api_client(kubernetes_id)
         db.session.close()
         return {"status": True, "message": "Success."}
@@ -3,6 +3,7 @@
 
 from flask_restplus import Resource, Namespace
 
+from rekcurd_dashboard.models import db, InstrumentedQueuePool
 from . import api
 
 
@@ -16,3 +17,23 @@ class ApiSettings(Resource):
             'auth': api.dashboard_config.IS_ACTIVATE_AUTH
         }
         return result
+
+
+@misc_api_namespace.route('/metrics/db_pool')
+class ApiDbPoolMetrics(Resource):
+    def get(self):
+        """get_db_pool_metrics of this process"""
+        pool = db.engine.pool
+        result = {
+            'pool': type(pool).__name__,
+            'status': pool.status()
+        }
+        if isinstance(pool, InstrumentedQueuePool):
+            result.update({
+                'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+                'checkout': pool.stats.serialize()
+            })
+        return result
@@ -1,15 +1,16 @@
 import datetime
-import tempfile
+
+from functools import partial
 
 from flask_restplus import Namespace, fields, Resource, reqparse
 
 from werkzeug.datastructures import FileStorage
 
-from . import DatetimeToTimestamp, status_model
+from . import api, DatetimeToTimestamp, status_model
 from rekcurd_dashboard.core import RekcurdDashboardClient
 from rekcurd_dashboard.data_servers import DataServer
 from rekcurd_dashboard.models import db, DataServerModel, DataServerModeEnum, ApplicationModel, ServiceModel, ModelModel
-from rekcurd_dashboard.utils import RekcurdDashboardException
+from rekcurd_dashboard.utils import RekcurdDashboardException, ConcurrentUtil, HashingReader, IoUtil, BufferReader
 
 
 model_api_namespace = Namespace('models', description='Model API Endpoint.')
@@ -28,6 +29,14 @@ model_model_params = model_api_namespace.model('Model', {
         description='Model file path.',
         example='ml-1234567.model'
     ),
+    'checksum': fields.String(
+        readOnly=True,
+        description='SHA-256 of the model file.'
+    ),
+    'filesize': fields.Integer(
+        readOnly=True,
+        description='Model file size in bytes.'
+    ),
     'register_date': DatetimeToTimestamp(
         readOnly=True,
         description='Register date.'
@@ -40,6 +49,44 @@ model_model_params = model_api_namespace.model('Model', {
 })
 
 
+MODEL_UPLOAD_MAX_WORKERS = 16
+
+
+def upload_model_to_services(service_models: list, application_model: ApplicationModel, filepath: str, buffer):
+    """
+    Upload a model to the services concurrently.
+    Each service streams the mapped model through its own reader.
+    :param service_models:
+    :param application_model:
+    :param filepath:
+    :param buffer: Model mapped by IoUtil.map_stream.
+    :return:
+    """
+    tasks = list()
+    for service_model in service_models:
+        rekcurd_dashboard_application = RekcurdDashboardClient(
+            host=service_model.insecure_host, port=service_model.insecure_port,
+            application_name=application_model.application_name,
+            service_level=service_model.service_level, rekcurd_grpc_version=service_model.version)
+        tasks.append((service_model.display_name,
+                      partial(rekcurd_dashboard_application.run_upload_model, filepath, BufferReader(buffer))))
+    results = ConcurrentUtil.run(tasks, max_workers=MODEL_UPLOAD_MAX_WORKERS)
+    failures = list()
+    succeeded = list()
+    for result in results:
+        if not result.status:
+            failures.append("{} ({})".format(result.key, result.error))
+        elif not result.result.get("status", True):
+            failures.append("{} ({})".format(result.key, result.result.get("message", "Error.")))
+        else:
+            succeeded.append(result.key)
+    if failures:
+        raise RekcurdDashboardException(
+            "Failed to upload the model to services: {}. Succeeded on services: {}.".format(
+                ", ".join(failures), ", ".join(succeeded) or "none"))
+    return
+
+
 @model_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/models')
 class ApiModels(Resource):
     upload_model_parser = reqparse.RequestParser()
@@ -64,33 +111,46 @@ class ApiModels(Resource):
             DataServerModel).filter(DataServerModel.project_id == project_id).first_or_404()
         application_model: ApplicationModel = db.session.query(
             ApplicationModel).filter(ApplicationModel.application_id == application_id).first()
+        # hash the spool of Werkzeug in one pass, and upload it from the beginning unless it is registered
+        reader = HashingReader(file.stream, algorithms=('sha256',))
+        for _ in iter(lambda: reader.read(IoUtil.CHUNK_SIZE), b''):
+            pass
+        checksum = reader.hexdigest('sha256')
+        model_model = db.session.query(ModelModel).filter(
+            ModelModel.application_id == application_id, ModelModel.checksum == checksum).first()
+        if model_model is not None:
+            message = "The model already exists. Description: {}".format(model_model.description)
+            db.session.close()
+            return {"status": True, "message": message}
+
+        file.stream.seek(0)
         if data_server_model.data_server_mode == DataServerModeEnum.LOCAL:
             """Only if DataServerModeEnum.LOCAL, send file to the server."""
             filepath = "ml-{0:%Y%m%d%H%M%S}.model".format(datetime.datetime.utcnow())
             service_models = db.session.query(
                 ServiceModel).filter(ServiceModel.application_id == application_id).all()
-            for service_model in service_models:
-                rekcurd_dashboard_application = RekcurdDashboardClient(
-                    host=service_model.insecure_host, port=service_model.insecure_port,
-                    application_name=application_model.application_name,
-                    service_level=service_model.service_level, rekcurd_grpc_version=service_model.version)
-                response_body = rekcurd_dashboard_application.run_upload_model(filepath, file)
-                if not response_body.get("status", True):
-                    raise RekcurdDashboardException(response_body.get("message", "Error."))
-            response_body = {"status": True, "message": "Success."}
+            with IoUtil.map_stream(file.stream) as buffer:
+                upload_model_to_services(service_models, application_model, filepath, buffer)
         else:
-            """Otherwise, upload file."""
-            with tempfile.NamedTemporaryFile() as fp:
-                fp.write(file.read())
-                data_server = DataServer()
-                filepath = data_server.upload_model(data_server_model, application_model, fp.name)
-                response_body = {"status": True, "message": "Success."}
-
-        model_model = ModelModel(application_id=application_id, filepath=filepath, description=description)
+            """Otherwise, upload file unless the same content is stored."""
+            data_server = DataServer(
+                api.dashboard_config.DATA_SERVER_PART_SIZE, api.dashboard_config.DATA_SERVER_MAX_CONCURRENCY)
+            filepath = data_server.upload_model(
+                data_server_model, application_model, stream=file.stream, checksum=checksum)
+
+        model_model = ModelModel(application_id=application_id, filepath=filepath, description=description,
+                                 checksum=checksum, filesize=reader.size)
         db.session.add(model_model)
         db.session.commit()
+
+        if data_server_model.data_server_mode != DataServerModeEnum.LOCAL and \
+                not data_server.file_exists(data_server_model, filepath):
+            # The file was deleted together with its last reference while being registered.
+            file.stream.seek(0)
+            data_server.upload_model(
+                data_server_model, application_model, stream=file.stream, checksum=checksum)
         db.session.close()
-        return response_body
+        return {"status": True, "message": "Success."}
 
 
 @model_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/models/<int:model_id>')
@@ -125,8 +185,16 @@ class ApiModelId(Resource):
         num = db.session.query(ServiceModel).filter(ServiceModel.model_id==model_id).count()
         if num > 0:
             raise RekcurdDashboardException("Model is used by some services.")
-        # TODO: Delete file.
+        filepath = model_model.filepath
         db.session.query(ModelModel).filter(ModelModel.model_id==model_id).delete()
         db.session.commit()
+
+        data_server_model: DataServerModel = db.session.query(
+            DataServerModel).filter(DataServerModel.project_id == project_id).one_or_none()
+        if data_server_model is not None and data_server_model.data_server_mode != DataServerModeEnum.LOCAL:
+            """Models are content-addressed and shared, so delete the file when it is no longer referenced."""
+            num = db.session.query(ModelModel).filter(ModelModel.filepath==filepath).count()
+            if num == 0:
+                DataServer().delete_file(data_server_model, filepath)
         db.session.close()
         return {"status": True, "message": "Success."}
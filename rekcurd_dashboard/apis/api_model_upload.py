@@ -0,0 +1,440 @@
+# coding: utf-8
+
+
+import datetime
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, request
+from flask_restplus import Namespace, fields, Resource, reqparse
+from werkzeug.exceptions import LengthRequired, RequestEntityTooLarge
+
+from . import api, DatetimeToTimestamp, Heartbeat, status_model
+from .api_model import upload_model_to_services
+from rekcurd_dashboard.data_servers import DataServer
+from rekcurd_dashboard.models import (
+    db, DataServerModel, DataServerModeEnum, ApplicationModel, ServiceModel, ModelModel,
+    ModelUploadModel, ModelUploadPartModel, ModelUploadStatus
+)
+from rekcurd_dashboard.utils import RekcurdDashboardException, HashingReader, IoUtil
+
+
+model_upload_api_namespace = Namespace('model_uploads', description='Resumable Model Upload API Endpoint.')
+success_or_not = model_upload_api_namespace.model('Status', status_model)
+model_upload_result = model_upload_api_namespace.model('ModelUploadResult', {
+    'status': fields.Boolean(required=True),
+    'message': fields.String(required=False),
+    'upload_id': fields.String(
+        required=False,
+        description='Upload ID. Not given if the model is already stored.'
+    ),
+    'model_id': fields.Integer(
+        required=False,
+        description='Model ID. Given when the model is registered.'
+    )
+})
+model_upload_part_params = model_upload_api_namespace.model('ModelUploadPart', {
+    'part_number': fields.Integer(
+        readOnly=True,
+        description='Part number.'
+    ),
+    'etag': fields.String(
+        readOnly=True,
+        description='ETag of the part.'
+    ),
+    'checksum': fields.String(
+        readOnly=True,
+        description='MD5 of the part.'
+    ),
+    'size': fields.Integer(
+        readOnly=True,
+        description='Part size in bytes.'
+    )
+})
+model_upload_params = model_upload_api_namespace.model('ModelUpload', {
+    'upload_id': fields.String(
+        readOnly=True,
+        description='Upload ID.'
+    ),
+    'application_id': fields.String(
+        readOnly=True,
+        description='Application ID.'
+    ),
+    'checksum': fields.String(
+        readOnly=True,
+        description='SHA-256 of the whole model file.'
+    ),
+    'filesize': fields.Integer(
+        readOnly=True,
+        description='Model file size in bytes.'
+    ),
+    'description': fields.String(
+        readOnly=True,
+        description='Description.'
+    ),
+    'register_date': DatetimeToTimestamp(
+        readOnly=True,
+        description='Register date.'
+    ),
+    'status': fields.String(
+        readOnly=True,
+        description='One of uploading/verifying/succeeded/failed.',
+        attribute=lambda upload: upload.status.name
+    ),
+    'message': fields.String(
+        readOnly=True,
+        description='Reason of the failure.'
+    ),
+    'model_id': fields.Integer(
+        readOnly=True,
+        description='Model ID. Given when the model is registered.'
+    ),
+    'parts': fields.List(fields.Nested(model_upload_part_params), readOnly=True)
+})
+model_upload_part_result = model_upload_api_namespace.model('ModelUploadPartResult', dict({
+    'status': fields.Boolean(required=True),
+}, **model_upload_part_params))
+
+
+MODEL_UPLOAD_MAX_PARTS = 10000
+MODEL_UPLOAD_MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+MODEL_UPLOAD_PART_SPOOL_SIZE = 8 * 1024 * 1024
+MODEL_UPLOAD_EXPIRATION_DAYS = 7
+MODEL_UPLOAD_SPOOL_DIR = os.path.join(tempfile.gettempdir(), "rekcurd-dashboard-model-uploads")
+MODEL_UPLOAD_VERIFY_MAX_WORKERS = 2
+model_upload_verify_executor = ThreadPoolExecutor(max_workers=MODEL_UPLOAD_VERIFY_MAX_WORKERS,
+                                                  thread_name_prefix='model-upload-verify')
+model_upload_heartbeat = Heartbeat(ModelUploadModel.upload_id, ModelUploadModel.heartbeat_date)
+
+
+def _get_spool_dir(upload_id: str) -> str:
+    return os.path.join(MODEL_UPLOAD_SPOOL_DIR, upload_id)
+
+
+def _get_data_server() -> DataServer:
+    return DataServer(api.dashboard_config.DATA_SERVER_PART_SIZE, api.dashboard_config.DATA_SERVER_MAX_CONCURRENCY)
+
+
+def _get_upload_models(project_id: int, application_id: str, upload_id: str):
+    data_server_model: DataServerModel = db.session.query(
+        DataServerModel).filter(DataServerModel.project_id == project_id).first_or_404()
+    model_upload_model: ModelUploadModel = db.session.query(ModelUploadModel).filter(
+        ModelUploadModel.application_id == application_id,
+        ModelUploadModel.upload_id == upload_id).first_or_404()
+    return data_server_model, model_upload_model
+
+
+def _discard_upload(data_server_model: DataServerModel, model_upload_model: ModelUploadModel) -> None:
+    """
+    Discard the uploaded parts and the session. The caller commits the session deletion.
+    :param data_server_model:
+    :param model_upload_model:
+    :return:
+    """
+    if data_server_model.data_server_mode == DataServerModeEnum.LOCAL:
+        shutil.rmtree(_get_spool_dir(model_upload_model.upload_id), ignore_errors=True)
+    elif model_upload_model.storage_upload_id is not None:
+        _get_data_server().abort_multipart_upload(
+            data_server_model, DataServer.model_upload_path(model_upload_model.upload_id),
+            model_upload_model.storage_upload_id)
+    elif model_upload_model.status == ModelUploadStatus.verifying:
+        # The multipart upload is completed, but the assembled file is not verified.
+        _get_data_server().delete_file(data_server_model, DataServer.model_upload_path(model_upload_model.upload_id))
+    db.session.delete(model_upload_model)
+
+
+def _is_verifying(model_upload_model: ModelUploadModel) -> bool:
+    """
+    Whether the checksum is being verified by a live process.
+    :param model_upload_model:
+    :return:
+    """
+    if model_upload_model.status != ModelUploadStatus.verifying or model_upload_model.heartbeat_date is None:
+        return False
+    stale_before = datetime.datetime.utcnow() - datetime.timedelta(seconds=Heartbeat.STALE_SECONDS)
+    return model_upload_model.heartbeat_date >= stale_before
+
+
+def _discard_expired_uploads(data_server_model: DataServerModel, application_id: str) -> None:
+    expired_date = datetime.datetime.utcnow() - datetime.timedelta(days=MODEL_UPLOAD_EXPIRATION_DAYS)
+    for model_upload_model in db.session.query(ModelUploadModel).filter(
+            ModelUploadModel.application_id == application_id,
+            ModelUploadModel.register_date < expired_date).all():
+        try:
+            _discard_upload(data_server_model, model_upload_model)
+        except Exception as error:
+            api.logger.warning("Failed to discard model upload {}: {}".format(model_upload_model.upload_id, error))
+            db.session.delete(model_upload_model)
+
+
+def _register_model(application_id: str, filepath: str, description: str, checksum: str, filesize: int) -> int:
+    model_model = db.session.query(ModelModel).filter(
+        ModelModel.application_id == application_id, ModelModel.checksum == checksum).first()
+    if model_model is None:
+        model_model = ModelModel(application_id=application_id, filepath=filepath, description=description,
+                                 checksum=checksum, filesize=filesize)
+        db.session.add(model_model)
+        db.session.flush()
+    return model_model.model_id
+
+
+@model_upload_api_namespace.route('/projects/<int:project_id>/applications/<application_id>/model_uploads')
+class ApiModelUploads(Resource):
+    initiate_parser = reqparse.RequestParser()
+    initiate_parser.add_argument('description', type=str, required=True, location='form')
+    initiate_parser.add_argument('checksum', type=str, required=True, location='form',
+                                 help='SHA-256 of the whole model file.')
+    initiate_parser.add_argument('filesize', type=int, required=True, location='form',
+                                 help='Model file size in bytes.')
+
+    @model_upload_api_namespace.marshal_with(model_upload_result)
+    @model_upload_api_namespace.expect(initiate_parser)
+    def post(self, project_id: int, application_id: str):
+        """initiate a resumable model upload"""
+        args = self.initiate_parser.parse_args()
+        description: str = args['description']
+        checksum: str = args['checksum'].lower()
+        filesize: int = args['filesize']
+        if re.fullmatch('[0-9a-f]{64}', checksum) is None:
+            raise RekcurdDashboardException("Checksum must be a SHA-256 hex digest.")
+        if filesize <= 0:
+            raise RekcurdDashboardException("Filesize must be positive.")
+
+        data_server_model: DataServerModel = db.session.query(
+            DataServerModel).filter(DataServerModel.project_id == project_id).first_or_404()
+        db.session.query(ApplicationModel).filter(ApplicationModel.application_id == application_id).first_or_404()
+        _discard_expired_uploads(data_server_model, application_id)
+
+        model_model = db.session.query(ModelModel).filter(
+            ModelModel.application_id == application_id, ModelModel.checksum == checksum).first()
+        if model_model is not None:
+            db.session.commit()
+            return {"status": True, "model_id": model_model.model_id,
+                    "message": "The model already exists. Description: {}".format(model_model.description)}
+
+        upload_id = str(uuid.uuid4())
+        if data_server_model.data_server_mode == DataServerModeEnum.LOCAL:
+            """Only if DataServerModeEnum.LOCAL, spool parts on the dashboard."""
+            filepath = "ml-{0:%Y%m%d%H%M%S}.model".format(datetime.datetime.utcnow())
+            storage_upload_id = None
+            os.makedirs(_get_spool_dir(upload_id))
+        else:
+            """Otherwise, upload parts as a multipart upload. They are assembled under a path of the upload,
+            and stored under the content-addressed path only after the checksum is verified."""
+            filepath = DataServer.content_addressed_model_path(checksum)
+            storage_upload_id = _get_data_server().initiate_multipart_upload(
+                data_server_model, DataServer.model_upload_path(upload_id))
+
+        model_upload_model = ModelUploadModel(
+            upload_id=upload_id, application_id=application_id, filepath=filepath,
+            storage_upload_id=storage_upload_id, checksum=checksum, filesize=filesize, description=description)
+        db.session.add(model_upload_model)
+        db.session.commit()
+        db.session.close()
+        return {"status": True, "message": "Success.", "upload_id": upload_id}
+
+
+@model_upload_api_namespace.route(
+    '/projects/<int:project_id>/applications/<application_id>/model_uploads/<upload_id>')
+class ApiModelUploadId(Resource):
+    @model_upload_api_namespace.marshal_with(model_upload_params)
+    def get(self, project_id: int, application_id: str, upload_id: str):
+        """get a model upload with its uploaded parts to resume it"""
+        return ModelUploadModel.query.filter_by(application_id=application_id, upload_id=upload_id).first_or_404()
+
+    @model_upload_api_namespace.marshal_with(success_or_not)
+    def delete(self, project_id: int, application_id: str, upload_id: str):
+        """abort a model upload"""
+        data_server_model, model_upload_model = _get_upload_models(project_id, application_id, upload_id)
+        if _is_verifying(model_upload_model):
+            raise RekcurdDashboardException("The checksum is being verified.")
+        _discard_upload(data_server_model, model_upload_model)
+        db.session.commit()
+        db.session.close()
+        return {"status": True, "message": "Success."}
+
+
+@model_upload_api_namespace.route(
+    '/projects/<int:project_id>/applications/<application_id>/model_uploads/<upload_id>/parts/<int:part_number>')
+class ApiModelUploadPart(Resource):
+    @model_upload_api_namespace.marshal_with(model_upload_part_result)
+    def put(self, project_id: int, application_id: str, upload_id: str, part_number: int):
+        """upload a part of the model as the raw request body"""
+        if not 1 <= part_number <= MODEL_UPLOAD_MAX_PARTS:
+            raise RekcurdDashboardException("Part number must be from 1 to {}.".format(MODEL_UPLOAD_MAX_PARTS))
+        size = request.content_length
+        if size is None:
+            raise LengthRequired()
+        if size > MODEL_UPLOAD_MAX_PART_SIZE:
+            raise RequestEntityTooLarge()
+        data_server_model, model_upload_model = _get_upload_models(project_id, application_id, upload_id)
+        if model_upload_model.status != ModelUploadStatus.uploading:
+            raise RekcurdDashboardException("The upload is already completed.")
+
+        reader = HashingReader(request.stream)
+        if data_server_model.data_server_mode == DataServerModeEnum.LOCAL:
+            """Only if DataServerModeEnum.LOCAL, spool the part on the dashboard."""
+            part_filepath = os.path.join(_get_spool_dir(upload_id), "{:05d}.part".format(part_number))
+            with open(part_filepath + ".tmp", "wb") as fp:
+                shutil.copyfileobj(reader, fp, IoUtil.CHUNK_SIZE)
+            if reader.size != size:
+                raise RekcurdDashboardException("The part is incomplete.")
+            os.replace(part_filepath + ".tmp", part_filepath)
+            etag = reader.hexdigest()
+        else:
+            """Otherwise, upload the part. It is spooled to be retried by the storage client."""
+            with tempfile.SpooledTemporaryFile(max_size=MODEL_UPLOAD_PART_SPOOL_SIZE) as fp:
+                shutil.copyfileobj(reader, fp, IoUtil.CHUNK_SIZE)
+                if reader.size != size:
+                    raise RekcurdDashboardException("The part is incomplete.")
+                fp.seek(0)
+                etag = _get_data_server().upload_part(
+                    data_server_model, DataServer.model_upload_path(upload_id), model_upload_model.storage_upload_id,
+                    part_number, fp, size, reader.hexdigest())
+
+        db.session.merge(ModelUploadPartModel(
+            upload_id=upload_id, part_number=part_number, etag=etag, checksum=reader.hexdigest(), size=size,
+            register_date=datetime.datetime.utcnow()))
+        db.session.commit()
+        db.session.close()
+        return {"status": True, "part_number": part_number, "etag": etag, "checksum": reader.hexdigest(),
+                "size": size}
+
+
+@model_upload_api_namespace.route(
+    '/projects/<int:project_id>/applications/<application_id>/model_uploads/<upload_id>/complete')
+class ApiModelUploadComplete(Resource):
+    @model_upload_api_namespace.marshal_with(model_upload_result)
+    @model_upload_api_namespace.response(202, 'The checksum is being verified. Request again later.')
+    def post(self, project_id: int, application_id: str, upload_id: str):
+        """complete a model upload and register the model"""
+        data_server_model, model_upload_model = _get_upload_models(project_id, application_id, upload_id)
+        if model_upload_model.status == ModelUploadStatus.succeeded:
+            model_id = model_upload_model.model_id
+            db.session.close()
+            return {"status": True, "message": "Success.", "model_id": model_id}
+        if model_upload_model.status == ModelUploadStatus.failed:
+            raise RekcurdDashboardException(model_upload_model.message)
+        if _is_verifying(model_upload_model):
+            db.session.close()
+            return {"status": True, "message": "The checksum is being verified.", "upload_id": upload_id}, 202
+
+        if model_upload_model.status == ModelUploadStatus.uploading:
+            parts = db.session.query(ModelUploadPartModel).filter(
+                ModelUploadPartModel.upload_id == upload_id).order_by(ModelUploadPartModel.part_number).all()
+            part_numbers = [part.part_number for part in parts]
+            if not part_numbers:
+                raise RekcurdDashboardException("No parts are uploaded.")
+            if part_numbers != list(range(1, len(part_numbers) + 1)):
+                missing = sorted(set(range(1, part_numbers[-1])) - set(part_numbers))
+                raise RekcurdDashboardException("Parts are missing: {}".format(", ".join(map(str, missing))))
+            if sum(part.size for part in parts) != model_upload_model.filesize:
+                raise RekcurdDashboardException("Total size of parts does not match the filesize.")
+
+            if data_server_model.data_server_mode == DataServerModeEnum.LOCAL:
+                """Only if DataServerModeEnum.LOCAL, send the concatenated parts to the services."""
+                self._upload_to_services(application_id, model_upload_model, parts)
+                shutil.rmtree(_get_spool_dir(upload_id), ignore_errors=True)
+                return self._register(application_id, model_upload_model)
+            """Otherwise, complete the multipart upload and verify the assembled file in the background."""
+            self._complete_multipart_upload(data_server_model, model_upload_model, parts)
+
+        # The verification is started, or restarted if the process verifying it has exited.
+        model_upload_model.status = ModelUploadStatus.verifying
+        model_upload_model.heartbeat_date = datetime.datetime.utcnow()
+        db.session.commit()
+        db.session.close()
+        app = current_app._get_current_object()
+        model_upload_heartbeat.add(app, upload_id)
+        future = model_upload_verify_executor.submit(verify_model_upload, app, project_id, upload_id)
+        future.add_done_callback(lambda _: model_upload_heartbeat.remove(upload_id))
+        return {"status": True, "message": "The checksum is being verified.", "upload_id": upload_id}, 202
+
+    @staticmethod
+    def _register(application_id: str, model_upload_model: ModelUploadModel) -> dict:
+        model_id = _register_model(application_id, model_upload_model.filepath, model_upload_model.description,
+                                   model_upload_model.checksum, model_upload_model.filesize)
+        db.session.delete(model_upload_model)
+        db.session.commit()
+        db.session.close()
+        return {"status": True, "message": "Success.", "model_id": model_id}
+
+    def _upload_to_services(self, application_id: str, model_upload_model: ModelUploadModel, parts: list):
+        spool_dir = _get_spool_dir(model_upload_model.upload_id)
+        hash_sha256 = hashlib.sha256()
+        with tempfile.TemporaryFile(dir=spool_dir) as fp:
+            for part in parts:
+                with open(os.path.join(spool_dir, "{:05d}.part".format(part.part_number)), "rb") as part_fp:
+                    for chunk in iter(lambda: part_fp.read(IoUtil.CHUNK_SIZE), b''):
+                        hash_sha256.update(chunk)
+                        fp.write(chunk)
+            fp.flush()
+            if hash_sha256.hexdigest() != model_upload_model.checksum:
+                raise RekcurdDashboardException("Checksum mismatch. Upload the parts again.")
+            application_model: ApplicationModel = db.session.query(
+                ApplicationModel).filter(ApplicationModel.application_id == application_id).first()
+            service_models = db.session.query(
+                ServiceModel).filter(ServiceModel.application_id == application_id).all()
+            with IoUtil.map_file(fp) as buffer:
+                upload_model_to_services(service_models, application_model, model_upload_model.filepath, buffer)
+
+    def _complete_multipart_upload(self, data_server_model: DataServerModel, model_upload_model: ModelUploadModel,
+                                   parts: list):
+        """
+        Complete the multipart upload under the path of the upload. The assembled file is not verified yet.
+        """
+        _get_data_server().complete_multipart_upload(
+            data_server_model, DataServer.model_upload_path(model_upload_model.upload_id),
+            model_upload_model.storage_upload_id, [(part.part_number, part.etag) for part in parts])
+        model_upload_model.storage_upload_id = None
+
+
+def verify_model_upload(app, project_id: int, upload_id: str) -> None:
+    """
+    Verify the SHA-256 of an assembled model, store it under the content-addressed path and register it.
+    Run in "model_upload_verify_executor". The content-addressed path is written only with verified content,
+    so an existing one is reused. The assembled file is deleted in the end, and on an error the upload is left
+    to be verified again.
+    :param app: Flask app.
+    :param project_id:
+    :param upload_id:
+    :return:
+    """
+    with app.app_context():
+        data_server_model: DataServerModel = db.session.query(
+            DataServerModel).filter(DataServerModel.project_id == project_id).first()
+        model_upload_model: ModelUploadModel = db.session.query(ModelUploadModel).get(upload_id)
+        if data_server_model is None or model_upload_model is None:
+            return
+        data_server = _get_data_server()
+        upload_filepath = DataServer.model_upload_path(upload_id)
+        try:
+            hash_sha256 = hashlib.sha256()
+            chunks, _ = data_server.open_file(data_server_model, upload_filepath)
+            for chunk in chunks:
+                hash_sha256.update(chunk)
+            if hash_sha256.hexdigest() == model_upload_model.checksum:
+                if not data_server.file_exists(data_server_model, model_upload_model.filepath):
+                    data_server.copy_file(data_server_model, upload_filepath, model_upload_model.filepath)
+                data_server.delete_file(data_server_model, upload_filepath)
+                model_upload_model.model_id = _register_model(
+                    model_upload_model.application_id, model_upload_model.filepath,
+                    model_upload_model.description, model_upload_model.checksum, model_upload_model.filesize)
+                model_upload_model.status = ModelUploadStatus.succeeded
+            else:
+                data_server.delete_file(data_server_model, upload_filepath)
+                model_upload_model.status = ModelUploadStatus.failed
+                model_upload_model.message = "Checksum mismatch. The upload is discarded."
+        except Exception as error:
+            api.logger.error("Failed to verify model upload {}: {}".format(upload_id, error))
+            db.session.rollback()
+            model_upload_model = db.session.query(ModelUploadModel).get(upload_id)
+            model_upload_model.message = str(error)
+            model_upload_model.heartbeat_date = None
+        db.session.commit()
+        db.session.close()
@@ -5,6 +5,7 @@ from . import api, status_model, update_kubernetes_deployment_info
 from rekcurd_dashboard.utils import RekcurdDashboardException
 from rekcurd_dashboard.models import db, ProjectModel, ProjectUserRoleModel, ProjectRole, KubernetesModel
 from rekcurd_dashboard.apis import DatetimeToTimestamp
+from rekcurd_dashboard.auth import auth
 
 
 project_api_namespace = Namespace('projects', description='Project API Endpoint.')
@@ -77,6 +78,8 @@ class ApiProjects(Resource):
             db.session.flush()
         db.session.commit()
         db.session.close()
+        if api.dashboard_config.IS_ACTIVATE_AUTH:
+            auth.role_cache.invalidate(user_id)
         return {"status": True, "message": "Success."}
 
 
@@ -382,7 +382,7 @@ class ApiServiceIdDeployment(Resource):
     @service_deployment_api_namespace.marshal_with(service_deployment_params)
     def get(self, project_id: int, application_id: str, service_id: str):
         """Get Kubernetes deployment info."""
-        deployment_info = load_kubernetes_deployment_info(project_id, application_id, service_id)
+        deployment_info = load_kubernetes_deployment_info(project_id, application_id, service_id, use_cache=True)
         service_model: ServiceModel = db.session.query(ServiceModel).filter(
             ServiceModel.service_id == service_id).first_or_404()
         deployment_info["display_name"] = service_model.display_name
@@ -97,7 +97,7 @@ class ApiServiceRouting(Resource):
         service_id_name = dict()
         for service_model in service_models:
             service_id_name[service_model.service_id] = service_model.display_name
-        routes = load_istio_routing(kubernetes_model, application_model, service_level)
+        routes = load_istio_routing(kubernetes_model, application_model, service_level, use_cache=True)
         response_body = dict()
         response_body["application_name"] = application_model.application_name
         response_body["service_level"] = service_level
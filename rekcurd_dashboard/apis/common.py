@@ -1,6 +1,11 @@
+import threading
+import time
 from flask_restplus import fields
 from datetime import datetime
 
+from rekcurd_dashboard.models import db
+from . import api
+
 
 status_model = {
     'status': fields.Boolean(
@@ -12,6 +17,55 @@ status_model = {
 }
 
 
+class Heartbeat:
+    """
+    Keeps the heartbeat column of the rows processed in this process up to date.
+    Background work lives only in the memory of the process which accepted it. A row in progress whose heartbeat
+    is older than STALE_SECONDS belongs to a process which has exited.
+    """
+    INTERVAL_SECONDS = 30
+    STALE_SECONDS = 4 * INTERVAL_SECONDS
+
+    def __init__(self, id_column, heartbeat_column):
+        """
+        :param id_column: Primary key column, e.g. EvaluationJobModel.job_id.
+        :param heartbeat_column: DateTime column to be updated.
+        """
+        self.id_column = id_column
+        self.heartbeat_column = heartbeat_column
+        self.__lock = threading.Lock()
+        self.__ids = set()
+        self.__thread = None
+
+    def add(self, app, id_):
+        with self.__lock:
+            self.__ids.add(id_)
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self.__run, args=(app,), daemon=True,
+                                                 name='{}-heartbeat'.format(self.id_column.class_.__tablename__))
+                self.__thread.start()
+
+    def remove(self, id_):
+        with self.__lock:
+            self.__ids.discard(id_)
+
+    def __run(self, app):
+        while True:
+            time.sleep(self.INTERVAL_SECONDS)
+            with self.__lock:
+                ids = list(self.__ids)
+            if not ids:
+                continue
+            try:
+                with app.app_context():
+                    db.session.query(self.id_column.class_).filter(self.id_column.in_(ids)).update(
+                        {self.heartbeat_column: datetime.utcnow()}, synchronize_session=False)
+                    db.session.commit()
+            except Exception as error:
+                api.logger.error("Failed to update the heartbeat of {}: {}".format(
+                    self.id_column.class_.__tablename__, error))
+
+
 class DatetimeToTimestamp(fields.Raw):
     def format(self, value):
         if isinstance(value, str):
@@ -1,8 +1,11 @@
 import base64
 import json
+import threading
+import time
 import uuid
 
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 from . import (
@@ -13,6 +16,10 @@ from rekcurd_dashboard.models import (
     db, DataServerModel, KubernetesModel, ApplicationModel,
     ServiceModel, ModelModel
 )
+from rekcurd_dashboard.utils import ConcurrentUtil
+from .kubernetes_state_cache import (
+    KubernetesStateCache, DEPLOYMENT, HORIZONTAL_POD_AUTOSCALER, VIRTUAL_SERVICE
+)
 
 
 def get_full_config_path(filename: str):
@@ -24,6 +31,114 @@ def get_full_config_path(filename: str):
     return f'{api.dashboard_config.DIR_KUBE_CONFIG}/{filename}'
 
 
+KUBERNETES_CLIENT_TTL_SECONDS = 300
+KUBERNETES_STATE_CACHE_STALENESS_SECONDS = 60
+_api_client_lock = threading.Lock()
+_api_clients = dict()
+_state_caches = dict()
+
+
+def get_api_client(kubernetes_model: KubernetesModel):
+    """
+    Get a Kubernetes ApiClient of the cluster. Clients are cached per "kubernetes_id" and reused
+    while the config file is unchanged, so that the connection pool is kept warm.
+    Clients are rebuilt after KUBERNETES_CLIENT_TTL_SECONDS to pick up refreshed access tokens.
+    :param kubernetes_model:
+    :return:
+    """
+    full_config_path = get_full_config_path(kubernetes_model.config_path)
+    config_key = (full_config_path, Path(full_config_path).stat().st_mtime)
+    with _api_client_lock:
+        cache = _api_clients.get(kubernetes_model.kubernetes_id)
+    if cache is not None:
+        cached_config_key, created_at, api_client = cache
+        if cached_config_key == config_key and time.monotonic() - created_at < KUBERNETES_CLIENT_TTL_SECONDS:
+            return api_client
+
+    from kubernetes import config
+    api_client = config.new_client_from_config(config_file=full_config_path)
+    with _api_client_lock:
+        _api_clients[kubernetes_model.kubernetes_id] = (config_key, time.monotonic(), api_client)
+    return api_client
+
+
+def evict_api_client(kubernetes_id: int):
+    """
+    Evict a cached Kubernetes ApiClient. Call this when the config file of the cluster is replaced.
+    :param kubernetes_id:
+    :return:
+    """
+    with _api_client_lock:
+        _api_clients.pop(kubernetes_id, None)
+        state_cache = _state_caches.pop(kubernetes_id, None)
+    if state_cache is not None:
+        state_cache.stop()
+    return
+
+
+def get_state_cache(kubernetes_model: KubernetesModel) -> KubernetesStateCache:
+    """
+    Get the watch-based state cache of the cluster. The cache is started on first use,
+    and it serves nothing until its first listing has finished.
+    :param kubernetes_model:
+    :return:
+    """
+    with _api_client_lock:
+        state_cache = _state_caches.get(kubernetes_model.kubernetes_id)
+        if state_cache is None:
+            cluster = KubernetesModel(
+                kubernetes_id=kubernetes_model.kubernetes_id, config_path=kubernetes_model.config_path)
+            state_cache = KubernetesStateCache(
+                partial(get_api_client, cluster), KUBERNETES_STATE_CACHE_STALENESS_SECONDS, api.logger)
+            state_cache.start()
+            _state_caches[kubernetes_model.kubernetes_id] = state_cache
+    return state_cache
+
+
+def invalidate_state_caches(kubernetes_models: list, kind: str, key):
+    """
+    Make the state caches of the clusters bypass a resource modified by the dashboard.
+    :param kubernetes_models:
+    :param kind:
+    :param key:
+    :return:
+    """
+    with _api_client_lock:
+        state_caches = [_state_caches.get(kubernetes_model.kubernetes_id) for kubernetes_model in kubernetes_models]
+    for state_cache in state_caches:
+        if state_cache is not None:
+            state_cache.invalidate(kind, key)
+    return
+
+
+KUBERNETES_MAX_WORKERS = 8
+KUBERNETES_TIMEOUT_SECONDS = 300
+
+
+def run_on_kubernetes_clusters(kubernetes_models: list, task) -> list:
+    """
+    Run a task against Kubernetes clusters concurrently.
+    The task MUST NOT touch the DB session because it runs in a worker thread.
+    :param kubernetes_models:
+    :param task: Callable which takes a Kubernetes ApiClient of the cluster.
+    :return: List of TaskResult keyed by the display name of the cluster.
+    """
+    tasks = [(kubernetes_model.display_name, partial(task, get_api_client(kubernetes_model)))
+             for kubernetes_model in kubernetes_models]
+    results = ConcurrentUtil.run(tasks, max_workers=KUBERNETES_MAX_WORKERS, timeout=KUBERNETES_TIMEOUT_SECONDS)
+    failures = [result for result in results if not result.status]
+    if failures:
+        for result in failures:
+            api.logger.error("\"{}\" cluster: {}".format(result.key, str(result.error)))
+        succeeded = [result.key for result in results if result.status]
+        raise RekcurdDashboardException(
+            "Failed on Kubernetes clusters: {}. Succeeded on Kubernetes clusters: {}.".format(
+                ", ".join("{} ({})".format(result.key, getattr(result.error, "reason", None) or result.error)
+                          for result in failures),
+                ", ".join(succeeded) or "none"))
+    return results
+
+
 def save_kubernetes_access_file(file, config_path):
     """
     Save Kubernetes config.
@@ -47,12 +162,44 @@ def remove_kubernetes_access_file(config_path):
     return
 
 
+REKCURD_WORKER_SELECTOR = "rekcurd-worker=True"
+KUBERNETES_LIST_PAGE_SIZE = 500
+
+
+def list_rekcurd_deployments(api_client, page_size: int = KUBERNETES_LIST_PAGE_SIZE):
+    """
+    Iterate Rekcurd deployments of all namespaces. Filtering is done by Kubernetes with the label selector,
+    and the list is fetched page by page with "limit" and "_continue".
+    :param api_client:
+    :param page_size:
+    :return: Generator of V1Deployment.
+    """
+    from kubernetes import client
+    v1_api = client.AppsV1Api(api_client)
+    _continue = None
+    while True:
+        kwargs = dict(label_selector=REKCURD_WORKER_SELECTOR, limit=page_size, watch=False)
+        if _continue:
+            kwargs["_continue"] = _continue
+        v1_deployment_list = v1_api.list_deployment_for_all_namespaces(**kwargs)
+        yield from v1_deployment_list.items
+        _continue = v1_deployment_list.metadata._continue if v1_deployment_list.metadata else None
+        if not _continue:
+            return
+
+
 def check_kubernetes_configfile(config_path: str):
+    """
+    Check if Kubernetes config is valid. The probe lists at most one Rekcurd deployment,
+    which verifies both the credentials and the permission to read deployments.
+    :param config_path:
+    :return:
+    """
     full_config_path = get_full_config_path(config_path)
     from kubernetes import client, config
-    config.load_kube_config(full_config_path)
-    v1_api = client.AppsV1Api()
-    v1_api.list_deployment_for_all_namespaces(watch=False)
+    api_client = config.new_client_from_config(config_file=full_config_path)
+    v1_api = client.AppsV1Api(api_client)
+    v1_api.list_deployment_for_all_namespaces(label_selector=REKCURD_WORKER_SELECTOR, limit=1, watch=False)
     return
 
 
@@ -62,81 +209,106 @@ def update_kubernetes_deployment_info(kubernetes_model: KubernetesModel):
     :param kubernetes_model:
     :return:
     """
-    full_config_path = get_full_config_path(kubernetes_model.config_path)
-    from kubernetes import client, config
-    config.load_kube_config(full_config_path)
-    v1_api = client.AppsV1Api()
-    list_deployment_for_all_namespaces = v1_api.list_deployment_for_all_namespaces(watch=False)
+    api_client = get_api_client(kubernetes_model)
 
-    """Application registration."""
-    for i in list_deployment_for_all_namespaces.items:
+    """Parse labelled deployments."""
+    applications = dict()
+    services = dict()
+    for i in list_rekcurd_deployments(api_client):
         labels = i.metadata.labels
-        if labels is None or labels.get("rekcurd-worker", "False") == "False":
+        application_id = labels["id"]
+        applications.setdefault(application_id, labels["name"])
+        service_id = labels["sel"]
+        if service_id in services:
             continue
+        service_level = i.metadata.namespace
+        version = None
+        filepath = None
+        insecure_host = None
+        insecure_port = None
+        for env_ent in i.spec.template.spec.containers[0].env:
+            if env_ent.name == "REKCURD_GRPC_PROTO_VERSION":
+                version = env_ent.value
+            elif env_ent.name == "REKCURD_MODEL_FILE_PATH":
+                filepath = env_ent.value
+            elif env_ent.name == "REKCURD_SERVICE_INSECURE_HOST":
+                insecure_host = env_ent.value
+            elif env_ent.name == "REKCURD_SERVICE_INSECURE_PORT":
+                insecure_port = int(env_ent.value)
+        services[service_id] = dict(
+            service_id=service_id,
+            application_id=application_id,
+            display_name="{}-{}".format(service_level, service_id),
+            service_level=service_level,
+            version=version,
+            filepath=filepath,
+            insecure_host=insecure_host,
+            insecure_port=insecure_port)
+    if not applications:
+        return
 
-        application_id = labels["id"]
-        application_name = labels["name"]
-        application_model = db.session.query(ApplicationModel).filter(
-            ApplicationModel.application_id == application_id).one_or_none()
-        if application_model is None:
-            application_model = ApplicationModel(
-                project_id=kubernetes_model.project_id,
-                application_id=application_id,
-                application_name=application_name)
-            db.session.add(application_model)
-            db.session.flush()
+    """Application registration."""
+    existing_application_ids = {
+        application_id for application_id, in _query_in(
+            db.session.query(ApplicationModel.application_id),
+            ApplicationModel.application_id, list(applications))}
+    db.session.bulk_insert_mappings(ApplicationModel, [
+        dict(project_id=kubernetes_model.project_id, application_id=application_id,
+             application_name=application_name)
+        for application_id, application_name in applications.items()
+        if application_id not in existing_application_ids])
 
     """Service registration."""
-    for i in list_deployment_for_all_namespaces.items:
-        labels = i.metadata.labels
-        if labels is None or labels.get("rekcurd-worker", "False") == "False":
-            continue
+    existing_service_ids = {
+        service_id for service_id, in _query_in(
+            db.session.query(ServiceModel.service_id), ServiceModel.service_id, list(services))}
+    new_services = [service for service_id, service in services.items() if service_id not in existing_service_ids]
+    if not new_services:
+        db.session.flush()
+        return
 
-        application_id = labels["id"]
-        service_id = labels["sel"]
-        service_model: ServiceModel = db.session.query(ServiceModel).filter(
-            ServiceModel.service_id == service_id).one_or_none()
-        if service_model is None:
-            service_level = i.metadata.namespace
-            version = None
-            filepath = None
-            insecure_host = None
-            insecure_port = None
-            for env_ent in i.spec.template.spec.containers[0].env:
-                if env_ent.name == "REKCURD_GRPC_PROTO_VERSION":
-                    version = env_ent.value
-                elif env_ent.name == "REKCURD_MODEL_FILE_PATH":
-                    filepath = env_ent.value
-                elif env_ent.name == "REKCURD_SERVICE_INSECURE_HOST":
-                    insecure_host = env_ent.value
-                elif env_ent.name == "REKCURD_SERVICE_INSECURE_PORT":
-                    insecure_port = int(env_ent.value)
-
-            """Model registration."""
-            model_model: ModelModel = db.session.query(ModelModel).filter(
-                ModelModel.application_id == application_id,
-                ModelModel.filepath == filepath).one_or_none()
-            if model_model is None:
-                model_model = ModelModel(application_id=application_id,
-                                         filepath=filepath, description="Automatically registered.")
-                db.session.add(model_model)
-                db.session.flush()
-
-            """Service registration."""
-            service_model = ServiceModel(
-                service_id=service_id,
-                application_id=application_id,
-                display_name="{}-{}".format(service_level, service_id),
-                service_level=service_level,
-                version=version,
-                model_id=model_model.model_id,
-                insecure_host=insecure_host,
-                insecure_port=insecure_port)
-            db.session.add(service_model)
-            db.session.flush()
+    """Model registration."""
+    def fetch_model_ids():
+        return {
+            (application_id, filepath): model_id
+            for application_id, filepath, model_id in _query_in(
+                db.session.query(ModelModel.application_id, ModelModel.filepath, ModelModel.model_id),
+                ModelModel.application_id, list({service["application_id"] for service in new_services}))}
+    model_ids = fetch_model_ids()
+    missing_models = {(service["application_id"], service["filepath"]) for service in new_services} - set(model_ids)
+    if missing_models:
+        db.session.bulk_insert_mappings(ModelModel, [
+            dict(application_id=application_id, filepath=filepath, description="Automatically registered.")
+            for application_id, filepath in missing_models])
+        model_ids = fetch_model_ids()
+
+    db.session.bulk_insert_mappings(ServiceModel, [
+        dict(service_id=service["service_id"],
+             application_id=service["application_id"],
+             display_name=service["display_name"],
+             service_level=service["service_level"],
+             version=service["version"],
+             model_id=model_ids[(service["application_id"], service["filepath"])],
+             insecure_host=service["insecure_host"],
+             insecure_port=service["insecure_port"])
+        for service in new_services])
+    db.session.flush()
     return
 
 
+def _query_in(query, column, values: list, chunk_size: int = 500):
+    """
+    Run "column IN values" in chunks to keep the number of bind parameters bounded.
+    :param query:
+    :param column:
+    :param values:
+    :param chunk_size:
+    :return:
+    """
+    for i in range(0, len(values), chunk_size):
+        yield from query.filter(column.in_(values[i:i + chunk_size])).all()
+
+
 def apply_rekcurd_to_kubernetes(
         project_id: int, application_id: str, service_level: str, version: str,
         insecure_host: str, insecure_port: int, replicas_default: int, replicas_minimum: int,
@@ -240,120 +412,116 @@ def apply_rekcurd_to_kubernetes(
             ]
         }
 
-    for kubernetes_model in kubernetes_models:
-        full_config_path = get_full_config_path(kubernetes_model.config_path)
-        from kubernetes import config
-        config.load_kube_config(full_config_path)
-
-        pod_env = [
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_UPDATE_FLAG",
-                value=commit_message
-            ),
-            client.V1EnvVar(
-                name="REKCURD_KUBERNETES_MODE",
-                value="True"
-            ),
-            client.V1EnvVar(
-                name="REKCURD_DEBUG_MODE",
-                value=str(debug_mode)
-            ),
-            client.V1EnvVar(
-                name="REKCURD_APPLICATION_NAME",
-                value=application_name
-            ),
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_INSECURE_HOST",
-                value=insecure_host
-            ),
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_INSECURE_PORT",
-                value=str(insecure_port)
-            ),
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_ID",
-                value=service_id
-            ),
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_LEVEL",
-                value=service_level
-            ),
-            client.V1EnvVar(
-                name="REKCURD_GRPC_PROTO_VERSION",
-                value=version
-            ),
-            client.V1EnvVar(
-                name="REKCURD_MODEL_MODE",
-                value=data_server_model.data_server_mode.value
-            ),
-            client.V1EnvVar(
-                name="REKCURD_MODEL_FILE_PATH",
-                value=model_model.filepath
-            ),
-            client.V1EnvVar(
-                name="REKCURD_CEPH_ACCESS_KEY",
-                value=str(data_server_model.ceph_access_key or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_CEPH_SECRET_KEY",
-                value=str(data_server_model.ceph_secret_key or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_CEPH_HOST",
-                value=str(data_server_model.ceph_host or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_CEPH_PORT",
-                value=str(data_server_model.ceph_port or "1234")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_CEPH_IS_SECURE",
-                value=str(data_server_model.ceph_is_secure or "False")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_CEPH_BUCKET_NAME",
-                value=str(data_server_model.ceph_bucket_name or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_AWS_ACCESS_KEY",
-                value=str(data_server_model.aws_access_key or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_AWS_SECRET_KEY",
-                value=str(data_server_model.aws_secret_key or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_AWS_BUCKET_NAME",
-                value=str(data_server_model.aws_bucket_name or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_GCS_ACCESS_KEY",
-                value=str(data_server_model.gcs_access_key or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_GCS_SECRET_KEY",
-                value=str(data_server_model.gcs_secret_key or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_GCS_BUCKET_NAME",
-                value=str(data_server_model.gcs_bucket_name or "xxx")
-            ),
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_GIT_URL",
-                value=service_git_url
-            ),
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_GIT_BRANCH",
-                value=service_git_branch
-            ),
-            client.V1EnvVar(
-                name="REKCURD_SERVICE_BOOT_SHELL",
-                value=service_boot_script
-            ),
-        ]
+    pod_env = [
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_UPDATE_FLAG",
+            value=commit_message
+        ),
+        client.V1EnvVar(
+            name="REKCURD_KUBERNETES_MODE",
+            value="True"
+        ),
+        client.V1EnvVar(
+            name="REKCURD_DEBUG_MODE",
+            value=str(debug_mode)
+        ),
+        client.V1EnvVar(
+            name="REKCURD_APPLICATION_NAME",
+            value=application_name
+        ),
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_INSECURE_HOST",
+            value=insecure_host
+        ),
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_INSECURE_PORT",
+            value=str(insecure_port)
+        ),
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_ID",
+            value=service_id
+        ),
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_LEVEL",
+            value=service_level
+        ),
+        client.V1EnvVar(
+            name="REKCURD_GRPC_PROTO_VERSION",
+            value=version
+        ),
+        client.V1EnvVar(
+            name="REKCURD_MODEL_MODE",
+            value=data_server_model.data_server_mode.value
+        ),
+        client.V1EnvVar(
+            name="REKCURD_MODEL_FILE_PATH",
+            value=model_model.filepath
+        ),
+        client.V1EnvVar(
+            name="REKCURD_CEPH_ACCESS_KEY",
+            value=str(data_server_model.ceph_access_key or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_CEPH_SECRET_KEY",
+            value=str(data_server_model.ceph_secret_key or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_CEPH_HOST",
+            value=str(data_server_model.ceph_host or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_CEPH_PORT",
+            value=str(data_server_model.ceph_port or "1234")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_CEPH_IS_SECURE",
+            value=str(data_server_model.ceph_is_secure or "False")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_CEPH_BUCKET_NAME",
+            value=str(data_server_model.ceph_bucket_name or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_AWS_ACCESS_KEY",
+            value=str(data_server_model.aws_access_key or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_AWS_SECRET_KEY",
+            value=str(data_server_model.aws_secret_key or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_AWS_BUCKET_NAME",
+            value=str(data_server_model.aws_bucket_name or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_GCS_ACCESS_KEY",
+            value=str(data_server_model.gcs_access_key or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_GCS_SECRET_KEY",
+            value=str(data_server_model.gcs_secret_key or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_GCS_BUCKET_NAME",
+            value=str(data_server_model.gcs_bucket_name or "xxx")
+        ),
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_GIT_URL",
+            value=service_git_url
+        ),
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_GIT_BRANCH",
+            value=service_git_branch
+        ),
+        client.V1EnvVar(
+            name="REKCURD_SERVICE_BOOT_SHELL",
+            value=service_boot_script
+        ),
+    ]
 
+    def apply_to_cluster(api_client):
         """Namespace registration."""
-        core_vi_api = client.CoreV1Api()
+        core_vi_api = client.CoreV1Api(api_client)
         try:
             core_vi_api.read_namespace(name=service_level)
         except:
@@ -451,7 +619,7 @@ def apply_rekcurd_to_kubernetes(
                 )
             )
         )
-        apps_v1_api = client.AppsV1Api()
+        apps_v1_api = client.AppsV1Api(api_client)
         if is_creation_mode:
             api.logger.info("Deployment created.")
             apps_v1_api.create_namespaced_deployment(
@@ -488,7 +656,7 @@ def apply_rekcurd_to_kubernetes(
                 selector={"sel": service_id}
             )
         )
-        core_vi_api = client.CoreV1Api()
+        core_vi_api = client.CoreV1Api(api_client)
         if is_creation_mode:
             api.logger.info("Service created.")
             core_vi_api.create_namespaced_service(
@@ -524,7 +692,7 @@ def apply_rekcurd_to_kubernetes(
                 target_cpu_utilization_percentage=autoscale_cpu_threshold
             )
         )
-        autoscaling_v1_api = client.AutoscalingV1Api()
+        autoscaling_v1_api = client.AutoscalingV1Api(api_client)
         if is_creation_mode:
             api.logger.info("Autoscaler created.")
             autoscaling_v1_api.create_namespaced_horizontal_pod_autoscaler(
@@ -540,7 +708,7 @@ def apply_rekcurd_to_kubernetes(
             )
 
         """Create Istio ingress if this is the first application."""
-        custom_object_api = client.CustomObjectsApi()
+        custom_object_api = client.CustomObjectsApi(api_client)
         try:
             custom_object_api.get_namespaced_custom_object(
                 group="networking.istio.io",
@@ -610,17 +778,24 @@ def apply_rekcurd_to_kubernetes(
                 body=ingress_virtual_service_body
             )
 
-        """Add service model."""
-        if is_creation_mode:
-            if display_name is None:
-                display_name = "{0}-{1}".format(service_level, service_id)
-            service_model = ServiceModel(
-                service_id=service_id, application_id=application_id, display_name=display_name,
-                description=description, service_level=service_level, version=version,
-                model_id=service_model_assignment, insecure_host=insecure_host,
-                insecure_port=insecure_port)
-            db.session.add(service_model)
-            db.session.flush()
+    try:
+        run_on_kubernetes_clusters(kubernetes_models, apply_to_cluster)
+    finally:
+        invalidate_state_caches(kubernetes_models, DEPLOYMENT, service_id)
+        invalidate_state_caches(kubernetes_models, HORIZONTAL_POD_AUTOSCALER, service_id)
+        invalidate_state_caches(kubernetes_models, VIRTUAL_SERVICE, (application_id, service_level))
+
+    """Add service model."""
+    if is_creation_mode:
+        if display_name is None:
+            display_name = "{0}-{1}".format(service_level, service_id)
+        service_model = ServiceModel(
+            service_id=service_id, application_id=application_id, display_name=display_name,
+            description=description, service_level=service_level, version=version,
+            model_id=service_model_assignment, insecure_host=insecure_host,
+            insecure_port=insecure_port)
+        db.session.add(service_model)
+        db.session.flush()
 
     """Finish."""
     return service_id
@@ -635,37 +810,37 @@ def delete_kubernetes_deployment(kubernetes_models: list, application_id: str, s
     :return:
     """
     service_model: ServiceModel = db.session.query(ServiceModel).filter(ServiceModel.service_id == service_id).first_or_404()
-    for kubernetes_model in kubernetes_models:
-        full_config_path = get_full_config_path(kubernetes_model.config_path)
-        from kubernetes import client, config
-        config.load_kube_config(full_config_path)
+    service_level = service_model.service_level
+    from kubernetes import client
+
+    def delete_from_cluster(api_client):
         """Deployment"""
-        apps_v1_api = client.AppsV1Api()
+        apps_v1_api = client.AppsV1Api(api_client)
         apps_v1_api.delete_namespaced_deployment(
             name="deploy-{0}".format(service_id),
-            namespace=service_model.service_level,
+            namespace=service_level,
             body=client.V1DeleteOptions()
         )
         """Service"""
-        core_vi_api = client.CoreV1Api()
+        core_vi_api = client.CoreV1Api(api_client)
         core_vi_api.delete_namespaced_service(
             name="svc-{0}".format(service_id),
-            namespace=service_model.service_level,
+            namespace=service_level,
             body=client.V1DeleteOptions()
         )
         """Autoscaler"""
-        autoscaling_v1_api = client.AutoscalingV1Api()
+        autoscaling_v1_api = client.AutoscalingV1Api(api_client)
         autoscaling_v1_api.delete_namespaced_horizontal_pod_autoscaler(
             name="hpa-{0}".format(service_id),
-            namespace=service_model.service_level,
+            namespace=service_level,
             body=client.V1DeleteOptions()
         )
         """Istio"""
-        custom_object_api = client.CustomObjectsApi()
+        custom_object_api = client.CustomObjectsApi(api_client)
         ingress_virtual_service_body = custom_object_api.get_namespaced_custom_object(
             group="networking.istio.io",
             version="v1alpha3",
-            namespace=service_model.service_level,
+            namespace=service_level,
             plural="virtualservices",
             name="ing-vs-{0}".format(application_id),
         )
@@ -680,7 +855,7 @@ def delete_kubernetes_deployment(kubernetes_models: list, application_id: str, s
             custom_object_api.patch_namespaced_custom_object(
                 group="networking.istio.io",
                 version="v1alpha3",
-                namespace=service_model.service_level,
+                namespace=service_level,
                 plural="virtualservices",
                 name="ing-vs-{0}".format(application_id),
                 body=ingress_virtual_service_body
@@ -689,11 +864,18 @@ def delete_kubernetes_deployment(kubernetes_models: list, application_id: str, s
             custom_object_api.delete_namespaced_custom_object(
                 group="networking.istio.io",
                 version="v1alpha3",
-                namespace=service_model.service_level,
+                namespace=service_level,
                 plural="virtualservices",
                 name="ing-vs-{0}".format(application_id),
                 body=client.V1DeleteOptions()
             )
+
+    try:
+        run_on_kubernetes_clusters(kubernetes_models, delete_from_cluster)
+    finally:
+        invalidate_state_caches(kubernetes_models, DEPLOYMENT, service_id)
+        invalidate_state_caches(kubernetes_models, HORIZONTAL_POD_AUTOSCALER, service_id)
+        invalidate_state_caches(kubernetes_models, VIRTUAL_SERVICE, (application_id, service_level))
     db.session.query(ServiceModel).filter(ServiceModel.service_id == service_id).delete()
     db.session.flush()
     return
@@ -709,11 +891,24 @@ def apply_new_route_weight(
         service_weight_checker.append(int(service_weights[i]))
     if sum(service_weight_checker) != 100:
         raise RekcurdDashboardException("total weight must be 100.")
-    for kubernetes_model in db.session.query(KubernetesModel).filter(KubernetesModel.project_id == project_id).all():
-        full_config_path = get_full_config_path(kubernetes_model.config_path)
-        from kubernetes import client, config
-        config.load_kube_config(full_config_path)
-        custom_object_api = client.CustomObjectsApi()
+    routes = []
+    for service_id in service_ids:
+        service_model: ServiceModel = db.session.query(ServiceModel).filter(
+            ServiceModel.service_id == service_id).first_or_404()
+        route = {
+            "destination": {
+                "port": {
+                    "number": service_model.insecure_port
+                },
+                "host": "svc-{0}".format(service_id)
+            },
+            "weight": service_weight_dict[service_id]
+        }
+        routes.append(route)
+    from kubernetes import client
+
+    def apply_to_cluster(api_client):
+        custom_object_api = client.CustomObjectsApi(api_client)
         ingress_virtual_service_body = custom_object_api.get_namespaced_custom_object(
             group="networking.istio.io",
             version="v1alpha3",
@@ -721,20 +916,6 @@ def apply_new_route_weight(
             plural="virtualservices",
             name="ing-vs-{0}".format(application_id),
         )
-        routes = []
-        for service_id in service_ids:
-            service_model: ServiceModel = db.session.query(ServiceModel).filter(
-                ServiceModel.service_id == service_id).first_or_404()
-            route = {
-                "destination": {
-                    "port": {
-                        "number": service_model.insecure_port
-                    },
-                    "host": "svc-{0}".format(service_id)
-                },
-                "weight": service_weight_dict[service_id]
-            }
-            routes.append(route)
         ingress_virtual_service_body["spec"]["http"][0]["route"] = routes
         custom_object_api.patch_namespaced_custom_object(
             group="networking.istio.io",
@@ -744,17 +925,24 @@ def apply_new_route_weight(
             name="ing-vs-{0}".format(application_id),
             body=ingress_virtual_service_body
         )
+
+    kubernetes_models = db.session.query(KubernetesModel).filter(KubernetesModel.project_id == project_id).all()
+    try:
+        run_on_kubernetes_clusters(kubernetes_models, apply_to_cluster)
+    finally:
+        invalidate_state_caches(kubernetes_models, VIRTUAL_SERVICE, (application_id, service_level))
     return
 
 
 def load_kubernetes_deployment_info(project_id: int, application_id: str, service_id: str,
-                                    kubernetes_model: KubernetesModel = None) -> dict:
+                                    kubernetes_model: KubernetesModel = None, use_cache: bool = False) -> dict:
     """
     Load deployment info from Kubernetes.
     :param project_id:
     :param application_id:
     :param service_id:
     :param kubernetes_model:
+    :param use_cache: Serve from the state cache if it is fresh. Use it only for display.
     :return:
     """
     if kubernetes_model is None:
@@ -763,20 +951,26 @@ def load_kubernetes_deployment_info(project_id: int, application_id: str, servic
     service_model: ServiceModel = db.session.query(ServiceModel).filter(
         ServiceModel.service_id == service_id).first_or_404()
 
-    full_config_path = get_full_config_path(kubernetes_model.config_path)
-    from kubernetes import client, config
-    config.load_kube_config(full_config_path)
+    v1_deployment = None
+    v1_horizontal_pod_autoscaler = None
+    if use_cache:
+        state_cache = get_state_cache(kubernetes_model)
+        v1_deployment = state_cache.get_deployment(service_id)
+        v1_horizontal_pod_autoscaler = state_cache.get_horizontal_pod_autoscaler(service_id)
+    if v1_deployment is None or v1_horizontal_pod_autoscaler is None:
+        api_client = get_api_client(kubernetes_model)
+        from kubernetes import client
 
-    apps_v1_api = client.AppsV1Api()
-    v1_deployment = apps_v1_api.read_namespaced_deployment(
-        name="deploy-{0}".format(service_id),
-        namespace=service_model.service_level
-    )
-    autoscaling_v1_api = client.AutoscalingV1Api()
-    v1_horizontal_pod_autoscaler = autoscaling_v1_api.read_namespaced_horizontal_pod_autoscaler(
-        name="hpa-{0}".format(service_id),
-        namespace=service_model.service_level
-    )
+        apps_v1_api = client.AppsV1Api(api_client)
+        v1_deployment = apps_v1_api.read_namespaced_deployment(
+            name="deploy-{0}".format(service_id),
+            namespace=service_model.service_level
+        )
+        autoscaling_v1_api = client.AutoscalingV1Api(api_client)
+        v1_horizontal_pod_autoscaler = autoscaling_v1_api.read_namespaced_horizontal_pod_autoscaler(
+            name="hpa-{0}".format(service_id),
+            namespace=service_model.service_level
+        )
 
     deployment_info = {}
     filepath = None
@@ -855,15 +1049,13 @@ def backup_kubernetes_deployment(
     :param service_model:
     :return:
     """
-    full_config_path = get_full_config_path(kubernetes_model.config_path)
-    from kubernetes import client, config
-    config.load_kube_config(full_config_path)
+    api_client = get_api_client(kubernetes_model)
+    from kubernetes import client
     save_dir = Path(api.dashboard_config.DIR_KUBE_CONFIG, application_model.application_name)
     save_dir.mkdir(parents=True, exist_ok=True)
-    api_client = client.ApiClient()
 
     """Deployment"""
-    apps_v1_api = client.AppsV1Api()
+    apps_v1_api = client.AppsV1Api(api_client)
     v1_deployment = apps_v1_api.read_namespaced_deployment(
         name="deploy-{0}".format(service_model.service_id),
         namespace=service_model.service_level,
@@ -874,7 +1066,7 @@ def backup_kubernetes_deployment(
               Path(save_dir, "deploy-{0}.json".format(service_model.service_id)).open("w", encoding='utf-8'),
               ensure_ascii=False, indent=2)
     """Service"""
-    core_vi_api = client.CoreV1Api()
+    core_vi_api = client.CoreV1Api(api_client)
     v1_service = core_vi_api.read_namespaced_service(
         name="svc-{0}".format(service_model.service_id),
         namespace=service_model.service_level,
@@ -885,7 +1077,7 @@ def backup_kubernetes_deployment(
               Path(save_dir, "svc-{0}.json".format(service_model.service_id)).open("w", encoding='utf-8'),
               ensure_ascii=False, indent=2)
     """Autoscaler"""
-    autoscaling_v1_api = client.AutoscalingV1Api()
+    autoscaling_v1_api = client.AutoscalingV1Api(api_client)
     v1_horizontal_pod_autoscaler = autoscaling_v1_api.read_namespaced_horizontal_pod_autoscaler(
         name="hpa-{0}".format(service_model.service_id),
         namespace=service_model.service_level,
@@ -898,18 +1090,24 @@ def backup_kubernetes_deployment(
     return
 
 
-def load_istio_routing(kubernetes_model: KubernetesModel, application_model: ApplicationModel, service_level: str):
+def load_istio_routing(kubernetes_model: KubernetesModel, application_model: ApplicationModel, service_level: str,
+                       use_cache: bool = False):
     """
     Load istio routing info from Kubernetes.
     :param kubernetes_model:
     :param application_model:
     :param service_level:
+    :param use_cache: Serve from the state cache if it is fresh. Use it only for display.
     :return:
     """
-    full_config_path = get_full_config_path(kubernetes_model.config_path)
-    from kubernetes import client, config
-    config.load_kube_config(full_config_path)
-    custom_object_api = client.CustomObjectsApi()
+    if use_cache:
+        ingress_virtual_service_body = get_state_cache(kubernetes_model).get_virtual_service(
+            application_model.application_id, service_level)
+        if ingress_virtual_service_body is not None:
+            return ingress_virtual_service_body["spec"]["http"][0]["route"]
+    api_client = get_api_client(kubernetes_model)
+    from kubernetes import client
+    custom_object_api = client.CustomObjectsApi(api_client)
     ingress_virtual_service_body = custom_object_api.get_namespaced_custom_object(
         group="networking.istio.io",
         version="v1alpha3",
@@ -928,14 +1126,13 @@ def backup_istio_routing(kubernetes_model: KubernetesModel, application_model: A
     :param service_level:
     :return:
     """
-    full_config_path = get_full_config_path(kubernetes_model.config_path)
-    from kubernetes import client, config
-    config.load_kube_config(full_config_path)
+    api_client = get_api_client(kubernetes_model)
+    from kubernetes import client
     save_dir = Path(api.dashboard_config.DIR_KUBE_CONFIG, application_model.application_name)
     save_dir.mkdir(parents=True, exist_ok=True)
 
     """Istio"""
-    custom_object_api = client.CustomObjectsApi()
+    custom_object_api = client.CustomObjectsApi(api_client)
     ingress_virtual_service_body = custom_object_api.get_namespaced_custom_object(
         group="networking.istio.io",
         version="v1alpha3",
@@ -954,10 +1151,9 @@ def load_secret(project_id: int, application_id: str, service_level: str, name_p
         raise RekcurdDashboardException("name_prefix must be up to 3 characters.")
     kubernetes_model: KubernetesModel = db.session.query(KubernetesModel).filter(
         KubernetesModel.project_id == project_id).first_or_404()
-    full_config_path = get_full_config_path(kubernetes_model.config_path)
-    from kubernetes import client, config
-    config.load_kube_config(full_config_path)
-    core_v1_api = client.CoreV1Api()
+    api_client = get_api_client(kubernetes_model)
+    from kubernetes import client
+    core_v1_api = client.CoreV1Api(api_client)
     name = "sec-{}-{}".format(name_prefix, application_id)
     secret_body = core_v1_api.read_namespaced_secret(
         name=name,
@@ -976,23 +1172,22 @@ def apply_secret(project_id: int, application_id: str, service_level: str, strin
         raise RekcurdDashboardException("name_prefix must be up to 3 characters.")
     application_model: ApplicationModel = db.session.query(ApplicationModel).filter(
         ApplicationModel.application_id == application_id).first_or_404()
-    for kubernetes_model in db.session.query(KubernetesModel).filter(KubernetesModel.project_id == project_id).all():
-        full_config_path = get_full_config_path(kubernetes_model.config_path)
-        from kubernetes import client, config
-        config.load_kube_config(full_config_path)
-        core_v1_api = client.CoreV1Api()
-        name = "sec-{}-{}".format(name_prefix, application_id)
-        v1_secret = client.V1Secret(
-            api_version="v1",
-            kind="Secret",
-            metadata=client.V1ObjectMeta(
-                name=name,
-                namespace=service_level,
-                labels={"rekcurd-worker": "True", "id": application_model.application_id,
-                        "name": application_model.application_name}
-            ),
-            string_data=string_data,
-            type="Opaque")
+    from kubernetes import client
+    name = "sec-{}-{}".format(name_prefix, application_id)
+    v1_secret = client.V1Secret(
+        api_version="v1",
+        kind="Secret",
+        metadata=client.V1ObjectMeta(
+            name=name,
+            namespace=service_level,
+            labels={"rekcurd-worker": "True", "id": application_model.application_id,
+                    "name": application_model.application_name}
+        ),
+        string_data=string_data,
+        type="Opaque")
+
+    def apply_to_cluster(api_client):
+        core_v1_api = client.CoreV1Api(api_client)
         try:
             core_v1_api.read_namespaced_secret(
                 name=name,
@@ -1014,6 +1209,9 @@ def apply_secret(project_id: int, application_id: str, service_level: str, strin
                 name=name,
                 namespace=service_level,
                 body=v1_secret)
+
+    kubernetes_models = db.session.query(KubernetesModel).filter(KubernetesModel.project_id == project_id).all()
+    run_on_kubernetes_clusters(kubernetes_models, apply_to_cluster)
     return
 
 
@@ -1022,10 +1220,9 @@ def delete_secret(project_id: int, application_id: str, service_level: str, name
         raise RekcurdDashboardException("name_prefix must be up to 3 characters.")
     kubernetes_model: KubernetesModel = db.session.query(KubernetesModel).filter(
         KubernetesModel.project_id == project_id).first_or_404()
-    full_config_path = get_full_config_path(kubernetes_model.config_path)
-    from kubernetes import client, config
-    config.load_kube_config(full_config_path)
-    core_v1_api = client.CoreV1Api()
+    api_client = get_api_client(kubernetes_model)
+    from kubernetes import client
+    core_v1_api = client.CoreV1Api(api_client)
     try:
         name = "sec-{}-{}".format(name_prefix, application_id)
         core_v1_api.read_namespaced_secret(
@@ -0,0 +1,194 @@
+import threading
+import time
+
+from kubernetes.client.rest import ApiException
+
+
+DEPLOYMENT = "deployment"
+HORIZONTAL_POD_AUTOSCALER = "horizontal_pod_autoscaler"
+VIRTUAL_SERVICE = "virtual_service"
+
+
+class KubernetesStateCache:
+    """
+    In-memory cache of Rekcurd resources of a Kubernetes cluster.
+    Deployments, HorizontalPodAutoscalers and Istio VirtualServices labelled "rekcurd-worker" are listed once
+    and then kept up to date by watch streams running on daemon threads. Deployments and autoscalers are
+    indexed by service_id ("sel" label), VirtualServices by application_id ("id" label) and namespace.
+    """
+    LABEL_SELECTOR = "rekcurd-worker=True"
+    PAGE_SIZE = 500
+    WATCH_TIMEOUT_SECONDS = 30
+    RETRY_INTERVAL_SECONDS = 5
+
+    def __init__(self, api_client_factory, staleness_seconds: float, logger=None):
+        """
+        :param api_client_factory: Callable which returns a Kubernetes ApiClient of the cluster.
+        :param staleness_seconds: Cached resources are served only if the watch stream of the kind
+                                  has been confirmed alive within this period.
+        :param logger:
+        """
+        self.__api_client_factory = api_client_factory
+        self.__staleness_seconds = staleness_seconds
+        self.__logger = logger
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__threads = []
+        self.__stores = {kind: dict() for kind in (DEPLOYMENT, HORIZONTAL_POD_AUTOSCALER, VIRTUAL_SERVICE)}
+        self.__synced_at = dict()
+        self.__dirty = dict()
+
+    def start(self):
+        for kind in self.__stores:
+            thread = threading.Thread(target=self.__run, args=(kind,), daemon=True,
+                                      name="kubernetes-state-cache-{}".format(kind))
+            thread.start()
+            self.__threads.append(thread)
+
+    def stop(self):
+        self.__stopped.set()
+
+    def get_deployment(self, service_id: str):
+        """
+        Get a cached V1Deployment of the service.
+        :param service_id:
+        :return: None if it is not cached or the cache is stale.
+        """
+        return self.__get(DEPLOYMENT, service_id)
+
+    def get_horizontal_pod_autoscaler(self, service_id: str):
+        """
+        Get a cached V1HorizontalPodAutoscaler of the service.
+        :param service_id:
+        :return: None if it is not cached or the cache is stale.
+        """
+        return self.__get(HORIZONTAL_POD_AUTOSCALER, service_id)
+
+    def get_virtual_service(self, application_id: str, namespace: str):
+        """
+        Get a cached Istio VirtualService body of the application.
+        :param application_id:
+        :param namespace:
+        :return: None if it is not cached or the cache is stale.
+        """
+        return self.__get(VIRTUAL_SERVICE, (application_id, namespace))
+
+    def invalidate(self, kind: str, key):
+        """
+        Bypass the cached resource until the watch stream delivers an event of it.
+        Call this after the dashboard itself modified the resource.
+        :param kind:
+        :param key: service_id for deployments and autoscalers, (application_id, namespace) for VirtualServices.
+        :return:
+        """
+        with self.__lock:
+            self.__dirty[(kind, key)] = time.monotonic()
+
+    def __get(self, kind: str, key):
+        with self.__lock:
+            synced_at = self.__synced_at.get(kind)
+            if synced_at is None or time.monotonic() - synced_at > self.__staleness_seconds:
+                return None
+            dirty_at = self.__dirty.get((kind, key))
+            if dirty_at is not None:
+                if time.monotonic() - dirty_at < self.__staleness_seconds:
+                    return None
+                del self.__dirty[(kind, key)]
+            return self.__stores[kind].get(key)
+
+    def __run(self, kind: str):
+        from kubernetes import watch
+        watcher = watch.Watch()
+        while not self.__stopped.is_set():
+            try:
+                list_function = self.__list_function(kind, self.__api_client_factory())
+                resource_version = self.__relist(kind, list_function)
+                while not self.__stopped.is_set():
+                    for event in watcher.stream(
+                            list_function, label_selector=self.LABEL_SELECTOR, resource_version=resource_version,
+                            timeout_seconds=self.WATCH_TIMEOUT_SECONDS,
+                            _request_timeout=self.WATCH_TIMEOUT_SECONDS + self.RETRY_INTERVAL_SECONDS):
+                        if event["type"] == "ERROR":
+                            raise ApiException(status=event["raw_object"].get("code"),
+                                               reason=event["raw_object"].get("message"))
+                        resource_version = self.__apply_event(kind, event)
+                    self.__touch(kind)
+            except Exception as error:
+                with self.__lock:
+                    self.__synced_at.pop(kind, None)
+                if self.__logger is not None:
+                    self.__logger.warning("Kubernetes state cache of {} is out of sync: {}".format(kind, error))
+                self.__stopped.wait(self.RETRY_INTERVAL_SECONDS)
+
+    def __list_function(self, kind: str, api_client):
+        from kubernetes import client
+        if kind == DEPLOYMENT:
+            return client.AppsV1Api(api_client).list_deployment_for_all_namespaces
+        elif kind == HORIZONTAL_POD_AUTOSCALER:
+            return client.AutoscalingV1Api(api_client).list_horizontal_pod_autoscaler_for_all_namespaces
+        else:
+            custom_object_api = client.CustomObjectsApi(api_client)
+
+            def list_virtual_services(**kwargs):
+                return custom_object_api.list_cluster_custom_object(
+                    group="networking.istio.io", version="v1alpha3", plural="virtualservices", **kwargs)
+            list_virtual_services.__doc__ = custom_object_api.list_cluster_custom_object.__doc__
+            return list_virtual_services
+
+    def __relist(self, kind: str, list_function) -> str:
+        store = dict()
+        _continue = None
+        while True:
+            kwargs = dict(label_selector=self.LABEL_SELECTOR)
+            if kind != VIRTUAL_SERVICE:
+                # CustomObjectsApi does not support pagination.
+                kwargs["limit"] = self.PAGE_SIZE
+            if _continue:
+                kwargs["_continue"] = _continue
+            response = list_function(**kwargs)
+            if isinstance(response, dict):
+                items = response.get("items", [])
+                metadata = response.get("metadata", dict())
+                resource_version, _continue = metadata.get("resourceVersion"), metadata.get("continue")
+            else:
+                items = response.items
+                resource_version, _continue = response.metadata.resource_version, response.metadata._continue
+            for item in items:
+                key = self.__key_of(kind, item)
+                if key is not None:
+                    store[key] = item
+            if not _continue:
+                break
+        with self.__lock:
+            self.__stores[kind] = store
+            self.__synced_at[kind] = time.monotonic()
+        return resource_version
+
+    def __apply_event(self, kind: str, event: dict) -> str:
+        item = event["object"]
+        key = self.__key_of(kind, item)
+        with self.__lock:
+            if key is not None:
+                if event["type"] == "DELETED":
+                    self.__stores[kind].pop(key, None)
+                else:
+                    self.__stores[kind][key] = item
+                self.__dirty.pop((kind, key), None)
+            self.__synced_at[kind] = time.monotonic()
+        if isinstance(item, dict):
+            return item["metadata"]["resourceVersion"]
+        return item.metadata.resource_version
+
+    def __touch(self, kind: str):
+        with self.__lock:
+            self.__synced_at[kind] = time.monotonic()
+
+    def __key_of(self, kind: str, item):
+        if kind == VIRTUAL_SERVICE:
+            metadata = item.get("metadata", dict())
+            labels = metadata.get("labels") or dict()
+            if "id" not in labels:
+                return None
+            return labels["id"], metadata.get("namespace")
+        labels = item.metadata.labels or dict()
+        return labels.get("sel")
@@ -12,8 +12,9 @@ from flask_jwt_simple.exceptions import InvalidHeaderError, NoAuthorizationError
 from .ldap import LdapAuthenticator
 from rekcurd_dashboard.utils.exceptions import ProjectUserRoleException, ApplicationUserRoleException
 from .authenticator import EmptyAuthenticator
+from .role_cache import RoleCache, UserRoles
 from rekcurd_dashboard.models import (
-    db, ApplicationModel, UserModel, ProjectUserRoleModel, ProjectRole, ApplicationUserRoleModel, ApplicationRole
+    db, ApplicationModel, UserModel, ProjectRole, ApplicationRole
 )
 
 
@@ -21,6 +22,7 @@ class Auth(object):
     def __init__(self):
         self.__enabled = False
         self.authenticator = EmptyAuthenticator()
+        self.role_cache = RoleCache()
         self.logger = None
 
     def is_enabled(self):
@@ -29,6 +31,7 @@ class Auth(object):
     def init_app(self, app, api, auth_conf, logger):
         JWTManager(app)
         self.logger = logger
+        self.role_cache = RoleCache()
 
         if auth_conf is None:
             self.__enabled = False
@@ -56,26 +59,10 @@ class Auth(object):
         @app.route('/api/credential', methods=['GET'])
         @jwt_required
         def credential():
-            user_id = get_jwt_identity()
-            user_model: UserModel = db.session.query(UserModel).filter(UserModel.user_id == user_id).one_or_none()
-            if user_model is None:
+            response = self.credential(get_jwt_identity())
+            if response is None:
                 abort(404)
-
-            project_roles = user_model.project_roles
-            projects = [{'project_id': pr.project_id, 'project_role': pr.project_role.name} for pr in project_roles]
-            application_roles = user_model.application_roles
-            applications = [{'application_id': ar.application_id, 'application_role': ar.application_role.name}
-                            for ar in application_roles]
-            # applications which don't have users are also accesssible as admin
-            application_ids = db.session.query(ApplicationUserRoleModel.application_id).distinct().all()
-            ids = [application_id for application_id, in application_ids]
-            public_applications = db.session.query(ApplicationModel).filter(
-                ~ApplicationModel.application_id.in_(ids)).all()
-            applications += [
-                {'application_id': application.application_id, 'role': ApplicationRole.admin.name}
-                for application in public_applications]
-
-            return jsonify({'user': user_model.serialize, 'projects': projects, 'applications': applications}), 200
+            return jsonify(response), 200
 
         @api.errorhandler(NoAuthorizationError)
         @api.errorhandler(InvalidHeaderError)
@@ -86,6 +73,29 @@ class Auth(object):
             self.logger.error(traceback.format_exc())
             return {'message': 'Authorization failed'}, 401
 
+    def credential(self, user_id):
+        """
+        Get the user and their roles.
+        :param user_id:
+        :return: None if the user is not found.
+        """
+        user_model: UserModel = db.session.query(UserModel).filter(UserModel.user_id == user_id).one_or_none()
+        if user_model is None:
+            return None
+
+        roles = self.role_cache.get(user_id)
+        projects = [{'project_id': project_id, 'project_role': role.name}
+                    for project_id, role in roles.project_roles.items()]
+        applications = [{'application_id': application_id, 'application_role': role.name}
+                        for application_id, role in roles.application_roles.items()]
+        # applications which don't have users are also accesssible as admin
+        public_applications = db.session.query(ApplicationModel.application_id).filter(
+            ApplicationModel.acl_enabled.is_(False)).all()
+        applications += [
+            {'application_id': application_id, 'role': ApplicationRole.admin.name}
+            for application_id, in public_applications]
+        return {'user': user_model.serialize, 'projects': projects, 'applications': applications}
+
     def user(self, user_info):
         uobj = db.session.query(UserModel).filter(UserModel.auth_id == user_info['uid']).one_or_none()
         if uobj is not None:
@@ -105,29 +115,11 @@ auth = Auth()
 
 
 def fetch_project_role(user_id, project_id):
-    role: ProjectUserRoleModel = db.session.query(ProjectUserRoleModel).filter(
-        ProjectUserRoleModel.project_id == project_id,
-        ProjectUserRoleModel.user_id == user_id).one_or_none()
-    if role is None:
-        return None
-    else:
-        return role.project_role
+    return auth.role_cache.get(user_id).project_role(project_id)
 
 
 def fetch_application_role(user_id, application_id):
-    role: ApplicationUserRoleModel = db.session.query(ApplicationUserRoleModel).filter(
-        ApplicationUserRoleModel.application_id == application_id,
-        ApplicationUserRoleModel.user_id == user_id).one_or_none()
-    if role is None:
-        # applications which don't have users are also accesssible as owner
-        roles = db.session.query(ApplicationUserRoleModel).filter(
-            ApplicationUserRoleModel.application_id == application_id).count()
-        if roles == 0:
-            return ApplicationRole.admin
-        else:
-            return ApplicationRole.viewer
-    else:
-        return role.application_role
+    return auth.role_cache.get(user_id).application_role(application_id)
 
 
 def auth_required(fn):
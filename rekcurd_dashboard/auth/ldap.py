@@ -1,9 +1,137 @@
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
 import ldap
+import ldap.filter
 
 from .authenticator import Authenticator
 
 
+class LdapConnectionPool(object):
+    """
+    Bounded pool of connections bound as the service account.
+    A connection which raised LDAPError is unbound and dropped instead of being returned to the pool.
+    """
+
+    def __init__(self, uri, bind_dn, bind_password, size, timeout):
+        self.uri = uri
+        self.bind_dn = bind_dn
+        self.bind_password = bind_password
+        self.timeout = timeout
+        self.__slots = threading.BoundedSemaphore(size)
+        self.__idle = queue.LifoQueue()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection bound as the service account.
+        The borrower must leave it bound as the service account.
+        :return:
+        """
+        if not self.__slots.acquire(timeout=self.timeout):
+            raise ldap.TIMEOUT({'desc': 'No LDAP connection is available'})
+        try:
+            try:
+                conn = self.__idle.get_nowait()
+            except queue.Empty:
+                conn = self.__connect()
+            try:
+                yield conn
+            except BaseException:
+                self.__unbind(conn)
+                raise
+            self.__idle.put(conn)
+        finally:
+            self.__slots.release()
+
+    def close(self):
+        """
+        Unbind idle connections.
+        :return:
+        """
+        while True:
+            try:
+                self.__unbind(self.__idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def __connect(self):
+        conn = ldap.initialize(self.uri)
+        conn.set_option(ldap.OPT_NETWORK_TIMEOUT, self.timeout)
+        conn.set_option(ldap.OPT_TIMEOUT, self.timeout)
+        conn.set_option(ldap.OPT_REFERRALS, 0)
+        try:
+            conn.simple_bind_s(self.bind_dn, self.bind_password)
+        except BaseException:
+            self.__unbind(conn)
+            raise
+        return conn
+
+    @staticmethod
+    def __unbind(conn):
+        try:
+            conn.unbind_s()
+        except ldap.LDAPError:
+            pass
+
+
+class DnCache(object):
+    """
+    Cache of user DN lookups. A user who is not found is cached for "negative_ttl" seconds.
+    Only the DN and the name are cached, never passwords.
+    """
+    MAX_ENTRIES = 10000
+
+    def __init__(self, ttl, negative_ttl):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.__lock = threading.Lock()
+        self.__entries = dict()
+
+    def get(self, username):
+        """
+        Get a cached lookup.
+        :param username:
+        :return: Tuple of whether it is cached and the entry.
+        """
+        with self.__lock:
+            expires_at, entry = self.__entries.get(username, (0, None))
+        if expires_at <= time.monotonic():
+            return False, None
+        return True, entry
+
+    def put(self, username, entry):
+        """
+        Cache a lookup.
+        :param username:
+        :param entry: Tuple of DN and name, or None if not found.
+        :return:
+        """
+        ttl = self.negative_ttl if entry is None else self.ttl
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self.__lock:
+            if len(self.__entries) >= self.MAX_ENTRIES:
+                self.__entries = {key: value for key, value in self.__entries.items() if value[0] > now}
+                if len(self.__entries) >= self.MAX_ENTRIES:
+                    self.__entries.clear()
+            self.__entries[username] = (now + ttl, entry)
+
+    def pop(self, username):
+        with self.__lock:
+            self.__entries.pop(username, None)
+
+
 class LdapAuthenticator(Authenticator):
+    DEFAULT_POOL_SIZE = 4
+    DEFAULT_TIMEOUT = 5
+    DEFAULT_DN_CACHE_TTL = 60
+    DEFAULT_DN_NEGATIVE_CACHE_TTL = 10
+
     def __init__(self, config, logger):
         self.host = config['host']
         self.port = config['port']
@@ -11,25 +139,73 @@ class LdapAuthenticator(Authenticator):
         self.bind_password = config['bind_password']
         self.search_filter = config['search_filter']
         self.search_base_dns = config['search_base_dns']
+        self.timeout = self.__get(config, 'timeout', float, self.DEFAULT_TIMEOUT)
         self.logger = logger
+        self.pool = LdapConnectionPool(
+            'ldap://{}:{}'.format(self.host, self.port), self.bind_dn, self.bind_password,
+            self.__get(config, 'pool_size', int, self.DEFAULT_POOL_SIZE), self.timeout)
+        self.dn_cache = DnCache(
+            self.__get(config, 'dn_cache_ttl', float, self.DEFAULT_DN_CACHE_TTL),
+            self.__get(config, 'dn_negative_cache_ttl', float, self.DEFAULT_DN_NEGATIVE_CACHE_TTL))
+        atexit.register(self.pool.close)
+
+    @staticmethod
+    def __get(config, key, type_, default):
+        value = config.get(key)
+        return default if value is None else type_(value)
 
     def auth_user(self, username, password):
-        lobj = ldap.initialize('ldap://{}:{}'.format(self.host, self.port))
-        try:
-            lobj.bind_s(self.bind_dn, self.bind_password)
-            filter_str = self.search_filter % username
-            for search_baase_dn in self.search_base_dns:
-                result = lobj.search_s(search_baase_dn, ldap.SCOPE_SUBTREE, filter_str)
-                user_dn, user_attrs = result[0]
-                lobj.simple_bind_s(user_dn, password)
-                return {
-                    'uid': username,
-                    'name': user_attrs.get('givenName', [b''])[0].decode('utf-8')
-                }
+        # binding with an empty password is an unauthenticated bind, which always succeeds
+        if not username or not password:
             return None
-        except IndexError:
+        for retry in (True, False):
+            try:
+                return self.__auth_user(username, password)
+            except ldap.SERVER_DOWN as e:
+                # an idle connection may have been closed by the server
+                if not retry:
+                    self.logger.error(e)
+            except ldap.LDAPError as e:
+                self.logger.error(e)
+                return None
+        return None
+
+    def __auth_user(self, username, password):
+        entry = self.__find_user(username)
+        if entry is None:
             self.logger.error('"{}" not found'.format(username))
             return None
-        except ldap.LDAPError as e:
-            self.logger.error(e)
+        user_dn, name = entry
+        with self.pool.connection() as conn:
+            try:
+                conn.simple_bind_s(user_dn, password)
+                authenticated = True
+            except ldap.INVALID_CREDENTIALS:
+                # the user may have been moved
+                self.dn_cache.pop(username)
+                authenticated = False
+            finally:
+                conn.simple_bind_s(self.bind_dn, self.bind_password)
+        if not authenticated:
+            self.logger.error('Invalid credentials of "{}"'.format(username))
             return None
+        return {'uid': username, 'name': name}
+
+    def __find_user(self, username):
+        cached, entry = self.dn_cache.get(username)
+        if cached:
+            return entry
+        filter_str = self.search_filter % ldap.filter.escape_filter_chars(username)
+        with self.pool.connection() as conn:
+            # issue the searches at once and take the first base DN which has the user
+            msgids = [conn.search_ext(search_base_dn, ldap.SCOPE_SUBTREE, filter_str, attrlist=['givenName'])
+                      for search_base_dn in self.search_base_dns]
+            results = [conn.result(msgid, all=1, timeout=self.timeout)[1] for msgid in msgids]
+        for result in results:
+            users = [(user_dn, user_attrs) for user_dn, user_attrs in result if user_dn is not None]
+            if users:
+                user_dn, user_attrs = users[0]
+                entry = (user_dn, user_attrs.get('givenName', [b''])[0].decode('utf-8'))
+                break
+        self.dn_cache.put(username, entry)
+        return entry
@@ -0,0 +1,112 @@
+# coding: utf-8
+
+
+import threading
+import time
+
+from flask import g, has_app_context
+from sqlalchemy import String, cast, literal, null
+
+from rekcurd_dashboard.models import (
+    db, ApplicationModel, ProjectUserRoleModel, ProjectRole, ApplicationUserRoleModel, ApplicationRole
+)
+
+
+class UserRoles(object):
+    """
+    Project and application roles of a user.
+    """
+
+    def __init__(self, project_roles: dict, application_roles: dict, applications_with_roles: set):
+        self.__project_roles = project_roles
+        self.__application_roles = application_roles
+        self.__applications_with_roles = applications_with_roles
+
+    @property
+    def project_roles(self) -> dict:
+        return dict(self.__project_roles)
+
+    @property
+    def application_roles(self) -> dict:
+        return dict(self.__application_roles)
+
+    def project_role(self, project_id):
+        return self.__project_roles.get(int(project_id))
+
+    def application_role(self, application_id):
+        role = self.__application_roles.get(application_id)
+        if role is not None:
+            return role
+        # applications which don't have users are also accesssible as owner
+        if application_id in self.__applications_with_roles:
+            return ApplicationRole.viewer
+        else:
+            return ApplicationRole.admin
+
+
+class RoleCache(object):
+    """
+    Cache of UserRoles keyed by user_id.
+    Roles are kept for a request in flask.g, and for TTL_SECONDS across requests. An ACL change
+    must call "invalidate". Other processes see the change after TTL_SECONDS at the latest.
+    """
+    TTL_SECONDS = 60
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__entries = dict()
+
+    def get(self, user_id) -> UserRoles:
+        """
+        Get roles of the user.
+        :param user_id:
+        :return:
+        """
+        if has_app_context() and g.get('user_roles') is not None and g.user_roles[0] == user_id:
+            return g.user_roles[1]
+        now = time.monotonic()
+        with self.__lock:
+            expires_at, roles = self.__entries.get(user_id, (0, None))
+        if roles is None or expires_at <= now:
+            roles = self.__load(user_id)
+            with self.__lock:
+                self.__entries[user_id] = (now + self.TTL_SECONDS, roles)
+        if has_app_context():
+            g.user_roles = (user_id, roles)
+        return roles
+
+    def invalidate(self, user_id=None):
+        """
+        Drop cached roles.
+        :param user_id: Drop roles of all users if None.
+        :return:
+        """
+        with self.__lock:
+            if user_id is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(user_id, None)
+        if has_app_context():
+            g.pop('user_roles', None)
+
+    @staticmethod
+    def __load(user_id) -> UserRoles:
+        project_roles = db.session.query(
+            literal('project'), cast(ProjectUserRoleModel.project_id, String),
+            cast(ProjectUserRoleModel.project_role, String)).filter(ProjectUserRoleModel.user_id == user_id)
+        application_roles = db.session.query(
+            literal('application'), ApplicationUserRoleModel.application_id,
+            cast(ApplicationUserRoleModel.application_role, String)).filter(ApplicationUserRoleModel.user_id == user_id)
+        applications_with_roles = db.session.query(
+            literal('owned'), ApplicationModel.application_id, cast(null(), String)).filter(
+            ApplicationModel.acl_enabled.is_(True))
+
+        roles = {'project': dict(), 'application': dict(), 'owned': set()}
+        for kind, key, role in project_roles.union_all(application_roles, applications_with_roles):
+            if kind == 'project':
+                roles[kind][int(key)] = ProjectRole[role]
+            elif kind == 'application':
+                roles[kind][key] = ApplicationRole[role]
+            else:
+                roles[kind].add(key)
+        return UserRoles(roles['project'], roles['application'], roles['owned'])
@@ -36,6 +36,13 @@ def create_parser():
         '--logger', required=False, help='Python file of your custom logger. Need to inherit "logger_interface.py". See https://github.com/rekcurd/dashboard/blob/master/rekcurd_dashboard/logger/logger_interface.py')
     parser_server.add_argument(
         '--debug', required=False, type=bool, help='Debug mode.')
+    parser_server.add_argument(
+        '--workers', required=False, type=int, help='Number of worker processes. Default 1.')
+    parser_server.add_argument(
+        '--worker-class', required=False, choices=['sync', 'gthread', 'gevent'],
+        help='Worker type. Default "gthread". "gevent" requires gevent to be installed.')
+    parser_server.add_argument(
+        '--threads', required=False, type=int, help='Number of threads per worker of "gthread". Default 4.')
     parser_server.add_argument(
         '--kube_config_dir', required=False, help='Directory of kube_config files.')
     parser_server.add_argument(
@@ -63,6 +70,8 @@ def create_parser():
         '--settings', required=False, help='settings YAML. See https://github.com/rekcurd/dashboard/blob/master/rekcurd_dashboard/template/settings.yml-tpl')
     parser_db.add_argument(
         '--logger', required=False, help='Python file of your custom logger. Need to inherit "logger_interface.py". See https://github.com/rekcurd/dashboard/blob/master/rekcurd_dashboard/logger/logger_interface.py')
+    parser_db.add_argument(
+        '--directory', required=False, help='Migration directory. Default is the migrations shipped with rekcurd_dashboard.')
     parser_db.add_argument(
         '--db_mode', required=False, help='Dashboard DB mode. One of [sqlite/mysql]. Default "sqlite".')
     parser_db.add_argument(
@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 
 
+import os
+
 from rekcurd_dashboard.core import create_app
 
 
+MIGRATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
 def db_handler(args: dict):
     import sys
     from flask_script import Manager
@@ -18,7 +23,7 @@ def db_handler(args: dict):
             sys.argv.append(tmp[i+1])
             break
     app, _ = create_app(config_file=args["settings"], logger_file=args["logger"], **args)
-    migrate = Migrate(app, db)
+    migrate = Migrate(app, db, directory=args.get("directory") or MIGRATION_DIR)
     manager = Manager(app)
     manager.add_command('db', MigrateCommand)
     manager.run()
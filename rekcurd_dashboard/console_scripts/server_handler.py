@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
 
-from rekcurd_dashboard.core import create_app
+from rekcurd_dashboard.core import create_app, run_server
+from rekcurd_dashboard.utils import RekcurdDashboardConfig
 
 
 def server_handler(args: dict):
-    app, config = create_app(config_file=args["settings"], logger_file=args["logger"], **args)
-    app.run(host=args["host"], port=config.SERVICE_PORT, threaded=True)
+    config = RekcurdDashboardConfig(args["settings"])
+    config.set_configurations(**args)
+    run_server(lambda: create_app(config_file=args["settings"], logger_file=args["logger"], **args)[0],
+               config, host=args["host"])
@@ -1,2 +1,7 @@
+from .grpc_channel_pool import GrpcChannelPool
 from .rekcurd_dashboard_client import RekcurdDashboardClient
+from .evaluation_detail_cache import (
+    EvaluationDetailCache, EvaluationDetails, EvaluationDetailsBuilder, evaluation_detail_cache
+)
 from .create_app import create_app
+from .server import DashboardServer, run_server
@@ -8,9 +8,10 @@ from flask_cors import CORS
 from pathlib import Path
 
 from rekcurd_dashboard.utils import RekcurdDashboardConfig
-from rekcurd_dashboard.models import db
+from rekcurd_dashboard.models import db, InstrumentedQueuePool
 from rekcurd_dashboard.apis import api
 from rekcurd_dashboard.auth import auth
+from .evaluation_detail_cache import evaluation_detail_cache
 
 
 def create_app(config_file: str = None, logger_file: str = None, **options) -> (Flask, RekcurdDashboardConfig):
@@ -35,7 +36,10 @@ def create_app(config_file: str = None, logger_file: str = None, **options) -> (
 
     # set configurations
     app.config['SQLALCHEMY_DATABASE_URI'] = config.SQLALCHEMY_DATABASE_URI
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = True
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = config.SQLALCHEMY_ENGINE_OPTIONS
+    if app.config['SQLALCHEMY_ENGINE_OPTIONS']:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS']['poolclass'] = InstrumentedQueuePool
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['DEBUG'] = config.DEBUG_MODE
     app.config['SWAGGER_UI_DOC_EXPANSION'] = 'list'
     app.config['RESTPLUS_VALIDATE'] = True
@@ -57,6 +61,7 @@ def create_app(config_file: str = None, logger_file: str = None, **options) -> (
     # initialize applications
     api.init_app(app, dashboard_config=config, logger=logger)
     auth.init_app(app, api, config.AUTH_CONFIG, logger=logger)
+    evaluation_detail_cache.configure(config.EVALUATION_CACHE_DIR, config.EVALUATION_CACHE_MAX_SIZE)
     CORS(app)
     db.init_app(app)
     db.create_all(app=app)
@@ -65,8 +70,9 @@ def create_app(config_file: str = None, logger_file: str = None, **options) -> (
 
 
 def main(args) -> None:
+    from .server import run_server
     app, config = create_app(*args[1:])
-    app.run(host='0.0.0.0', port=config.SERVICE_PORT, threaded=True)
+    run_server(lambda: app, config)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+
+import datetime
+import json
+import os
+import tempfile
+import threading
+from numbers import Real
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+class EvaluationDetails:
+    """
+    Decoded evaluation details held column by column.
+    "is_correct" is a boolean array and "score" is a float array if all scores are scalars.
+    The other columns are JSON-encoded values concatenated in a byte array with their offsets,
+    so that a page is decoded without decoding the whole result.
+    """
+    JSON_COLUMNS = ('input', 'output', 'label', 'score')
+
+    def __init__(self, arrays: dict):
+        self.__arrays = arrays
+
+    @classmethod
+    def from_details(cls, details: Iterable[dict], max_nbytes: int = None):
+        """
+        Build columns from the details of "run_evaluation_data".
+        :param details: Iterable of dict with input/output/label/score/is_correct.
+        :param max_nbytes: Stop reading "details" once the columns exceed this size.
+        :return: None if the columns exceed "max_nbytes".
+        """
+        builder = EvaluationDetailsBuilder(max_nbytes)
+        for detail in details:
+            if not builder.add(detail):
+                return None
+        return builder.build()
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path, allow_pickle=False) as npz:
+            return cls({name: npz[name] for name in npz.files})
+
+    def save(self, fp):
+        np.savez(fp, **self.__arrays)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.__arrays.values())
+
+    def __len__(self):
+        return len(self.__arrays['is_correct'])
+
+    def select(self, only_incorrect: bool = False, offset: int = 0, limit: int = None) -> np.ndarray:
+        """
+        Select row indices of a page.
+        :param only_incorrect: Select incorrectly predicted rows only.
+        :param offset:
+        :param limit: All rows after "offset" if None.
+        :return: Row indices.
+        """
+        if only_incorrect:
+            indices = np.flatnonzero(~self.__arrays['is_correct'])
+        else:
+            indices = np.arange(len(self))
+        end = None if limit is None else offset + limit
+        return indices[offset:end]
+
+    def row(self, index: int) -> dict:
+        """
+        Decode a row.
+        :param index:
+        :return: dict with input/output/label/score/is_correct.
+        """
+        detail = {'is_correct': bool(self.__arrays['is_correct'][index])}
+        for name in self.JSON_COLUMNS:
+            if name + '.data' in self.__arrays:
+                offsets = self.__arrays[name + '.offsets']
+                detail[name] = json.loads(
+                    self.__arrays[name + '.data'][offsets[index]:offsets[index + 1]].tobytes().decode('utf-8'))
+            else:
+                detail[name] = float(self.__arrays[name][index])
+        return detail
+
+
+class EvaluationDetailsBuilder:
+    """
+    Builds EvaluationDetails a row at a time, so that rows are collected while they are streamed to a client.
+    """
+    # a row takes a boolean, a score and an offset of each column besides the JSON
+    ROW_NBYTES = 1 + 8 + 8 * len(EvaluationDetails.JSON_COLUMNS)
+
+    def __init__(self, max_nbytes: int = None):
+        """
+        :param max_nbytes: Give up once the columns exceed this size.
+        """
+        self.max_nbytes = max_nbytes
+        self.nbytes = 0
+        self.__is_correct = list()
+        self.__buffers = {name: bytearray() for name in EvaluationDetails.JSON_COLUMNS}
+        self.__offsets = {name: [0] for name in EvaluationDetails.JSON_COLUMNS}
+        self.__scores = list()
+
+    @property
+    def too_large(self) -> bool:
+        return self.max_nbytes is not None and self.nbytes > self.max_nbytes
+
+    def add(self, detail: dict) -> bool:
+        """
+        Add a row. Rows are discarded once the columns exceed "max_nbytes".
+        :param detail: dict with input/output/label/score/is_correct.
+        :return: False if the columns exceed "max_nbytes".
+        """
+        if self.too_large:
+            return False
+        self.__is_correct.append(bool(detail['is_correct']))
+        score = detail['score']
+        if self.__scores is not None:
+            if isinstance(score, Real) and not isinstance(score, bool):
+                self.__scores.append(score)
+            else:
+                self.__scores = None
+        self.nbytes += self.ROW_NBYTES
+        for name in EvaluationDetails.JSON_COLUMNS:
+            data = json.dumps(detail[name]).encode('utf-8')
+            self.__buffers[name] += data
+            self.__offsets[name].append(len(self.__buffers[name]))
+            self.nbytes += len(data)
+        if self.too_large:
+            self.__buffers = self.__offsets = self.__is_correct = self.__scores = None
+            return False
+        return True
+
+    def build(self) -> Optional[EvaluationDetails]:
+        """
+        :return: None if the columns exceed "max_nbytes".
+        """
+        if self.too_large:
+            return None
+        arrays = {'is_correct': np.array(self.__is_correct, dtype=np.bool_)}
+        if self.__scores is not None:
+            arrays['score'] = np.array(self.__scores, dtype=np.float64)
+        for name in EvaluationDetails.JSON_COLUMNS:
+            if name == 'score' and self.__scores is not None:
+                continue
+            arrays[name + '.data'] = np.frombuffer(bytes(self.__buffers[name]), dtype=np.uint8)
+            arrays[name + '.offsets'] = np.array(self.__offsets[name], dtype=np.int64)
+        return EvaluationDetails(arrays)
+
+
+class EvaluationDetailCache:
+    """
+    On-disk cache of decoded evaluation details keyed by evaluation result ID and its register date.
+    Re-evaluation updates the register date, so an outdated entry is never read. Entries are files
+    in "directory", and the least recently read ones are evicted when their total size exceeds "max_size".
+    Entries are replaced atomically, so the directory can be shared by processes.
+    Results too large to be cached are remembered in memory, so that they are not collected again.
+    """
+    MAX_TOO_LARGE_ENTRIES = 10000
+
+    def __init__(self, directory: str = None, max_size: int = 0):
+        self.__lock = threading.Lock()
+        self.__too_large = set()
+        self.configure(directory, max_size)
+
+    def configure(self, directory: str, max_size: int):
+        """
+        Set the cache directory. The cache is disabled if "max_size" is 0.
+        :param directory:
+        :param max_size: Maximum total size in bytes.
+        :return:
+        """
+        self.directory = directory
+        self.max_size = max_size if directory else 0
+        self.__too_large.clear()
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, evaluation_result_id: int, register_date: datetime.datetime) -> Optional[EvaluationDetails]:
+        """
+        Get cached details.
+        :param evaluation_result_id:
+        :param register_date: Register date of the evaluation result.
+        :return: None if not cached.
+        """
+        if not self.enabled:
+            return None
+        path = self.__path(evaluation_result_id, register_date)
+        try:
+            details = EvaluationDetails.load(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return details
+
+    def put(self, evaluation_result_id: int, register_date: datetime.datetime, details: EvaluationDetails) -> bool:
+        """
+        Cache details.
+        :param evaluation_result_id:
+        :param register_date: Register date of the evaluation result.
+        :param details:
+        :return: False if not cached because they are too large.
+        """
+        if not self.enabled:
+            return False
+        if details.nbytes > self.max_size:
+            self.__remember_too_large(evaluation_result_id, register_date)
+            return False
+        self.invalidate(evaluation_result_id)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                details.save(f)
+            os.replace(tmp_path, self.__path(evaluation_result_id, register_date))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.__evict()
+        return True
+
+    def builder(self, evaluation_result_id: int,
+                register_date: datetime.datetime) -> Optional[EvaluationDetailsBuilder]:
+        """
+        Start collecting details to be cached.
+        :param evaluation_result_id:
+        :param register_date: Register date of the evaluation result.
+        :return: None if the cache is disabled or the details are known to be too large.
+        """
+        if not self.enabled or (evaluation_result_id, register_date) in self.__too_large:
+            return None
+        return EvaluationDetailsBuilder(self.max_size)
+
+    def put_built(self, evaluation_result_id: int, register_date: datetime.datetime,
+                  builder: EvaluationDetailsBuilder) -> bool:
+        """
+        Cache details collected by "builder".
+        :param evaluation_result_id:
+        :param register_date: Register date of the evaluation result.
+        :param builder:
+        :return: False if not cached because they are too large.
+        """
+        details = builder.build()
+        if details is None:
+            self.__remember_too_large(evaluation_result_id, register_date)
+            return False
+        return self.put(evaluation_result_id, register_date, details)
+
+    def invalidate(self, evaluation_result_id: int):
+        """
+        Remove cached details of the evaluation result.
+        :param evaluation_result_id:
+        :return:
+        """
+        if not self.enabled:
+            return
+        prefix = '{}-'.format(evaluation_result_id)
+        for entry in self.__entries():
+            if entry.name.startswith(prefix):
+                self.__remove(entry.path)
+
+    def __remember_too_large(self, evaluation_result_id: int, register_date: datetime.datetime):
+        with self.__lock:
+            if len(self.__too_large) >= self.MAX_TOO_LARGE_ENTRIES:
+                self.__too_large.clear()
+            self.__too_large.add((evaluation_result_id, register_date))
+
+    def __path(self, evaluation_result_id: int, register_date: datetime.datetime) -> str:
+        return os.path.join(self.directory, '{}-{}.npz'.format(
+            evaluation_result_id, register_date.strftime('%Y%m%d%H%M%S%f')))
+
+    def __entries(self):
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith('.npz')]
+
+    def __evict(self):
+        with self.__lock:
+            stats = list()
+            for entry in self.__entries():
+                try:
+                    stats.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+                except FileNotFoundError:
+                    pass
+            total_size = sum(size for _, size, _ in stats)
+            for _, size, path in sorted(stats):
+                if total_size <= self.max_size:
+                    break
+                self.__remove(path)
+                total_size -= size
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+evaluation_detail_cache = EvaluationDetailCache()
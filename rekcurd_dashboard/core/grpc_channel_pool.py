@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+
+import atexit
+import threading
+import time
+
+import grpc
+
+
+class GrpcChannelPool:
+    """
+    Process-wide pool of gRPC channels keyed by (host, port).
+    Channels are shared by all requests together with their stubs. A channel which has not been
+    requested for IDLE_SECONDS is dropped from the pool; it is not closed explicitly, so that
+    in-flight RPCs holding its stub can finish, and it is released once the last stub is gone.
+    """
+    IDLE_SECONDS = 600
+    CHANNEL_OPTIONS = [
+        ('grpc.keepalive_time_ms', 30000),
+        ('grpc.keepalive_timeout_ms', 10000),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.max_pings_without_data', 0),
+    ]
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__channels = dict()
+
+    def get_stub(self, host: str, port: int, stub_class):
+        """
+        Get a shared stub of the channel to "host:port".
+        :param host:
+        :param port:
+        :param stub_class: Stub class generated by grpc_tools.
+        :return:
+        """
+        now = time.monotonic()
+        with self.__lock:
+            self.__evict_idle_channels(now)
+            entry = self.__channels.get((host, port))
+            if entry is None:
+                entry = dict(channel=grpc.insecure_channel(
+                    "{}:{}".format(host, port), options=self.CHANNEL_OPTIONS), stubs=dict())
+                self.__channels[(host, port)] = entry
+            entry["last_used"] = now
+            stub = entry["stubs"].get(stub_class)
+            if stub is None:
+                stub = stub_class(entry["channel"])
+                entry["stubs"][stub_class] = stub
+            return stub
+
+    def close(self):
+        """
+        Close all channels. Call this at shutdown.
+        :return:
+        """
+        with self.__lock:
+            channels, self.__channels = self.__channels, dict()
+        for entry in channels.values():
+            entry["channel"].close()
+
+    def __evict_idle_channels(self, now: float):
+        for key in [key for key, entry in self.__channels.items() if now - entry["last_used"] > self.IDLE_SECONDS]:
+            del self.__channels[key]
+
+
+grpc_channel_pool = GrpcChannelPool()
+atexit.register(grpc_channel_pool.close)
@@ -4,9 +4,9 @@
 # DO NOT EDIT HERE!!
 
 import traceback, types
-import grpc
 
 from rekcurd_dashboard.protobuf import rekcurd_pb2, rekcurd_pb2_grpc
+from rekcurd_dashboard.core.grpc_channel_pool import grpc_channel_pool
 
 from rekcurd_dashboard.logger import SystemLoggerInterface, JsonSystemLogger
 from rekcurd_dashboard.utils import ProtobufUtil
@@ -64,8 +64,7 @@ class RekcurdDashboardClient:
                            ('x-rekcurd-sevice-level', service_level),
                            ('x-rekcurd-grpc-version', rekcurd_grpc_version)]
 
-        channel = grpc.insecure_channel("{}:{}".format(host, port))
-        self.stub = rekcurd_pb2_grpc.RekcurdDashboardStub(channel)
+        self.stub = grpc_channel_pool.get_stub(host, port, rekcurd_pb2_grpc.RekcurdDashboardStub)
 
     @property
     def logger(self):
@@ -149,7 +148,8 @@ class RekcurdDashboardClient:
                                     including_default_value_fields=True)
         return response
 
-    def __get_value_from_io(self, io:rekcurd_pb2.IO):
+    @staticmethod
+    def __get_value_from_io(io:rekcurd_pb2.IO):
         if io.WhichOneof('io_oneof') == 'str':
             val = io.str.val
         else:
@@ -160,25 +160,37 @@ class RekcurdDashboardClient:
         else:
             return list(val)
 
+    @classmethod
+    def decode_evaluation_details(cls, raw_response:rekcurd_pb2.EvaluationResultResponse):
+        """
+        Decode details of EvaluationResultResponse by accessing their fields directly.
+        Details are the bulk of the response, and decoding them through protobuf_to_dict
+        walks every message by reflection.
+        :param raw_response:
+        :return: List of dict with input/label/output/score/is_correct.
+        """
+        get_value = cls.__get_value_from_io
+        details = []
+        for detail in raw_response.detail:
+            score = detail.score
+            details.append({
+                'input': get_value(detail.input),
+                'label': get_value(detail.label),
+                'output': get_value(detail.output),
+                'score': score[0] if len(score) == 1 else list(score),
+                'is_correct': detail.is_correct,
+            })
+        return details
+
     @error_handling({"status": False})
     def run_evaluation_data(self, data_path:str, result_path:str):
         request = rekcurd_pb2.EvaluationResultRequest(data_path=data_path, result_path=result_path)
         for raw_response in self.stub.EvaluationResult(request, metadata=self.__metadata):
-            details = []
-            for detail in raw_response.detail:
-                details.append(dict(
-                    protobuf_to_dict(detail, including_default_value_fields=True),
-                    input=self.__get_value_from_io(detail.input),
-                    label=self.__get_value_from_io(detail.label),
-                    output=self.__get_value_from_io(detail.output),
-                    score=detail.score[0] if len(detail.score) == 1 else list(detail.score)
-                ))
             metrics = raw_response.metrics
             metrics_response = dict(protobuf_to_dict(metrics, including_default_value_fields=True),
                                     label=[self.__get_value_from_io(l) for l in metrics.label])
-            response = protobuf_to_dict(raw_response,
-                                        including_default_value_fields=True)
-            response['detail'] = details
-            response['status'] = True
-            response['metrics'] = metrics_response
-            yield response
+            yield {
+                'metrics': metrics_response,
+                'detail': self.decode_evaluation_details(raw_response),
+                'status': True
+            }
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+
+from typing import Callable
+
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+
+from rekcurd_dashboard.models import db
+from rekcurd_dashboard.utils import RekcurdDashboardConfig
+
+
+class DashboardServer(BaseApplication):
+    """
+    Gunicorn server running the dashboard.
+    Workers are forked from the master. With "preload_app", the app is created once in the master and
+    shared by the workers copy-on-write. Otherwise each worker creates the app, and SIGHUP reloads it.
+    """
+
+    def __init__(self, app_factory: Callable[[], Flask], options: dict):
+        self.app_factory = app_factory
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.app_factory()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        # DB connections opened by the master must not be shared with the workers
+        with server.app.wsgi().app_context():
+            db.engine.dispose()
+
+
+def run_server(app_factory: Callable[[], Flask], config: RekcurdDashboardConfig, host: str = '0.0.0.0'):
+    """
+    Run the dashboard with gunicorn.
+    :param app_factory: Callable which returns the Flask app.
+    :param config: "SERVER_OPTIONS" and "SERVICE_PORT" are used.
+    :param host:
+    :return:
+    """
+    options = dict(config.SERVER_OPTIONS)
+    preload = options.pop('preload')
+    # gevent patches the standard library when a worker starts, so the app must be created after that
+    options['preload_app'] = preload and options['worker_class'] != 'gevent'
+    options['bind'] = '{}:{}'.format(host, config.SERVICE_PORT)
+    options['post_fork'] = post_fork
+    DashboardServer(app_factory, options).run()
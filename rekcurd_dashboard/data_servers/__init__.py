@@ -15,37 +15,125 @@ class DataServer(object):
     Upload/Download files.
     """
 
+    def __init__(self, part_size: int = None, max_concurrency: int = None):
+        """
+        :param part_size: Part size of multipart uploads in bytes.
+        :param max_concurrency: Number of parts uploaded at the same time.
+        """
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    def invalidate_clients(project_id: int) -> None:
+        """
+        Discard storage clients of the project. Call this when the data server settings are changed.
+        :param project_id:
+        :return:
+        """
+        for handler_class in (CephHandler, AwsS3Handler, GcsHandler):
+            handler_class.invalidate_clients(project_id)
+
     def _get_handler(self, data_server_model: DataServerModel):
         if data_server_model.data_server_mode == DataServerModeEnum.LOCAL:
-            return LocalHandler()
+            return LocalHandler(self.part_size, self.max_concurrency)
         elif data_server_model.data_server_mode == DataServerModeEnum.CEPH_S3:
-            return CephHandler()
+            return CephHandler(self.part_size, self.max_concurrency)
         elif data_server_model.data_server_mode == DataServerModeEnum.AWS_S3:
-            return AwsS3Handler()
+            return AwsS3Handler(self.part_size, self.max_concurrency)
         elif data_server_model.data_server_mode == DataServerModeEnum.GCS:
-            return GcsHandler()
+            return GcsHandler(self.part_size, self.max_concurrency)
         else:
             raise ValueError("Invalid DataServerModeEnum value.")
 
     def upload_model(
-            self, data_server_model: DataServerModel, application_model: ApplicationModel, local_filepath: str) -> str:
-        filepath = "{0}/ml-{1:%Y%m%d%H%M%S}.model".format(application_model.application_name, datetime.datetime.utcnow())
-        api_handler = self._get_handler(data_server_model)
-        api_handler.upload(data_server_model, filepath, local_filepath)
+            self, data_server_model: DataServerModel, application_model: ApplicationModel,
+            local_filepath: str = None, stream=None, checksum: str = None) -> str:
+        """
+        Upload a model.
+        :param data_server_model:
+        :param application_model:
+        :param local_filepath:
+        :param stream:
+        :param checksum: SHA-256 of the model. If given, the model is stored under a content-addressed path
+                         shared by all applications, and nothing is transferred if the path already exists.
+        :return: Remote file path.
+        """
+        if checksum is None:
+            filepath = "{0}/ml-{1:%Y%m%d%H%M%S}.model".format(
+                application_model.application_name, datetime.datetime.utcnow())
+        else:
+            filepath = self.content_addressed_model_path(checksum)
+            if self.file_exists(data_server_model, filepath):
+                return filepath
+        self._upload(data_server_model, filepath, local_filepath, stream)
         return filepath
 
+    @staticmethod
+    def content_addressed_model_path(checksum: str) -> str:
+        return "models/{}.model".format(checksum)
+
+    @staticmethod
+    def model_upload_path(upload_id: str) -> str:
+        """
+        Path where a resumable model upload is assembled before its checksum is verified.
+        :param upload_id:
+        :return:
+        """
+        return "model-uploads/{}.model".format(upload_id)
+
     def upload_evaluation_data(
-            self, data_server_model: DataServerModel, application_model: ApplicationModel, local_filepath: str) -> str:
+            self, data_server_model: DataServerModel, application_model: ApplicationModel,
+            local_filepath: str = None, stream=None) -> str:
         filepath = "{0}/eval-{1:%Y%m%d%H%M%S}.txt".format(application_model.application_name, datetime.datetime.utcnow())
-        api_handler = self._get_handler(data_server_model)
-        api_handler.upload(data_server_model, filepath, local_filepath)
+        self._upload(data_server_model, filepath, local_filepath, stream)
         return filepath
 
+    def _upload(self, data_server_model: DataServerModel, filepath: str, local_filepath: str = None, stream=None):
+        api_handler = self._get_handler(data_server_model)
+        if stream is not None:
+            api_handler.upload_stream(data_server_model, filepath, stream)
+        else:
+            api_handler.upload(data_server_model, filepath, local_filepath)
+
     def download_file(
             self, data_server_model: DataServerModel, filepath: str, local_filepath: str) -> None:
         api_handler = self._get_handler(data_server_model)
         api_handler.download(data_server_model, filepath, local_filepath)
 
+    def initiate_multipart_upload(self, data_server_model: DataServerModel, filepath: str) -> str:
+        api_handler = self._get_handler(data_server_model)
+        return api_handler.initiate_multipart_upload(data_server_model, filepath)
+
+    def upload_part(self, data_server_model: DataServerModel, filepath: str, upload_id: str,
+                    part_number: int, fp, size: int, md5: str) -> str:
+        api_handler = self._get_handler(data_server_model)
+        return api_handler.upload_part(data_server_model, filepath, upload_id, part_number, fp, size, md5)
+
+    def complete_multipart_upload(
+            self, data_server_model: DataServerModel, filepath: str, upload_id: str, parts: list) -> None:
+        api_handler = self._get_handler(data_server_model)
+        api_handler.complete_multipart_upload(data_server_model, filepath, upload_id, parts)
+
+    def abort_multipart_upload(self, data_server_model: DataServerModel, filepath: str, upload_id: str) -> None:
+        api_handler = self._get_handler(data_server_model)
+        api_handler.abort_multipart_upload(data_server_model, filepath, upload_id)
+
+    def file_exists(self, data_server_model: DataServerModel, filepath: str) -> bool:
+        api_handler = self._get_handler(data_server_model)
+        return api_handler.exists(data_server_model, filepath)
+
+    def get_file_size(self, data_server_model: DataServerModel, filepath: str) -> int:
+        api_handler = self._get_handler(data_server_model)
+        return api_handler.get_size(data_server_model, filepath)
+
+    def open_file(self, data_server_model: DataServerModel, filepath: str, start: int = 0, end: int = None):
+        api_handler = self._get_handler(data_server_model)
+        return api_handler.open_read(data_server_model, filepath, start, end)
+
+    def copy_file(self, data_server_model: DataServerModel, src_filepath: str, dst_filepath: str) -> None:
+        api_handler = self._get_handler(data_server_model)
+        api_handler.copy(data_server_model, src_filepath, dst_filepath)
+
     def delete_file(self, data_server_model: DataServerModel, filepath: str) -> None:
         api_handler = self._get_handler(data_server_model)
         api_handler.delete(data_server_model, filepath)
@@ -1,32 +1,114 @@
 # coding: utf-8
 
 
+import base64
+
 import boto3
 
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from typing import Iterator
+
 from rekcurd_dashboard.models import DataServerModel
-from .data_handler import DataHandler
+from .data_handler import DataHandler, ClientCache
 
 
 class AwsS3Handler(DataHandler):
     """AwsS3Handler
     """
+    _clients = ClientCache()
+
     def _initialize(self, data_server_model: DataServerModel):
-        resource = boto3.resource(
-            's3',
-            aws_access_key_id=data_server_model.aws_access_key,
-            aws_secret_access_key=data_server_model.aws_secret_key,
-        )
+        credentials = (data_server_model.aws_access_key, data_server_model.aws_secret_key)
+
+        def create_client():
+            return boto3.session.Session().client(
+                's3',
+                aws_access_key_id=credentials[0],
+                aws_secret_access_key=credentials[1],
+            )
+        client = self._clients.get(data_server_model.project_id, credentials, create_client)
         bucket_name = data_server_model.aws_bucket_name
-        return resource, bucket_name
+        return client, bucket_name
+
+    @classmethod
+    def invalidate_clients(cls, project_id: int) -> None:
+        cls._clients.invalidate(project_id)
 
     def download(self, data_server_model: DataServerModel, remote_filepath: str, local_filepath: str) -> None:
-        resource, bucket_name = self._initialize(data_server_model)
-        resource.Bucket(bucket_name).download_file(remote_filepath, local_filepath)
+        client, bucket_name = self._initialize(data_server_model)
+        client.download_file(bucket_name, remote_filepath, local_filepath)
 
     def upload(self, data_server_model: DataServerModel, remote_filepath: str, local_filepath: str) -> None:
-        resource, bucket_name = self._initialize(data_server_model)
-        resource.Bucket(bucket_name).upload_file(local_filepath, remote_filepath)
+        client, bucket_name = self._initialize(data_server_model)
+        client.upload_file(local_filepath, bucket_name, remote_filepath)
+
+    def upload_stream(self, data_server_model: DataServerModel, remote_filepath: str, stream) -> None:
+        client, bucket_name = self._initialize(data_server_model)
+        config = TransferConfig(multipart_threshold=self.part_size, multipart_chunksize=self.part_size,
+                                max_concurrency=self.max_concurrency)
+        client.upload_fileobj(stream, bucket_name, remote_filepath, Config=config)
+
+    def initiate_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str) -> str:
+        client, bucket_name = self._initialize(data_server_model)
+        return client.create_multipart_upload(Bucket=bucket_name, Key=remote_filepath)["UploadId"]
+
+    def upload_part(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str,
+                    part_number: int, fp, size: int, md5: str) -> str:
+        client, bucket_name = self._initialize(data_server_model)
+        response = client.upload_part(
+            Bucket=bucket_name, Key=remote_filepath, UploadId=upload_id, PartNumber=part_number,
+            Body=fp, ContentLength=size, ContentMD5=base64.b64encode(bytes.fromhex(md5)).decode())
+        return response["ETag"]
+
+    def complete_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str,
+                                  upload_id: str, parts: list) -> None:
+        client, bucket_name = self._initialize(data_server_model)
+        client.complete_multipart_upload(
+            Bucket=bucket_name, Key=remote_filepath, UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": part_number, "ETag": etag} for part_number, etag in parts]})
+
+    def abort_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str) -> None:
+        client, bucket_name = self._initialize(data_server_model)
+        client.abort_multipart_upload(Bucket=bucket_name, Key=remote_filepath, UploadId=upload_id)
+
+    def exists(self, data_server_model: DataServerModel, remote_filepath: str) -> bool:
+        client, bucket_name = self._initialize(data_server_model)
+        try:
+            client.head_object(Bucket=bucket_name, Key=remote_filepath)
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def get_size(self, data_server_model: DataServerModel, remote_filepath: str) -> int:
+        client, bucket_name = self._initialize(data_server_model)
+        return client.head_object(Bucket=bucket_name, Key=remote_filepath)["ContentLength"]
+
+    def open_read(self, data_server_model: DataServerModel, remote_filepath: str,
+                  start: int = 0, end: int = None) -> (Iterator[bytes], int):
+        client, bucket_name = self._initialize(data_server_model)
+        kwargs = dict()
+        if start or end is not None:
+            kwargs["Range"] = "bytes={}-{}".format(start, "" if end is None else end)
+        response = client.get_object(Bucket=bucket_name, Key=remote_filepath, **kwargs)
+        body = response["Body"]
+
+        def iter_chunks():
+            try:
+                for chunk in iter(lambda: body.read(self.READ_CHUNK_SIZE), b''):
+                    yield chunk
+            finally:
+                body.close()
+        return iter_chunks(), response["ContentLength"]
+
+    def copy(self, data_server_model: DataServerModel, src_filepath: str, dst_filepath: str) -> None:
+        client, bucket_name = self._initialize(data_server_model)
+        config = TransferConfig(multipart_threshold=self.part_size, multipart_chunksize=self.part_size,
+                                max_concurrency=self.max_concurrency)
+        client.copy({"Bucket": bucket_name, "Key": src_filepath}, bucket_name, dst_filepath, Config=config)
 
     def delete(self, data_server_model: DataServerModel, filepath: str) -> None:
-        resource, bucket_name = self._initialize(data_server_model)
-        resource.Object(bucket_name, filepath).delete()
+        client, bucket_name = self._initialize(data_server_model)
+        client.delete_object(Bucket=bucket_name, Key=filepath)
@@ -1,27 +1,45 @@
 # coding: utf-8
 
 
+import base64
+import io
+
 import boto
 import boto.s3.connection
+import boto.s3.multipart
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterator
 
 from rekcurd_dashboard.models import DataServerModel
-from .data_handler import DataHandler
+from .data_handler import DataHandler, ClientCache
 
 
 class CephHandler(DataHandler):
     """CephHandler
     """
+    _connections = ClientCache(per_thread=True)
+
     def _initialize(self, data_server_model: DataServerModel) -> (boto.s3.connection.S3Connection, str):
-        conn = boto.connect_s3(
-            aws_access_key_id=data_server_model.ceph_access_key,
-            aws_secret_access_key=data_server_model.ceph_secret_key,
-            host=data_server_model.ceph_host,
-            port=data_server_model.ceph_port,
-            is_secure=data_server_model.ceph_is_secure,
-            calling_format=boto.s3.connection.OrdinaryCallingFormat())
+        credentials = (data_server_model.ceph_access_key, data_server_model.ceph_secret_key,
+                       data_server_model.ceph_host, data_server_model.ceph_port, data_server_model.ceph_is_secure)
+
+        def create_connection():
+            return boto.connect_s3(
+                aws_access_key_id=credentials[0],
+                aws_secret_access_key=credentials[1],
+                host=credentials[2],
+                port=credentials[3],
+                is_secure=credentials[4],
+                calling_format=boto.s3.connection.OrdinaryCallingFormat())
+        conn = self._connections.get(data_server_model.project_id, credentials, create_connection)
         bucket_name = data_server_model.ceph_bucket_name
         return conn, bucket_name
 
+    @classmethod
+    def invalidate_clients(cls, project_id: int) -> None:
+        cls._connections.invalidate(project_id)
+
     def download(self, data_server_model: DataServerModel, remote_filepath: str, local_filepath: str) -> None:
         conn, bucket_name = self._initialize(data_server_model)
         bucket = conn.get_bucket(bucket_name)
@@ -34,6 +52,111 @@ class CephHandler(DataHandler):
         key = bucket.new_key(remote_filepath)
         key.set_contents_from_filename(local_filepath, replace=False)
 
+    def upload_stream(self, data_server_model: DataServerModel, remote_filepath: str, stream) -> None:
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name)
+        chunk = stream.read(self.part_size)
+        if len(chunk) < self.part_size:
+            key = bucket.new_key(remote_filepath)
+            key.set_contents_from_string(chunk, replace=False)
+            return
+
+        multipart_upload = bucket.initiate_multipart_upload(remote_filepath)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                futures = set()
+                part_num = 0
+                while chunk:
+                    if len(futures) >= self.max_concurrency:
+                        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    part_num += 1
+                    futures.add(executor.submit(
+                        self._upload_part, data_server_model, multipart_upload.id, remote_filepath, part_num, chunk))
+                    chunk = stream.read(self.part_size)
+                for future in futures:
+                    future.result()
+            multipart_upload.complete_upload()
+        except Exception:
+            multipart_upload.cancel_upload()
+            raise
+
+    def _upload_part(self, data_server_model: DataServerModel, upload_id: str, remote_filepath: str,
+                     part_num: int, chunk: bytes) -> None:
+        """boto2 connections are not thread-safe, so that each worker thread uses its own connection."""
+        conn, bucket_name = self._initialize(data_server_model)
+        multipart_upload = boto.s3.multipart.MultiPartUpload(conn.get_bucket(bucket_name, validate=False))
+        multipart_upload.key_name = remote_filepath
+        multipart_upload.id = upload_id
+        multipart_upload.upload_part_from_file(io.BytesIO(chunk), part_num, size=len(chunk))
+
+    def initiate_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str) -> str:
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name)
+        return bucket.initiate_multipart_upload(remote_filepath).id
+
+    def upload_part(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str,
+                    part_number: int, fp, size: int, md5: str) -> str:
+        conn, bucket_name = self._initialize(data_server_model)
+        multipart_upload = boto.s3.multipart.MultiPartUpload(conn.get_bucket(bucket_name, validate=False))
+        multipart_upload.key_name = remote_filepath
+        multipart_upload.id = upload_id
+        key = multipart_upload.upload_part_from_file(
+            fp, part_number, md5=(md5, base64.b64encode(bytes.fromhex(md5)).decode()), size=size)
+        return key.etag
+
+    def complete_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str,
+                                  upload_id: str, parts: list) -> None:
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name, validate=False)
+        xml_body = "<CompleteMultipartUpload>{}</CompleteMultipartUpload>".format("".join(
+            "<Part><PartNumber>{}</PartNumber><ETag>{}</ETag></Part>".format(part_number, etag)
+            for part_number, etag in parts))
+        bucket.complete_multipart_upload(remote_filepath, upload_id, xml_body)
+
+    def abort_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str) -> None:
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name, validate=False)
+        bucket.cancel_multipart_upload(remote_filepath, upload_id)
+
+    def exists(self, data_server_model: DataServerModel, remote_filepath: str) -> bool:
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name)
+        return bucket.get_key(remote_filepath) is not None
+
+    def get_size(self, data_server_model: DataServerModel, remote_filepath: str) -> int:
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name)
+        return bucket.get_key(remote_filepath).size
+
+    def open_read(self, data_server_model: DataServerModel, remote_filepath: str,
+                  start: int = 0, end: int = None) -> (Iterator[bytes], int):
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name)
+        key = bucket.get_key(remote_filepath)
+        headers = dict()
+        if start or end is not None:
+            end = key.size - 1 if end is None else min(end, key.size - 1)
+            headers["Range"] = "bytes={}-{}".format(start, end)
+            content_length = end - start + 1
+        else:
+            content_length = key.size
+        key.open_read(headers=headers)
+
+        def iter_chunks():
+            try:
+                for chunk in iter(lambda: key.read(self.READ_CHUNK_SIZE), b''):
+                    yield chunk
+            finally:
+                key.close(fast=True)
+        return iter_chunks(), content_length
+
+    def copy(self, data_server_model: DataServerModel, src_filepath: str, dst_filepath: str) -> None:
+        conn, bucket_name = self._initialize(data_server_model)
+        bucket = conn.get_bucket(bucket_name)
+        bucket.copy_key(dst_filepath, bucket_name, src_filepath)
+
     def delete(self, data_server_model: DataServerModel, filepath: str) -> None:
         conn, bucket_name = self._initialize(data_server_model)
         bucket = conn.get_bucket(bucket_name)
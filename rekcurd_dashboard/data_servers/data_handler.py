@@ -1,8 +1,12 @@
 # coding: utf-8
 
 
+import hashlib
+import threading
+
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
+from typing import Callable, Iterator
 
 from rekcurd_dashboard.models import DataServerModel
 
@@ -17,9 +21,66 @@ def convert_to_valid_path(filepath: str) -> Path:
     return Path(*valid_factors)
 
 
+class ClientCache:
+    """
+    Storage clients keyed by project_id and a fingerprint of the credentials,
+    so that connections are reused across requests.
+    Thread-safe clients are shared by all threads. Otherwise, each thread has its own client.
+    """
+
+    def __init__(self, per_thread: bool = False):
+        self.__per_thread = per_thread
+        self.__lock = threading.Lock()
+        self.__clients = dict()
+        self.__generations = dict()
+        self.__local = threading.local()
+
+    def get(self, project_id: int, credentials: tuple, factory: Callable):
+        """
+        Get a cached client.
+        :param project_id:
+        :param credentials: Values to build the client. Any change of them creates a new client.
+        :param factory: Callable which creates a client.
+        :return:
+        """
+        fingerprint = hashlib.sha256(repr(credentials).encode()).hexdigest()
+        with self.__lock:
+            generation = self.__generations.get(project_id, 0)
+            if not self.__per_thread:
+                entry = self.__clients.get(project_id)
+                if entry is None or entry[0] != fingerprint:
+                    entry = (fingerprint, factory())
+                    self.__clients[project_id] = entry
+                return entry[1]
+        clients = getattr(self.__local, "clients", None)
+        if clients is None:
+            clients = self.__local.clients = dict()
+        entry = clients.get(project_id)
+        if entry is None or entry[0] != fingerprint or entry[1] != generation:
+            entry = (fingerprint, generation, factory())
+            clients[project_id] = entry
+        return entry[2]
+
+    def invalidate(self, project_id: int) -> None:
+        with self.__lock:
+            self.__clients.pop(project_id, None)
+            self.__generations[project_id] = self.__generations.get(project_id, 0) + 1
+
+
 class DataHandler(metaclass=ABCMeta):
     """Interface class.
     """
+    DEFAULT_PART_SIZE = 8 * 1024 * 1024
+    DEFAULT_MAX_CONCURRENCY = 4
+    READ_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, part_size: int = None, max_concurrency: int = None):
+        """
+        :param part_size: Part size of multipart uploads in bytes.
+        :param max_concurrency: Number of parts uploaded at the same time.
+        """
+        self.part_size = part_size or self.DEFAULT_PART_SIZE
+        self.max_concurrency = max_concurrency or self.DEFAULT_MAX_CONCURRENCY
 
     @abstractmethod
     def download(self, data_server_model: DataServerModel, remote_filepath: str, local_filepath: str) -> None:
@@ -29,6 +90,81 @@ class DataHandler(metaclass=ABCMeta):
     def upload(self, data_server_model: DataServerModel, remote_filepath: str, local_filepath: str) -> None:
         raise NotImplemented()
 
+    @abstractmethod
+    def upload_stream(self, data_server_model: DataServerModel, remote_filepath: str, stream) -> None:
+        """
+        Upload a readable stream as a multipart upload. At most one part per worker is held in memory.
+        """
+        raise NotImplemented()
+
+    @abstractmethod
+    def initiate_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str) -> str:
+        """
+        Start a multipart upload whose parts are uploaded by separate requests.
+        :return: Upload ID of the storage.
+        """
+        raise NotImplemented()
+
+    @abstractmethod
+    def upload_part(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str,
+                    part_number: int, fp, size: int, md5: str) -> str:
+        """
+        Upload a part of a multipart upload. Uploading the same part number again replaces the part.
+        :param data_server_model:
+        :param remote_filepath:
+        :param upload_id:
+        :param part_number: 1 to 10000.
+        :param fp: Seekable file-like object of the part.
+        :param size: Part size in bytes.
+        :param md5: Hex MD5 of the part, verified by the storage.
+        :return: ETag of the part.
+        """
+        raise NotImplemented()
+
+    @abstractmethod
+    def complete_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str,
+                                  upload_id: str, parts: list) -> None:
+        """
+        :param data_server_model:
+        :param remote_filepath:
+        :param upload_id:
+        :param parts: List of (part_number, etag) in ascending order.
+        :return:
+        """
+        raise NotImplemented()
+
+    @abstractmethod
+    def abort_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str) -> None:
+        raise NotImplemented()
+
+    @abstractmethod
+    def exists(self, data_server_model: DataServerModel, remote_filepath: str) -> bool:
+        raise NotImplemented()
+
+    @abstractmethod
+    def get_size(self, data_server_model: DataServerModel, remote_filepath: str) -> int:
+        raise NotImplemented()
+
+    @abstractmethod
+    def open_read(self, data_server_model: DataServerModel, remote_filepath: str,
+                  start: int = 0, end: int = None) -> (Iterator[bytes], int):
+        """
+        Open a remote file for streaming read.
+        :param data_server_model:
+        :param remote_filepath:
+        :param start: First byte position.
+        :param end: Last byte position, inclusive. None means the end of the file.
+        :return: Iterator of chunks, which releases the connection when exhausted or closed, and its content length.
+        """
+        raise NotImplemented()
+
+    @abstractmethod
+    def copy(self, data_server_model: DataServerModel, src_filepath: str, dst_filepath: str) -> None:
+        """
+        Copy a remote file within the storage without downloading it.
+        """
+        raise NotImplemented()
+
     @abstractmethod
     def delete(self, data_server_model: DataServerModel, filepath: str) -> None:
         raise NotImplemented()
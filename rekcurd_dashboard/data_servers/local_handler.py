@@ -1,4 +1,6 @@
 # coding: utf-8
+from typing import Iterator
+
 from rekcurd_dashboard.models import DataServerModel
 from .data_handler import DataHandler
 
@@ -14,5 +16,35 @@ class LocalHandler(DataHandler):
     def upload(self, data_server_model: DataServerModel, remote_filepath: str, local_filepath: str) -> None:
         pass
 
+    def upload_stream(self, data_server_model: DataServerModel, remote_filepath: str, stream) -> None:
+        pass
+
+    def initiate_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str) -> str:
+        return ""
+
+    def upload_part(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str,
+                    part_number: int, fp, size: int, md5: str) -> str:
+        return md5
+
+    def complete_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str,
+                                  upload_id: str, parts: list) -> None:
+        pass
+
+    def abort_multipart_upload(self, data_server_model: DataServerModel, remote_filepath: str, upload_id: str) -> None:
+        pass
+
+    def exists(self, data_server_model: DataServerModel, remote_filepath: str) -> bool:
+        return False
+
+    def get_size(self, data_server_model: DataServerModel, remote_filepath: str) -> int:
+        return 0
+
+    def open_read(self, data_server_model: DataServerModel, remote_filepath: str,
+                  start: int = 0, end: int = None) -> (Iterator[bytes], int):
+        return iter(()), 0
+
+    def copy(self, data_server_model: DataServerModel, src_filepath: str, dst_filepath: str) -> None:
+        pass
+
     def delete(self, data_server_model: DataServerModel, filepath: str) -> None:
         pass
@@ -0,0 +1,42 @@
+"""add model checksum and evaluation metrics
+
+Revision ID: 3c1e2f0a9b10
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1e2f0a9b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ('models', sa.Column('checksum', sa.String(length=128), nullable=True)),
+    ('models', sa.Column('filesize', sa.BigInteger(), nullable=True)),
+    ('evaluation_results', sa.Column('num', sa.Integer(), nullable=True)),
+    ('evaluation_results', sa.Column('accuracy', sa.Float(), nullable=True)),
+    ('evaluation_results', sa.Column('fvalue_mean', sa.Float(), nullable=True)),
+]
+
+
+def _existing_columns(table_name):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table_name)}
+
+
+def upgrade():
+    for table_name, column in COLUMNS:
+        if column.name not in _existing_columns(table_name):
+            op.add_column(table_name, column)
+
+
+def downgrade():
+    for table_name, column in reversed(COLUMNS):
+        if column.name in _existing_columns(table_name):
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.drop_column(column.name)
@@ -0,0 +1,44 @@
+"""add indexes for hot queries
+
+Revision ID: 7d5a4c2e6f31
+Revises: 3c1e2f0a9b10
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d5a4c2e6f31'
+down_revision = '3c1e2f0a9b10'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_services_application_id_service_level', 'services', ['application_id', 'service_level']),
+    ('ix_services_model_id', 'services', ['model_id']),
+    ('ix_evaluations_application_id_register_date', 'evaluations', ['application_id', 'register_date']),
+    ('ix_evaluation_results_model_id_evaluation_id', 'evaluation_results', ['model_id', 'evaluation_id']),
+    ('ix_evaluation_results_accuracy', 'evaluation_results', ['accuracy']),
+    ('ix_evaluation_results_fvalue_mean', 'evaluation_results', ['fvalue_mean']),
+    ('ix_kubernetes_project_id', 'kubernetes', ['project_id']),
+    ('ix_models_application_id_checksum', 'models', ['application_id', 'checksum']),
+]
+
+
+def _existing_indexes(table_name):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade():
+    for index_name, table_name, columns in INDEXES:
+        if index_name not in _existing_indexes(table_name):
+            op.create_index(index_name, table_name, columns)
+
+
+def downgrade():
+    for index_name, table_name, _ in reversed(INDEXES):
+        if index_name in _existing_indexes(table_name):
+            op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,35 @@
+"""add applications.acl_enabled
+
+Revision ID: b2e8f4d1c6a7
+Revises: 7d5a4c2e6f31
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e8f4d1c6a7'
+down_revision = '7d5a4c2e6f31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'acl_enabled' not in {column['name'] for column in inspector.get_columns('applications')}:
+        op.add_column('applications', sa.Column(
+            'acl_enabled', sa.Boolean(), nullable=False, server_default=sa.false()))
+    if 'ix_applications_acl_enabled' not in {index['name'] for index in inspector.get_indexes('applications')}:
+        op.create_index('ix_applications_acl_enabled', 'applications', ['acl_enabled'])
+    op.execute(
+        "UPDATE applications SET acl_enabled = EXISTS ("
+        "SELECT 1 FROM application_user_roles "
+        "WHERE application_user_roles.application_id = applications.application_id)")
+
+
+def downgrade():
+    op.drop_index('ix_applications_acl_enabled', table_name='applications')
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.drop_column('acl_enabled')
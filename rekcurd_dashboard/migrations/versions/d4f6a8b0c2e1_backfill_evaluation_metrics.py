@@ -0,0 +1,72 @@
+"""backfill evaluation metrics
+
+Revision ID: d4f6a8b0c2e1
+Revises: b2e8f4d1c6a7
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6a8b0c2e1'
+down_revision = 'b2e8f4d1c6a7'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+
+evaluation_results = sa.table(
+    'evaluation_results',
+    sa.column('evaluation_result_id', sa.Integer),
+    sa.column('_result', sa.Text),
+    sa.column('num', sa.Integer),
+    sa.column('accuracy', sa.Float),
+    sa.column('fvalue_mean', sa.Float),
+)
+
+
+def _metrics(result):
+    value = json.loads(result)
+    fvalue = value.get('fvalue') or []
+    return {
+        'num': value.get('num'),
+        'accuracy': value.get('accuracy'),
+        'fvalue_mean': sum(fvalue) / len(fvalue) if fvalue else None,
+    }
+
+
+def upgrade():
+    """
+    Fill metric columns of evaluation results stored before the columns were added.
+    Results are read in batches of BATCH_SIZE in order of their ID.
+    """
+    connection = op.get_bind()
+    update = evaluation_results.update().where(
+        evaluation_results.c.evaluation_result_id == sa.bindparam('_id')).values(
+        num=sa.bindparam('_num'), accuracy=sa.bindparam('_accuracy'), fvalue_mean=sa.bindparam('_fvalue_mean'))
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select([evaluation_results.c.evaluation_result_id, evaluation_results.c._result])
+            .where(sa.and_(evaluation_results.c.num.is_(None),
+                           evaluation_results.c.evaluation_result_id > last_id))
+            .order_by(evaluation_results.c.evaluation_result_id)
+            .limit(BATCH_SIZE)).fetchall()
+        if not rows:
+            return
+        params = list()
+        for evaluation_result_id, result in rows:
+            metrics = _metrics(result)
+            params.append({'_id': evaluation_result_id, '_num': metrics['num'], '_accuracy': metrics['accuracy'],
+                           '_fvalue_mean': metrics['fvalue_mean']})
+        connection.execute(update, params)
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    pass
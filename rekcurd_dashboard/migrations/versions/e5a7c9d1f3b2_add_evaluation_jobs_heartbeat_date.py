@@ -0,0 +1,29 @@
+"""add evaluation_jobs.heartbeat_date
+
+Revision ID: e5a7c9d1f3b2
+Revises: d4f6a8b0c2e1
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f3b2'
+down_revision = 'd4f6a8b0c2e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'evaluation_jobs' not in inspector.get_table_names():
+        return
+    if 'heartbeat_date' not in {column['name'] for column in inspector.get_columns('evaluation_jobs')}:
+        op.add_column('evaluation_jobs', sa.Column('heartbeat_date', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('evaluation_jobs') as batch_op:
+        batch_op.drop_column('heartbeat_date')
@@ -0,0 +1,45 @@
+"""add model_uploads.status, message, model_id and heartbeat_date
+
+Revision ID: f6b8d0e2a4c3
+Revises: e5a7c9d1f3b2
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0e2a4c3'
+down_revision = 'e5a7c9d1f3b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'model_uploads' not in inspector.get_table_names():
+        return
+    columns = {column['name'] for column in inspector.get_columns('model_uploads')}
+    with op.batch_alter_table('model_uploads') as batch_op:
+        if 'status' not in columns:
+            batch_op.add_column(sa.Column(
+                'status', sa.Enum('uploading', 'verifying', 'succeeded', 'failed', name='modeluploadstatus'),
+                nullable=False, server_default='uploading'))
+        if 'message' not in columns:
+            batch_op.add_column(sa.Column('message', sa.Text(), nullable=True))
+        if 'model_id' not in columns:
+            batch_op.add_column(sa.Column('model_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                'fk_model_uploads_model_id', 'models', ['model_id'], ['model_id'], ondelete='SET NULL')
+        if 'heartbeat_date' not in columns:
+            batch_op.add_column(sa.Column('heartbeat_date', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('model_uploads') as batch_op:
+        batch_op.drop_constraint('fk_model_uploads_model_id', type_='foreignkey')
+        batch_op.drop_column('heartbeat_date')
+        batch_op.drop_column('model_id')
+        batch_op.drop_column('message')
+        batch_op.drop_column('status')
@@ -1,15 +1,17 @@
 # coding: utf-8
 
 
-from .dao import db
+from .dao import db, InstrumentedQueuePool, PoolStats
 from .project import ProjectModel
 from .kubernetes import KubernetesModel
 from .data_server import DataServerModel, DataServerModeEnum
 from .application import ApplicationModel
 from .model import ModelModel
+from .model_upload import ModelUploadModel, ModelUploadPartModel, ModelUploadStatus
 from .service import ServiceModel
 from .user import UserModel
 from .project_user_role import ProjectUserRoleModel, ProjectRole
-from .application_user_role import ApplicationUserRoleModel, ApplicationRole
+from .application_user_role import ApplicationUserRoleModel, ApplicationRole, update_acl_enabled
 from .evaluation import EvaluationModel
 from .evaluation_result import EvaluationResultModel
+from .evaluation_job import EvaluationJobModel, EvaluationJobStatus
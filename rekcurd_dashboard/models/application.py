@@ -24,6 +24,7 @@ class ApplicationModel(db.Model):
     project_id = Column(Integer, ForeignKey('projects.project_id', ondelete="CASCADE"), nullable=False)
     application_name = Column(String(128), nullable=False)
     description = Column(Text, nullable=True)
+    acl_enabled = Column(Boolean, nullable=False, default=False, index=True)
     register_date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
 
     projects = relationship(
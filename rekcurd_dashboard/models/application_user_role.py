@@ -1,10 +1,12 @@
 import enum
 from .dao import db
+from .application import ApplicationModel
 from sqlalchemy import (
     Column, Integer,
     Enum, String,
     ForeignKey,
-    UniqueConstraint
+    UniqueConstraint,
+    event, exists
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
@@ -37,3 +39,22 @@ class ApplicationUserRoleModel(db.Model):
     user = relationship(
         'UserModel',
         backref=backref("application_user_roles", cascade="all, delete-orphan", passive_deletes=True))
+
+
+def update_acl_enabled(connection, application_id):
+    """
+    Set ApplicationModel.acl_enabled to whether the application has any role.
+    Roles inserted/deleted through the ORM update it by themselves. Call this after bulk changes.
+    :param connection:
+    :param application_id:
+    :return:
+    """
+    connection.execute(ApplicationModel.__table__.update().where(
+        ApplicationModel.application_id == application_id).values(
+        acl_enabled=exists().where(ApplicationUserRoleModel.application_id == application_id)))
+
+
+@event.listens_for(ApplicationUserRoleModel, 'after_insert')
+@event.listens_for(ApplicationUserRoleModel, 'after_delete')
+def _update_acl_enabled(mapper, connection, target):
+    update_acl_enabled(connection, target.application_id)
@@ -1,7 +1,13 @@
 # coding: utf-8
 
 
+import bisect
+import threading
+import time
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
 
 
 db = SQLAlchemy(
@@ -10,3 +16,66 @@ db = SQLAlchemy(
         "autoflush": False
     }
 )
+
+
+class PoolStats(object):
+    """
+    Statistics of the time to check out a connection from a pool.
+    """
+    BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0)
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__checkouts = 0
+        self.__timeouts = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+        self.__bucket_counts = [0] * (len(self.BUCKETS) + 1)
+
+    def observe(self, wait: float, timeout: bool = False):
+        with self.__lock:
+            if timeout:
+                self.__timeouts += 1
+            else:
+                self.__checkouts += 1
+            self.__wait_total += wait
+            self.__wait_max = max(self.__wait_max, wait)
+            self.__bucket_counts[bisect.bisect_left(self.BUCKETS, wait)] += 1
+
+    def serialize(self) -> dict:
+        """
+        Serialize the statistics. Buckets are cumulative counts of waits less than or equal to the bound.
+        :return:
+        """
+        with self.__lock:
+            buckets, count = dict(), 0
+            for bound, bucket_count in zip(self.BUCKETS + (float('inf'),), self.__bucket_counts):
+                count += bucket_count
+                buckets[str(bound)] = count
+            return {
+                'checkouts': self.__checkouts,
+                'timeouts': self.__timeouts,
+                'wait_seconds_total': self.__wait_total,
+                'wait_seconds_max': self.__wait_max,
+                'wait_seconds_buckets': buckets,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording checkout wait times in "stats".
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started_at = time.monotonic()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            self.stats.observe(time.monotonic() - started_at, timeout=True)
+            raise
+        self.stats.observe(time.monotonic() - started_at)
+        return connection
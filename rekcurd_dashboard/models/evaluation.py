@@ -3,7 +3,7 @@ from .dao import db
 from sqlalchemy import (
     Column, Integer, DateTime,
     String, UniqueConstraint,
-    ForeignKey, Text
+    ForeignKey, Text, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
@@ -17,6 +17,7 @@ class EvaluationModel(db.Model):
     __table_args__ = (
         UniqueConstraint('evaluation_id'),
         UniqueConstraint('checksum'),
+        Index('ix_evaluations_application_id_register_date', 'application_id', 'register_date'),
         {'mysql_engine': 'InnoDB'}
     )
 
@@ -0,0 +1,61 @@
+import datetime
+import enum
+from .dao import db
+from sqlalchemy import (
+    Column, Integer, DateTime, Float,
+    Enum, String, Text, UniqueConstraint, ForeignKey
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref
+
+
+class EvaluationJobStatus(enum.Enum):
+    queued = 1
+    running = 2
+    succeeded = 3
+    failed = 4
+
+
+class EvaluationJobModel(db.Model):
+    """
+    Background evaluation job
+    """
+    __tablename__ = 'evaluation_jobs'
+    __table_args__ = (
+        UniqueConstraint('job_id'),
+        {'mysql_engine': 'InnoDB'}
+    )
+
+    job_id = Column(Integer, primary_key=True, autoincrement=True)
+    application_id = Column(String, ForeignKey('applications.application_id', ondelete="CASCADE"), nullable=False)
+    model_id = Column(Integer, ForeignKey('models.model_id', ondelete="CASCADE"), nullable=False)
+    evaluation_id = Column(Integer, ForeignKey('evaluations.evaluation_id', ondelete="CASCADE"), nullable=False)
+    evaluation_result_id = Column(
+        Integer, ForeignKey('evaluation_results.evaluation_result_id', ondelete="SET NULL"), nullable=True)
+    status = Column(Enum(EvaluationJobStatus), nullable=False, default=EvaluationJobStatus.queued)
+    progress = Column(Float, nullable=False, default=0.0)
+    message = Column(Text, nullable=True)
+    register_date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    started_date = Column(DateTime, nullable=True)
+    finished_date = Column(DateTime, nullable=True)
+    heartbeat_date = Column(DateTime, nullable=True)
+
+    application = relationship(
+        'ApplicationModel', innerjoin=True,
+        backref=backref("evaluation_jobs", cascade="all, delete-orphan", passive_deletes=True))
+
+    @property
+    def serialize(self):
+        return {
+            'job_id': self.job_id,
+            'application_id': self.application_id,
+            'model_id': self.model_id,
+            'evaluation_id': self.evaluation_id,
+            'evaluation_result_id': self.evaluation_result_id,
+            'status': self.status.name,
+            'progress': self.progress,
+            'message': self.message,
+            'register_date': self.register_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'started_date': self.started_date.strftime('%Y-%m-%d %H:%M:%S') if self.started_date else None,
+            'finished_date': self.finished_date.strftime('%Y-%m-%d %H:%M:%S') if self.finished_date else None,
+        }
@@ -2,8 +2,8 @@ import datetime
 import json
 from .dao import db
 from sqlalchemy import (
-    Column, Integer, DateTime, Text,
-    UniqueConstraint, ForeignKey, String
+    Column, Integer, DateTime, Text, Float,
+    UniqueConstraint, ForeignKey, String, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
@@ -16,6 +16,7 @@ class EvaluationResultModel(db.Model):
     __tablename__ = 'evaluation_results'
     __table_args__ = (
         UniqueConstraint('evaluation_result_id'),
+        Index('ix_evaluation_results_model_id_evaluation_id', 'model_id', 'evaluation_id'),
         {'mysql_engine': 'InnoDB'}
     )
 
@@ -24,6 +25,9 @@ class EvaluationResultModel(db.Model):
     data_path = Column(String(512), nullable=False)
     evaluation_id = Column(Integer, ForeignKey('evaluations.evaluation_id', ondelete="CASCADE"), nullable=False)
     _result = Column(Text, nullable=False)
+    num = Column(Integer, nullable=True)
+    accuracy = Column(Float, nullable=True, index=True)
+    fvalue_mean = Column(Float, nullable=True, index=True)
     register_date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
 
     model = relationship(
@@ -45,7 +49,12 @@ class EvaluationResultModel(db.Model):
             res = json.dumps(value)
         else:
             res = value
+            value = json.loads(value)
         self._result = res
+        self.num = value.get('num')
+        self.accuracy = value.get('accuracy')
+        fvalue = value.get('fvalue') or []
+        self.fvalue_mean = sum(fvalue) / len(fvalue) if fvalue else None
 
     @property
     def serialize(self):
@@ -55,5 +64,8 @@ class EvaluationResultModel(db.Model):
             'data_path': self.data_path,
             'evaluation_id': self.evaluation_id,
             'result': self.result,
+            'num': self.num,
+            'accuracy': self.accuracy,
+            'fvalue_mean': self.fvalue_mean,
             'register_date': self.register_date.strftime('%Y-%m-%d %H:%M:%S'),
         }
@@ -2,7 +2,7 @@ import datetime
 from .dao import db
 from sqlalchemy import (
     Column, Integer, String, DateTime,
-    Text, UniqueConstraint, ForeignKey
+    Text, UniqueConstraint, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
@@ -18,6 +18,7 @@ class KubernetesModel(db.Model):
         UniqueConstraint('config_path'),
         UniqueConstraint('display_name'),
         UniqueConstraint('exposed_host', 'exposed_port'),
+        Index('ix_kubernetes_project_id', 'project_id'),
         {'mysql_engine': 'InnoDB'}
     )
 
@@ -1,8 +1,8 @@
 import datetime
 from .dao import db
 from sqlalchemy import (
-    Column, Integer, DateTime,
-    String, Text, UniqueConstraint, ForeignKey
+    Column, Integer, BigInteger, DateTime,
+    String, Text, UniqueConstraint, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
@@ -16,12 +16,15 @@ class ModelModel(db.Model):
     __table_args__ = (
         UniqueConstraint('model_id'),
         UniqueConstraint('application_id','filepath'),
+        Index('ix_models_application_id_checksum', 'application_id', 'checksum'),
         {'mysql_engine': 'InnoDB'}
     )
 
     model_id = Column(Integer, primary_key=True, autoincrement=True)
     application_id = Column(String, ForeignKey('applications.application_id', ondelete="CASCADE"), nullable=False)
     filepath = Column(String(512), nullable=False)
+    checksum = Column(String(128), nullable=True)
+    filesize = Column(BigInteger, nullable=True)
     description = Column(Text, nullable=False)
     register_date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
 
@@ -35,6 +38,8 @@ class ModelModel(db.Model):
             'model_id': self.model_id,
             'application_id': self.application_id,
             'filepath': self.filepath,
+            'checksum': self.checksum,
+            'filesize': self.filesize,
             'description': self.description,
             'register_date': self.register_date.strftime('%Y-%m-%d %H:%M:%S'),
         }
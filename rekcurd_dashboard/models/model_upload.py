@@ -0,0 +1,90 @@
+import datetime
+import enum
+from .dao import db
+from sqlalchemy import (
+    Column, Integer, BigInteger, DateTime,
+    Enum, String, Text, UniqueConstraint, ForeignKey
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref
+
+
+class ModelUploadStatus(enum.Enum):
+    uploading = 1
+    verifying = 2
+    succeeded = 3
+    failed = 4
+
+
+class ModelUploadModel(db.Model):
+    """
+    Resumable model upload session
+    """
+    __tablename__ = 'model_uploads'
+    __table_args__ = (
+        UniqueConstraint('upload_id'),
+        {'mysql_engine': 'InnoDB'}
+    )
+
+    upload_id = Column(String(36), primary_key=True)
+    application_id = Column(String, ForeignKey('applications.application_id', ondelete="CASCADE"), nullable=False)
+    filepath = Column(String(512), nullable=False)
+    storage_upload_id = Column(String(1024), nullable=True)
+    checksum = Column(String(128), nullable=False)
+    filesize = Column(BigInteger, nullable=False)
+    description = Column(Text, nullable=False)
+    register_date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    status = Column(Enum(ModelUploadStatus), nullable=False, default=ModelUploadStatus.uploading)
+    message = Column(Text, nullable=True)
+    model_id = Column(Integer, ForeignKey('models.model_id', ondelete="SET NULL"), nullable=True)
+    heartbeat_date = Column(DateTime, nullable=True)
+
+    application = relationship(
+        'ApplicationModel', innerjoin=True,
+        backref=backref("model_uploads", cascade="all, delete-orphan", passive_deletes=True))
+
+    @property
+    def serialize(self):
+        return {
+            'upload_id': self.upload_id,
+            'application_id': self.application_id,
+            'checksum': self.checksum,
+            'filesize': self.filesize,
+            'description': self.description,
+            'register_date': self.register_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'status': self.status.name,
+            'message': self.message,
+            'model_id': self.model_id,
+            'parts': [part.serialize for part in sorted(self.parts, key=lambda part: part.part_number)],
+        }
+
+
+class ModelUploadPartModel(db.Model):
+    """
+    Uploaded part of a resumable model upload
+    """
+    __tablename__ = 'model_upload_parts'
+    __table_args__ = (
+        UniqueConstraint('upload_id', 'part_number'),
+        {'mysql_engine': 'InnoDB'}
+    )
+
+    upload_id = Column(String(36), ForeignKey('model_uploads.upload_id', ondelete="CASCADE"), primary_key=True)
+    part_number = Column(Integer, primary_key=True, autoincrement=False)
+    etag = Column(String(128), nullable=False)
+    checksum = Column(String(128), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    register_date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+    upload = relationship(
+        'ModelUploadModel', innerjoin=True,
+        backref=backref("parts", cascade="all, delete-orphan", passive_deletes=True))
+
+    @property
+    def serialize(self):
+        return {
+            'part_number': self.part_number,
+            'etag': self.etag,
+            'checksum': self.checksum,
+            'size': self.size,
+        }
@@ -2,7 +2,7 @@ import datetime
 from .dao import db
 from sqlalchemy import (
     Column, Integer, String, DateTime,
-    Text, UniqueConstraint, ForeignKey
+    Text, UniqueConstraint, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
@@ -16,6 +16,8 @@ class ServiceModel(db.Model):
     __table_args__ = (
         UniqueConstraint('service_id'),
         UniqueConstraint('application_id', 'display_name'),
+        Index('ix_services_application_id_service_level', 'application_id', 'service_level'),
+        Index('ix_services_model_id', 'model_id'),
         {'mysql_engine': 'InnoDB'}
     )
 
@@ -2,6 +2,8 @@
 
 
 from .exceptions import RekcurdDashboardException, ProjectUserRoleException, ApplicationUserRoleException
-from .hash_util import HashUtil
+from .hash_util import HashUtil, HashingReader
+from .concurrent_util import ConcurrentUtil, TaskResult
+from .io_util import IoUtil, BufferReader
 from .protobuf_util import ProtobufUtil
 from .rekcurd_dashboard_config import RekcurdDashboardConfig
@@ -0,0 +1,41 @@
+import time
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Any, Callable, List, Tuple
+
+
+TaskResult = namedtuple('TaskResult', ('key', 'status', 'result', 'error'))
+
+
+class ConcurrentUtil:
+    @staticmethod
+    def run(tasks: List[Tuple[Any, Callable]], max_workers: int = 8, timeout: float = None) -> List[TaskResult]:
+        """
+        Run callables concurrently on a bounded thread pool.
+        Failures and timeouts of each task are captured into its TaskResult instead of being raised.
+        :param tasks: List of (key, callable).
+        :param max_workers: Upper bound of worker threads.
+        :param timeout: Seconds to wait for each task, counted from the beginning of the run.
+        :return: List of TaskResult in the same order as tasks.
+        """
+        if not tasks:
+            return []
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))))
+        try:
+            started_at = time.monotonic()
+            futures = [(key, executor.submit(task)) for key, task in tasks]
+            results = []
+            for key, future in futures:
+                remaining = None if timeout is None else max(0.0, started_at + timeout - time.monotonic())
+                try:
+                    results.append(TaskResult(key, True, future.result(timeout=remaining), None))
+                except TimeoutError:
+                    future.cancel()
+                    results.append(TaskResult(key, False, None, TimeoutError(
+                        "Timed out after {} seconds.".format(timeout))))
+                except Exception as error:
+                    results.append(TaskResult(key, False, None, error))
+            return results
+        finally:
+            executor.shutdown(wait=False)
@@ -1,24 +1,79 @@
 from typing import Union
 import hashlib
+import os
 
 from werkzeug.datastructures import FileStorage
 
 
+class HashingReader:
+    """
+    File-like reader which computes checksums of the bytes passing through it.
+    Wrap the source stream with it and hand it to the consumer (storage backend, gRPC stream),
+    so that the data is read only once. It is intentionally not seekable.
+    """
+
+    def __init__(self, f, algorithms: tuple = ('md5',)):
+        """
+        :param f: File-like object to be read.
+        :param algorithms: hashlib algorithm names, e.g. ('md5', 'blake2b').
+        """
+        self.__f = f
+        self.__hashes = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.__f.read(size)
+        for hash_obj in self.__hashes.values():
+            hash_obj.update(data)
+        self.size += len(data)
+        return data
+
+    def hexdigest(self, algorithm: str = 'md5') -> str:
+        return self.__hashes[algorithm].hexdigest()
+
+
 class HashUtil:
+    MIN_CHUNK_SIZE = 64 * 1024
+    MAX_CHUNK_SIZE = 4 * 1024 * 1024
+
+    @staticmethod
+    def chunk_size(size: int = None) -> int:
+        """
+        Choose a read chunk size from the data size. About 1/64 of the size, rounded to a power of two
+        within [MIN_CHUNK_SIZE, MAX_CHUNK_SIZE].
+        :param size: Data size in bytes. None if unknown.
+        :return:
+        """
+        if size is None:
+            return HashUtil.MAX_CHUNK_SIZE
+        chunk_size = 1 << max(size // 64, 1).bit_length()
+        return max(HashUtil.MIN_CHUNK_SIZE, min(HashUtil.MAX_CHUNK_SIZE, chunk_size))
+
     @staticmethod
     def checksum(f: Union[str, bytes, FileStorage]) -> str:
-        chunk_size = 4096
         if isinstance(f, bytes):
             hash_md5 = hashlib.md5(f)
         elif isinstance(f, str):
             hash_md5 = hashlib.md5()
+            chunk_size = HashUtil.chunk_size(os.path.getsize(f))
             with open(f, "rb") as infile:
                 for chunk in iter(lambda: infile.read(chunk_size), b""):
                     hash_md5.update(chunk)
         else:
             hash_md5 = hashlib.md5()
+            chunk_size = HashUtil.chunk_size(HashUtil.__stream_size(f))
             for chunk in iter(lambda: f.read(chunk_size), b''):
                 hash_md5.update(chunk)
             f.seek(0)
 
         return hash_md5.hexdigest()
+
+    @staticmethod
+    def __stream_size(f) -> Union[int, None]:
+        try:
+            position = f.tell()
+            size = f.seek(0, os.SEEK_END)
+            f.seek(position)
+            return size
+        except Exception:
+            return None
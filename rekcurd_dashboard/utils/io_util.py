@@ -0,0 +1,97 @@
+import mmap
+import os
+import shutil
+import tempfile
+
+from contextlib import contextmanager
+
+
+class BufferReader:
+    """
+    File-like reader with its own position over a shared read-only buffer.
+    Any number of readers can stream the same bytes concurrently without copying the whole buffer.
+    """
+
+    def __init__(self, buffer):
+        self.__buffer = buffer
+        self.__position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            end = len(self.__buffer)
+        else:
+            end = min(self.__position + size, len(self.__buffer))
+        data = self.__buffer[self.__position:end]
+        self.__position = end
+        return data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self.__position, len(self.__buffer))[whence]
+        self.__position = max(0, min(base + offset, len(self.__buffer)))
+        return self.__position
+
+    def tell(self) -> int:
+        return self.__position
+
+
+class IoUtil:
+    CHUNK_SIZE = 1048576
+
+    @staticmethod
+    @contextmanager
+    def spool(f, chunk_size: int = CHUNK_SIZE):
+        """
+        Spool a stream once to a memory-mapped temporary file.
+        Use BufferReader to read the yielded buffer.
+        :param f: File-like object.
+        :param chunk_size:
+        :return: Read-only buffer, valid until the context exits.
+        """
+        with tempfile.TemporaryFile() as fp:
+            shutil.copyfileobj(f, fp, chunk_size)
+            fp.flush()
+            with IoUtil.map_file(fp) as buffer:
+                yield buffer
+
+    @staticmethod
+    @contextmanager
+    def map_stream(f):
+        """
+        Expose a seekable stream as a read-only buffer without copying it if possible.
+        A file is memory-mapped, and the bytes of a BytesIO (small Werkzeug spools) are used as they are.
+        Otherwise the stream is spooled.
+        :param f: File-like object, e.g. FileStorage.stream spooled by Werkzeug.
+        :return: Read-only buffer, valid until the context exits.
+        """
+        try:
+            f.flush()
+            f.fileno()
+        except (AttributeError, OSError):
+            pass
+        else:
+            with IoUtil.map_file(f) as buffer:
+                yield buffer
+            return
+        if hasattr(f, 'getvalue'):
+            yield f.getvalue()
+            return
+        f.seek(0)
+        with IoUtil.spool(f) as buffer:
+            yield buffer
+
+    @staticmethod
+    @contextmanager
+    def map_file(fp):
+        """
+        Memory-map a whole file read-only.
+        :param fp: File object opened for reading.
+        :return: Read-only buffer, valid until the context exits.
+        """
+        if os.fstat(fp.fileno()).st_size == 0:
+            yield b''
+            return
+        buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buffer
+        finally:
+            buffer.close()
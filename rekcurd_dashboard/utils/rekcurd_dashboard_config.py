@@ -15,6 +15,29 @@ class RekcurdDashboardConfig:
     Rekcurd dashboard configurations.
     """
     __SERVICE_DEFAULT_PORT: int = 18080
+    __DATA_SERVER_DEFAULT_PART_SIZE_MB: int = 8
+    __DATA_SERVER_DEFAULT_MAX_CONCURRENCY: int = 4
+    __EVALUATION_CACHE_DEFAULT_MAX_SIZE_MB: int = 1024
+    __SERVER_DEFAULT_OPTIONS: dict = {
+        'workers': 1,
+        'worker_class': 'gthread',
+        'threads': 4,
+        'worker_connections': 1000,
+        'backlog': 2048,
+        'timeout': 300,
+        'graceful_timeout': 30,
+        'keepalive': 5,
+        'max_requests': 0,
+        'preload': True,
+    }
+    __DB_DEFAULT_POOL_OPTIONS: dict = {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True,
+        'statement_timeout_ms': 0,
+    }
     REKCURD_GRPC_VERSION: str = rekcurd_pb2.DESCRIPTOR.GetOptions().Extensions[rekcurd_pb2.rekcurd_grpc_proto_version]
 
     __TEST_MODE: bool = None
@@ -23,8 +46,14 @@ class RekcurdDashboardConfig:
     SERVICE_PORT: int = __SERVICE_DEFAULT_PORT
     DIR_KUBE_CONFIG: str = None
     SQLALCHEMY_DATABASE_URI: str = None
+    DB_POOL_OPTIONS: dict = __DB_DEFAULT_POOL_OPTIONS
     IS_ACTIVATE_AUTH: bool = None
     AUTH_CONFIG: dict = None
+    DATA_SERVER_PART_SIZE: int = __DATA_SERVER_DEFAULT_PART_SIZE_MB * 1024 * 1024
+    DATA_SERVER_MAX_CONCURRENCY: int = __DATA_SERVER_DEFAULT_MAX_CONCURRENCY
+    EVALUATION_CACHE_DIR: str = None
+    EVALUATION_CACHE_MAX_SIZE: int = __EVALUATION_CACHE_DEFAULT_MAX_SIZE_MB * 1024 * 1024
+    SERVER_OPTIONS: dict = __SERVER_DEFAULT_OPTIONS
 
     def __init__(self, config_file: str = None):
         self.__TEST_MODE = os.getenv("DASHBOARD_TEST_MODE", "False").lower() == 'true'
@@ -39,6 +68,7 @@ class RekcurdDashboardConfig:
             kube_config_dir: str = None,
             db_mode: str = None, db_host: str = None, db_port: int = None,
             db_name: str = None, db_username: str = None, db_password: str = None,
+            workers: int = None, worker_class: str = None, threads: int = None,
             **options):
         self.DEBUG_MODE = debug_mode if debug_mode is not None else self.DEBUG_MODE
         self.SERVICE_PORT = int(port or self.SERVICE_PORT)
@@ -46,8 +76,27 @@ class RekcurdDashboardConfig:
         self.SQLALCHEMY_DATABASE_URI = \
             self.__create_db_uri(db_mode, db_host, db_port, db_name, db_username, db_password) or \
             self.SQLALCHEMY_DATABASE_URI
+        server_options = {'workers': workers, 'worker_class': worker_class, 'threads': threads}
+        self.SERVER_OPTIONS = dict(
+            self.SERVER_OPTIONS, **{key: value for key, value in server_options.items() if value is not None})
         # TODO: Auth
 
+    @property
+    def SQLALCHEMY_ENGINE_OPTIONS(self) -> dict:
+        """
+        Options of the engine. Pool options are applied to MySQL only.
+        :return:
+        """
+        if not (self.SQLALCHEMY_DATABASE_URI or '').startswith('mysql'):
+            return dict()
+        options = dict(self.DB_POOL_OPTIONS)
+        statement_timeout_ms = options.pop('statement_timeout_ms')
+        if statement_timeout_ms > 0:
+            # applied to read-only SELECT statements by MySQL 5.7.8 or later
+            options['connect_args'] = {
+                'init_command': 'SET SESSION max_execution_time={:d}'.format(statement_timeout_ms)}
+        return options
+
     def __load_from_file(self, config_file: str):
         if config_file is not None:
             with open(config_file, 'r') as f:
@@ -67,6 +116,22 @@ class RekcurdDashboardConfig:
         db_password = config_db_mysql.get("password")
         self.SQLALCHEMY_DATABASE_URI = \
             self.__create_db_uri(db_mode, db_host, db_port, db_name, db_username, db_password)
+        self.DB_POOL_OPTIONS = {
+            key: self.__typed_option(config_db_mysql.get(key), default)
+            for key, default in self.__DB_DEFAULT_POOL_OPTIONS.items()}
+        config_data_server = config.get("data_server", dict())
+        self.DATA_SERVER_PART_SIZE = int(config_data_server.get(
+            "part_size_mb", self.__DATA_SERVER_DEFAULT_PART_SIZE_MB)) * 1024 * 1024
+        self.DATA_SERVER_MAX_CONCURRENCY = int(config_data_server.get(
+            "max_concurrency", self.__DATA_SERVER_DEFAULT_MAX_CONCURRENCY))
+        config_evaluation_cache = config.get("evaluation_cache", dict())
+        self.EVALUATION_CACHE_DIR = self.__kubeconfig_default_dir(config_evaluation_cache.get("dir", "evaluation-cache"))
+        self.EVALUATION_CACHE_MAX_SIZE = int(config_evaluation_cache.get(
+            "max_size_mb", self.__EVALUATION_CACHE_DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+        config_server = config.get("server", dict())
+        self.SERVER_OPTIONS = {
+            key: self.__typed_option(config_server.get(key), default)
+            for key, default in self.__SERVER_DEFAULT_OPTIONS.items()}
         if 'auth' in config:
             self.IS_ACTIVATE_AUTH = True
             self.AUTH_CONFIG = config['auth']
@@ -86,6 +151,21 @@ class RekcurdDashboardConfig:
         db_password = os.getenv('DASHBOARD_DB_MYSQL_PASSWORD')
         self.SQLALCHEMY_DATABASE_URI = \
             self.__create_db_uri(db_mode, db_host, db_port, db_name, db_username, db_password)
+        self.DB_POOL_OPTIONS = {
+            key: self.__typed_option(os.getenv("DASHBOARD_DB_MYSQL_{}".format(key.upper())), default)
+            for key, default in self.__DB_DEFAULT_POOL_OPTIONS.items()}
+        self.DATA_SERVER_PART_SIZE = int(os.getenv(
+            "DASHBOARD_DATA_SERVER_PART_SIZE_MB", "{}".format(self.__DATA_SERVER_DEFAULT_PART_SIZE_MB))) * 1024 * 1024
+        self.DATA_SERVER_MAX_CONCURRENCY = int(os.getenv(
+            "DASHBOARD_DATA_SERVER_MAX_CONCURRENCY", "{}".format(self.__DATA_SERVER_DEFAULT_MAX_CONCURRENCY)))
+        self.EVALUATION_CACHE_DIR = self.__kubeconfig_default_dir(
+            os.getenv("DASHBOARD_EVALUATION_CACHE_DIR", "evaluation-cache"))
+        self.EVALUATION_CACHE_MAX_SIZE = int(os.getenv(
+            "DASHBOARD_EVALUATION_CACHE_MAX_SIZE_MB",
+            "{}".format(self.__EVALUATION_CACHE_DEFAULT_MAX_SIZE_MB))) * 1024 * 1024
+        self.SERVER_OPTIONS = {
+            key: self.__typed_option(os.getenv("DASHBOARD_SERVER_{}".format(key.upper())), default)
+            for key, default in self.__SERVER_DEFAULT_OPTIONS.items()}
         if os.getenv('DASHBOARD_IS_AUTH', 'False').lower() == 'true':
             self.IS_ACTIVATE_AUTH = True
             self.AUTH_CONFIG = {
@@ -97,6 +177,10 @@ class RekcurdDashboardConfig:
                     'bind_password': os.getenv('DASHBOARD_LDAP_BIND_PASSWORD'),
                     'search_filter': os.getenv('DASHBOARD_LDAP_SEARCH_FILTER'),
                     'search_base_dns': json.loads(os.getenv('DASHBOARD_LDAP_SEARCH_BASE_DNS')),
+                    'pool_size': os.getenv('DASHBOARD_LDAP_POOL_SIZE'),
+                    'timeout': os.getenv('DASHBOARD_LDAP_TIMEOUT'),
+                    'dn_cache_ttl': os.getenv('DASHBOARD_LDAP_DN_CACHE_TTL'),
+                    'dn_negative_cache_ttl': os.getenv('DASHBOARD_LDAP_DN_NEGATIVE_CACHE_TTL'),
                 }
             }
         else:
@@ -141,6 +225,13 @@ class RekcurdDashboardConfig:
         else:
             raise TypeError("Invalid DB configurations.")
 
+    def __typed_option(self, value, default):
+        if value is None:
+            return default
+        elif isinstance(default, bool) and isinstance(value, str):
+            return value.lower() == 'true'
+        return type(default)(value)
+
     def __kubeconfig_default_dir(self, dirname: str):
         root = os.path.abspath(
             os.path.expanduser(os.getenv('REKCURD_DASHBOARD_ROOT', '~/.rekcurd')))
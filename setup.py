@@ -79,6 +79,8 @@ setup(
     package_data={
         'rekcurd_dashboard': [
             'template/*',
+            'migrations/*',
+            'migrations/versions/*',
             'static/**/*',
             'static/**/**/*'
         ],
@@ -185,3 +185,21 @@ class ApiAccessControlTest(BaseTestCase):
             headers=headers, data=data)
         self.assertEqual(400, response.status_code)
         self.assertEqual('Already assigned.', response.json['message'])
+
+    def test_edit_application_after_acl_change(self):
+        create_project_user_role_model(
+            project_id=TEST_PROJECT_ID, user_id=TEST_USER_ID_2, project_role=ProjectRole.member, save=True)
+        create_application_user_role_model(
+            application_id=TEST_APPLICATION_ID, user_id=TEST_USER_ID_2,
+            application_role=ApplicationRole.viewer, save=True)
+        headers = {'Authorization': 'Bearer {}'.format(self._get_token(TEST_AUTH_ID_2))}
+        url = '/api/projects/{}/applications/{}'.format(TEST_PROJECT_ID, TEST_APPLICATION_ID)
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(200, response.status_code)
+
+        response = self.client.patch(
+            '{}/acl'.format(url), headers={'Authorization': 'Bearer {}'.format(self._get_token(TEST_AUTH_ID_1))},
+            data={'uid': TEST_AUTH_ID_2, 'role': ApplicationRole.editor.name})
+        self.assertEqual(200, response.status_code)
+        response = self.client.patch(url, headers=headers, data={'description': 'description'})
+        self.assertEqual(200, response.status_code)
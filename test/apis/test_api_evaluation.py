@@ -1,14 +1,22 @@
 from unittest.mock import patch, Mock
+from concurrent.futures import Future
+import datetime
 import json
+import os
+import tempfile
 from copy import deepcopy
 
+from rekcurd_dashboard.core import RekcurdDashboardClient, evaluation_detail_cache
 from rekcurd_dashboard.protobuf import rekcurd_pb2
 from test.base import (
-    BaseTestCase, create_service_model, create_eval_model, create_eval_result_model,
+    BaseTestCase, create_service_model, create_eval_model, create_eval_result_model, create_model_model,
     create_data_server_model, TEST_PROJECT_ID, TEST_APPLICATION_ID, TEST_MODEL_ID,
 )
 from io import BytesIO
-from rekcurd_dashboard.models import EvaluationResultModel, EvaluationModel, db
+from rekcurd_dashboard.apis import Heartbeat
+from rekcurd_dashboard.models import (
+    EvaluationResultModel, EvaluationModel, EvaluationJobModel, EvaluationJobStatus, DataServerModeEnum, db
+)
 
 default_metrics = {
     'accuracy': 0.0, 'fvalue': [0.0], 'num': 0, 'option': {}, 'precision': [0.0], 'recall': [0.0], 'label': ['label']
@@ -42,17 +50,24 @@ def patch_stub(func):
                     score=[0.5, 0.5]
                 )
             ])
-        mock_stub_obj.EvaluationResult.return_value = iter(res for _ in range(2))
+        mock_stub_obj.EvaluationResult.side_effect = lambda *args, **kwargs: iter(res for _ in range(2))
         with patch('rekcurd_dashboard.core.rekcurd_dashboard_client.rekcurd_pb2_grpc.RekcurdDashboardStub',
                    new=Mock(return_value=mock_stub_obj)), \
                 patch('rekcurd_dashboard.apis.api_evaluation.DataServer',
                       new=Mock(return_value=Mock())) as data_server:
             data_server.return_value.upload_evaluation_data = Mock(return_value='filepath')
+            data_server.return_value.open_file = Mock(return_value=(iter([b'eval data']), 9))
 
             return func(*args, **kwargs)
     return inner_method
 
 
+def run_now(func, *args):
+    future = Future()
+    future.set_result(func(*args))
+    return future
+
+
 class ApiEvaluationTest(BaseTestCase):
     """Tests for ApiEvaluation.
     """
@@ -68,15 +83,31 @@ class ApiEvaluationTest(BaseTestCase):
         self.assertEqual(response.json[0]['description'], 'eval desc')
 
     @patch_stub
-    @patch('rekcurd_dashboard.apis.api_evaluation.send_file')
-    @patch('rekcurd_dashboard.apis.api_evaluation.os')
-    def test_download(self, os_mock, send_file_mock):
-        send_file_mock.return_value = {'status': True}
+    def test_download(self):
         create_data_server_model(save=True)
         create_eval_model(TEST_APPLICATION_ID, description='eval desc', save=True)
         url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/evaluations/1/download'
         response = self.client.get(url)
         self.assertEqual(200, response.status_code)
+        self.assertEqual(response.data, b'eval data')
+        self.assertEqual(response.headers['Content-Disposition'], 'attachment; filename=evaluation_1.txt')
+
+    @patch_stub
+    @patch('rekcurd_dashboard.apis.api_evaluation.DataServer')
+    def test_download_range(self, data_server):
+        data_server.return_value.get_file_size.return_value = 10
+        data_server.return_value.open_file.return_value = (iter([b'2345']), 4)
+        create_data_server_model(save=True)
+        create_eval_model(TEST_APPLICATION_ID, description='eval desc', save=True)
+        url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/evaluations/1/download'
+        response = self.client.get(url, headers={'Range': 'bytes=2-5'})
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(response.data, b'2345')
+        self.assertEqual(response.headers['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(data_server.return_value.open_file.call_args[0][2:], (2, 5))
+
+        response = self.client.get(url, headers={'Range': 'bytes=20-'})
+        self.assertEqual(416, response.status_code)
 
     @patch_stub
     def test_post(self):
@@ -104,6 +135,25 @@ class ApiEvaluationTest(BaseTestCase):
         self.assertEqual(evaluation_model.application_id, TEST_APPLICATION_ID)
         self.assertEqual(evaluation_model.description, 'eval desc')
 
+    @patch_stub
+    @patch('rekcurd_dashboard.apis.api_evaluation.DataServer')
+    def test_post_duplicated_upload(self, data_server):
+        def upload_evaluation_data(data_server_model, application_model, stream):
+            while stream.read(4):
+                pass
+            return 'eval.txt'
+        data_server.return_value.upload_evaluation_data.side_effect = upload_evaluation_data
+        create_data_server_model(mode=DataServerModeEnum.AWS_S3, save=True)
+        url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/evaluations'
+        for _ in range(2):
+            response = self.client.post(
+                url, content_type='multipart/form-data',
+                data={'filepath': (BytesIO(b'my file contents'), "file.txt"), 'description': 'eval desc'})
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(response.json['evaluation_id'], 1)
+        self.assertEqual(EvaluationModel.query.one().checksum, 'bbdde322c6040753b8289fe8addf17b9')
+        data_server.return_value.delete_file.assert_called_once()
+
     @patch_stub
     def test_delete(self):
         create_data_server_model(save=True)
@@ -123,9 +173,56 @@ class ApiEvaluationTest(BaseTestCase):
         self.assertEqual(response.json, {'status': False, 'message': 'Not Found.'})
 
 
+class ApiEvaluationResultSummaryTest(BaseTestCase):
+    """Tests for ApiEvaluationResultSummary.
+    """
+    __URL = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/evaluation_results/summary'
+
+    def setUp(self):
+        super().setUp()
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        for accuracy in (0.5, 0.9, 0.7, 0.9):
+            create_eval_result_model(
+                evaluation_id=evaluation_model.evaluation_id,
+                result=json.dumps(dict(default_metrics, num=10, accuracy=accuracy, fvalue=[accuracy, 0.1])),
+                save=True)
+
+    def test_get(self):
+        response = self.client.get(self.__URL, query_string={'sort': 'accuracy', 'limit': 3})
+        self.assertEqual(200, response.status_code)
+        results = response.json['results']
+        self.assertEqual([(r['evaluation_result_id'], r['accuracy']) for r in results], [(4, 0.9), (2, 0.9), (3, 0.7)])
+        self.assertEqual(results[0]['fvalue_mean'], 0.5)
+        self.assertIsNone(results[0]['result'])
+
+        response = self.client.get(
+            self.__URL, query_string={'sort': 'accuracy', 'limit': 3, 'cursor': response.json['next_cursor']})
+        self.assertEqual([r['evaluation_result_id'] for r in response.json['results']], [1])
+        self.assertIsNone(response.json['next_cursor'])
+
+    def test_get_filtered(self):
+        response = self.client.get(
+            self.__URL, query_string={'min_accuracy': 0.7, 'order': 'asc', 'include_result': 'true'})
+        self.assertEqual(200, response.status_code)
+        results = response.json['results']
+        self.assertEqual([r['evaluation_result_id'] for r in results], [2, 3, 4])
+        self.assertEqual(results[0]['result']['accuracy'], 0.9)
+        self.assertEqual(results[0]['result']['result_id'], 2)
+
+
 class ApiEvaluationResultTest(BaseTestCase):
     """Tests for ApiEvaluationResult.
     """
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        evaluation_detail_cache.configure(self.cache_dir.name, 1024 * 1024)
+        patcher = patch('rekcurd_dashboard.apis.api_evaluation.evaluation_detail_cache_executor')
+        self.executor = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.executor.submit.side_effect = run_now
+
     @patch_stub
     def test_get_all(self):
         evaluation_model = create_eval_model(TEST_APPLICATION_ID, description='eval desc', save=True)
@@ -160,6 +257,128 @@ class ApiEvaluationResultTest(BaseTestCase):
             details[1],
             {'input': 0.5, 'label': [0.9, 1.3], 'output': [0.9, 0.3], 'score': [0.5, 0.5], 'is_correct': False})
 
+    @patch_stub
+    def test_get_paginated(self):
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        eval_result_model = create_eval_result_model(
+            model_id=TEST_MODEL_ID, evaluation_id=evaluation_model.evaluation_id,
+            result=json.dumps(default_metrics), save=True)
+        url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/' \
+              f'evaluation_results/{eval_result_model.evaluation_result_id}'
+        response = self.client.get(url, query_string={'offset': 1, 'limit': 2})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([d['is_correct'] for d in response.json['details']], [False, True])
+        self.assertEqual(response.json['next_offset'], 3)
+
+        response = self.client.get(url, query_string={'offset': 3, 'limit': 2})
+        self.assertEqual(len(response.json['details']), 1)
+        self.assertIsNone(response.json['next_offset'])
+
+        response = self.client.get(url, query_string={'only_incorrect': 'true'})
+        self.assertEqual([d['is_correct'] for d in response.json['details']], [False, False])
+
+    @patch_stub
+    def test_get_ndjson(self):
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        eval_result_model = create_eval_result_model(
+            model_id=TEST_MODEL_ID, evaluation_id=evaluation_model.evaluation_id,
+            result=json.dumps(default_metrics), save=True)
+        response = self.client.get(
+            f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/'
+            f'evaluation_results/{eval_result_model.evaluation_result_id}',
+            query_string={'format': 'ndjson', 'limit': 3})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        details = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(details), 3)
+        self.assertEqual(
+            details[0], {'input': 'input', 'label': 'test', 'output': 'test', 'score': 1.0, 'is_correct': True})
+
+    @patch_stub
+    def test_get_cached(self):
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        eval_result_model = create_eval_result_model(
+            model_id=TEST_MODEL_ID, evaluation_id=evaluation_model.evaluation_id,
+            result=json.dumps(default_metrics), save=True)
+        url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/' \
+              f'evaluation_results/{eval_result_model.evaluation_result_id}'
+        with patch('rekcurd_dashboard.apis.api_evaluation.RekcurdDashboardClient.run_evaluation_data',
+                   side_effect=RekcurdDashboardClient.run_evaluation_data, autospec=True) as run_evaluation_data:
+            expected = self.client.get(url).json
+            self.assertEqual(self.client.get(url).json, expected)
+            self.assertEqual(run_evaluation_data.call_count, 1)
+
+            create_data_server_model(save=True)
+            self.assertEqual(200, self.client.delete(url).status_code)
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    @patch_stub
+    def test_get_cache_miss_paginated(self):
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        eval_result_model = create_eval_result_model(
+            model_id=TEST_MODEL_ID, evaluation_id=evaluation_model.evaluation_id,
+            result=json.dumps(default_metrics), save=True)
+        url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/' \
+              f'evaluation_results/{eval_result_model.evaluation_result_id}'
+        consumed = list()
+        original = RekcurdDashboardClient.run_evaluation_data
+
+        def run_evaluation_data(client, *args):
+            for response in original(client, *args):
+                consumed.append(response)
+                yield response
+
+        self.executor.submit.side_effect = None
+        with patch('rekcurd_dashboard.apis.api_evaluation.RekcurdDashboardClient.run_evaluation_data',
+                   side_effect=run_evaluation_data, autospec=True):
+            response = self.client.get(url, query_string={'limit': 1})
+            self.assertEqual(len(response.json['details']), 1)
+            self.assertEqual(response.json['next_offset'], 1)
+            self.assertEqual(len(consumed), 1)
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+            # the rest of the same stream is read in the background
+            drain, = self.executor.submit.call_args[0]
+            drain()
+            self.assertEqual(len(consumed), 2)
+        response = self.client.get(url, query_string={'offset': 3})
+        self.assertEqual(len(response.json['details']), 1)
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+
+    @patch_stub
+    def test_get_too_large_to_cache(self):
+        evaluation_detail_cache.configure(self.cache_dir.name, 100)
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        eval_result_model = create_eval_result_model(
+            model_id=TEST_MODEL_ID, evaluation_id=evaluation_model.evaluation_id,
+            result=json.dumps(default_metrics), save=True)
+        url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/' \
+              f'evaluation_results/{eval_result_model.evaluation_result_id}'
+        response = self.client.get(url)
+        self.assertEqual(len(response.json['details']), 4)
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+        # the result is remembered as too large, so the rest of a page is not read to cache it
+        response = self.client.get(url, query_string={'limit': 1})
+        self.assertEqual(len(response.json['details']), 1)
+        self.executor.submit.assert_not_called()
+
+    @patch_stub
+    def test_get_not_cached(self):
+        evaluation_detail_cache.configure(None, 0)
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        eval_result_model = create_eval_result_model(
+            model_id=TEST_MODEL_ID, evaluation_id=evaluation_model.evaluation_id,
+            result=json.dumps(default_metrics), save=True)
+        url = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/' \
+              f'evaluation_results/{eval_result_model.evaluation_result_id}'
+        response = self.client.get(url, query_string={'offset': 1, 'limit': 2})
+        self.assertEqual([d['is_correct'] for d in response.json['details']], [False, True])
+        self.assertEqual(response.json['next_offset'], 3)
+        response = self.client.get(url, query_string={'only_incorrect': 'true', 'format': 'ndjson'})
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 2)
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
     @patch('rekcurd_dashboard.core.rekcurd_dashboard_client.rekcurd_pb2_grpc.RekcurdDashboardStub')
     def test_get_not_found(self, mock_stub_class):
         evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
@@ -278,3 +497,95 @@ class ApiEvaluateTest(BaseTestCase):
         data = {'evaluation_id': evaluation_id, 'model_id': TEST_MODEL_ID}
         response = self.client.put(url, data=data)
         self.assertEqual(400, response.status_code)
+
+    @patch_stub
+    def test_post_batch(self):
+        evaluation_id = create_eval_model(TEST_APPLICATION_ID, save=True).evaluation_id
+        create_model_model(model_id=TEST_MODEL_ID + 1, file_path='other.model', save=True)
+        create_model_model(model_id=TEST_MODEL_ID + 2, file_path='evaluated.model', save=True)
+        for model_id in (TEST_MODEL_ID + 1, TEST_MODEL_ID + 2):
+            create_service_model(service_id=f'service-{model_id}', display_name=f'service-{model_id}',
+                                 model_id=model_id, save=True)
+        create_eval_result_model(model_id=TEST_MODEL_ID + 2, evaluation_id=evaluation_id,
+                                 result=json.dumps(default_metrics), save=True)
+
+        response = self.client.post(
+            f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/evaluate_batch',
+            data={'model_ids': [TEST_MODEL_ID, TEST_MODEL_ID + 1, TEST_MODEL_ID + 2], 'evaluation_ids': [evaluation_id]})
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.json['status'])
+        self.assertEqual([(result['model_id'], result['evaluation_id']) for result in response.json['results']],
+                         [(TEST_MODEL_ID + i, evaluation_id) for i in range(3)])
+        self.assertEqual(response.json['results'][2]['message'], 'The evaluation result already exists')
+        self.assertEqual(EvaluationResultModel.query.count(), 3)
+        data_paths = {evaluation_result_model.data_path for evaluation_result_model in EvaluationResultModel.query}
+        self.assertEqual(len(data_paths), 3)
+
+
+
+class ApiEvaluationJobTest(BaseTestCase):
+    """Tests for ApiEvaluationJobs.
+    """
+    __URL = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/evaluation_jobs'
+
+    @patch_stub
+    @patch('rekcurd_dashboard.apis.api_evaluation.evaluation_job_executor')
+    def test_post(self, executor):
+        evaluation_id = create_eval_model(TEST_APPLICATION_ID, save=True).evaluation_id
+        response = self.client.post(self.__URL, data={'evaluation_id': evaluation_id, 'model_id': TEST_MODEL_ID})
+        self.assertEqual(200, response.status_code)
+        job_id = response.json['job_id']
+
+        response = self.client.get(f'{self.__URL}/{job_id}')
+        self.assertEqual(response.json['status'], 'queued')
+        response = self.client.post(self.__URL, data={'evaluation_id': evaluation_id, 'model_id': TEST_MODEL_ID})
+        self.assertEqual(response.json['job_id'], job_id)
+
+        fn, *args = executor.submit.call_args[0]
+        fn(*args)
+        response = self.client.get(f'{self.__URL}/{job_id}')
+        self.assertEqual(response.json['status'], 'succeeded')
+        self.assertEqual(response.json['progress'], 1.0)
+        self.assertIsNotNone(response.json['finished_date'])
+        evaluation_result_model = db.session.query(EvaluationResultModel).filter(
+            EvaluationResultModel.model_id == TEST_MODEL_ID,
+            EvaluationResultModel.evaluation_id == evaluation_id).one()
+        self.assertEqual(response.json['evaluation_result_id'], evaluation_result_model.evaluation_result_id)
+        self.assertEqual(evaluation_result_model.result, dict(default_metrics, result_id=1, status=True))
+
+        response = self.client.get(self.__URL)
+        self.assertEqual([job['job_id'] for job in response.json], [job_id])
+
+    @patch_stub
+    @patch('rekcurd_dashboard.apis.api_evaluation.evaluation_job_executor')
+    def test_post_failed(self, executor):
+        evaluation_id = create_eval_model(TEST_APPLICATION_ID, save=True).evaluation_id
+        response = self.client.post(self.__URL, data={'evaluation_id': evaluation_id, 'model_id': TEST_MODEL_ID})
+        job_id = response.json['job_id']
+        with patch('rekcurd_dashboard.apis.api_evaluation.RekcurdDashboardClient') as client:
+            client.return_value.run_evaluate_model.side_effect = Exception('Connection refused')
+            fn, *args = executor.submit.call_args[0]
+            fn(*args)
+        response = self.client.get(f'{self.__URL}/{job_id}')
+        self.assertEqual(response.json['status'], 'failed')
+        self.assertEqual(response.json['message'], 'Connection refused')
+        self.assertEqual(EvaluationResultModel.query.count(), 0)
+
+    @patch_stub
+    @patch('rekcurd_dashboard.apis.api_evaluation.evaluation_job_executor')
+    def test_post_stale(self, executor):
+        evaluation_id = create_eval_model(TEST_APPLICATION_ID, save=True).evaluation_id
+        response = self.client.post(self.__URL, data={'evaluation_id': evaluation_id, 'model_id': TEST_MODEL_ID})
+        job_id = response.json['job_id']
+        EvaluationJobModel.query.filter_by(job_id=job_id).update({
+            EvaluationJobModel.status: EvaluationJobStatus.running,
+            EvaluationJobModel.heartbeat_date: datetime.datetime.utcnow() - datetime.timedelta(
+                seconds=Heartbeat.STALE_SECONDS + 1)})
+        db.session.commit()
+
+        response = self.client.post(self.__URL, data={'evaluation_id': evaluation_id, 'model_id': TEST_MODEL_ID})
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(response.json['job_id'], job_id)
+        response = self.client.get(f'{self.__URL}/{job_id}')
+        self.assertEqual(response.json['status'], 'failed')
+        self.assertEqual(response.json['message'], 'The process running the job has exited.')
@@ -11,3 +11,12 @@ class ApiSettingsTest(BaseTestCase):
         response = self.client.get(self.__URL)
         self.assertEqual(200, response.status_code)
         self.assertIsNotNone(response)
+
+
+class ApiDbPoolMetricsTest(BaseTestCase):
+    __URL = '/api/metrics/db_pool'
+
+    def test_get(self):
+        response = self.client.get(self.__URL)
+        self.assertEqual(200, response.status_code)
+        self.assertIn('status', response.json)
@@ -1,9 +1,19 @@
-from functools import wraps
+import hashlib
+import io
+
+from functools import wraps, partial
 from unittest.mock import patch, Mock, mock_open
 
-from rekcurd_dashboard.models import db, ModelModel, DataServerModel, DataServerModeEnum, ServiceModel
+from rekcurd_dashboard.apis.api_model import upload_model_to_services
+from rekcurd_dashboard.models import (
+    db, ModelModel, DataServerModel, DataServerModeEnum, ServiceModel, ApplicationModel
+)
+from rekcurd_dashboard.utils import RekcurdDashboardException, ProtobufUtil, IoUtil
 
-from test.base import BaseTestCase, TEST_PROJECT_ID, TEST_APPLICATION_ID, TEST_MODEL_ID, create_data_server_model
+from test.base import (
+    BaseTestCase, TEST_PROJECT_ID, TEST_APPLICATION_ID, TEST_MODEL_ID,
+    create_data_server_model, create_service_model, create_model_model
+)
 
 
 def mock_decorator():
@@ -57,6 +67,44 @@ class ApiModelsTest(BaseTestCase):
             self.__URL, data={'filepath': (open(dummy_file, 'rb'), dummy_file), 'description': description})
         self.assertEqual(200, response.status_code)
 
+    @patch('rekcurd_dashboard.apis.api_model.DataServer')
+    def test_post_duplicated(self, data_server):
+        data_server.return_value.upload_model.return_value = 'models/dummy.model'
+        DataServerModel.query.filter(DataServerModel.project_id == TEST_PROJECT_ID).delete()
+        create_data_server_model(mode=DataServerModeEnum.AWS_S3, save=True)
+        for description in ('first', 'second'):
+            response = self.client.post(
+                self.__URL, data={'filepath': (io.BytesIO(b'dummy'), 'test/dummy'), 'description': description})
+            self.assertEqual(200, response.status_code)
+        self.assertEqual(response.json['message'], 'The model already exists. Description: first')
+
+        checksum = hashlib.sha256(b'dummy').hexdigest()
+        model_model = ModelModel.query.filter(ModelModel.description == 'first').one()
+        self.assertEqual(model_model.checksum, checksum)
+        self.assertEqual(model_model.filesize, 5)
+        self.assertEqual(ModelModel.query.filter(ModelModel.description == 'second').count(), 0)
+        self.assertEqual(data_server.return_value.upload_model.call_count, 1)
+        self.assertEqual(data_server.return_value.upload_model.call_args[1]['checksum'], checksum)
+
+    @patch('rekcurd_dashboard.apis.api_model.IoUtil.spool')
+    @patch('rekcurd_dashboard.apis.api_model.DataServer')
+    def test_post_without_copy(self, data_server, spool):
+        uploaded = list()
+
+        def upload_model(data_server_model, application_model, stream, checksum):
+            uploaded.append(stream.read())
+            return 'models/dummy.model'
+
+        data_server.return_value.upload_model.side_effect = upload_model
+        DataServerModel.query.filter(DataServerModel.project_id == TEST_PROJECT_ID).delete()
+        create_data_server_model(mode=DataServerModeEnum.AWS_S3, save=True)
+        content = b'dummy' * 200000
+        response = self.client.post(
+            self.__URL, data={'filepath': (io.BytesIO(content), 'test/dummy'), 'description': 'large'})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(uploaded, [content])
+        spool.assert_not_called()
+
 
 class ApiModelIdTest(BaseTestCase):
     __URL = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/models/{TEST_MODEL_ID}'
@@ -82,3 +130,48 @@ class ApiModelIdTest(BaseTestCase):
         ServiceModel.query.filter(ServiceModel.application_id == TEST_APPLICATION_ID).delete()
         response = self.client.delete(self.__URL)
         self.assertEqual(200, response.status_code)
+
+    @patch('rekcurd_dashboard.apis.api_model.DataServer')
+    def test_delete_unreferenced_file(self, data_server):
+        DataServerModel.query.filter(DataServerModel.project_id == TEST_PROJECT_ID).delete()
+        create_data_server_model(mode=DataServerModeEnum.AWS_S3, save=True)
+        ServiceModel.query.filter(ServiceModel.application_id == TEST_APPLICATION_ID).delete()
+        db.session.add(ApplicationModel(
+            application_id='other-application', application_name='other-application', project_id=TEST_PROJECT_ID))
+        db.session.commit()
+        filepath = ModelModel.query.filter_by(model_id=TEST_MODEL_ID).one().filepath
+        create_model_model(application_id='other-application', model_id=TEST_MODEL_ID + 1,
+                           file_path=filepath, description='shared', save=True)
+        response = self.client.delete(self.__URL)
+        self.assertEqual(200, response.status_code)
+        data_server.return_value.delete_file.assert_not_called()
+
+        response = self.client.delete(
+            f'/api/projects/{TEST_PROJECT_ID}/applications/other-application/models/{TEST_MODEL_ID + 1}')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(data_server.return_value.delete_file.call_args[0][1], filepath)
+
+
+class UploadModelToServicesTest(BaseTestCase):
+    def test_upload_model_to_services(self):
+        service_models = [
+            create_service_model(service_id='service-{}'.format(i), display_name='service-{}'.format(i),
+                                 insecure_port=5000 + i, save=True) for i in range(3)]
+        application_model = ApplicationModel.query.filter_by(application_id=TEST_APPLICATION_ID).one()
+        received = dict()
+
+        def run_upload_model(port, filepath, f):
+            received[port] = b''.join(ProtobufUtil.stream_file(f, size=2))
+            return {"status": port != 5002, "message": "Error."}
+
+        with patch('rekcurd_dashboard.apis.api_model.RekcurdDashboardClient',
+                   new=Mock(side_effect=lambda host, port, **kwargs: Mock(
+                       run_upload_model=partial(run_upload_model, port)))):
+            with open('test/dummy', 'rb') as fp, IoUtil.map_stream(fp) as buffer:
+                upload_model_to_services(service_models[:2], application_model, 'test.model', buffer)
+                self.assertEqual(received, {5000: b'dummy', 5001: b'dummy'})
+                with self.assertRaisesRegex(RekcurdDashboardException, 'service-2'):
+                    upload_model_to_services(service_models, application_model, 'test.model', buffer)
+            with IoUtil.map_stream(io.BytesIO(b'dummy')) as buffer:
+                upload_model_to_services(service_models[:1], application_model, 'test.model', buffer)
+                self.assertEqual(received[5000], b'dummy')
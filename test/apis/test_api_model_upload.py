@@ -0,0 +1,203 @@
+import datetime
+import hashlib
+import os
+import tempfile
+from concurrent.futures import Future
+from unittest.mock import ANY, patch
+
+from rekcurd_dashboard.models import db, DataServerModel, DataServerModeEnum, ModelModel, ModelUploadModel
+
+from test.base import BaseTestCase, TEST_PROJECT_ID, TEST_APPLICATION_ID, create_data_server_model
+
+
+CONTENT = b'0123456789'
+CHECKSUM = hashlib.sha256(CONTENT).hexdigest()
+
+
+def run_now(func, *args):
+    future = Future()
+    future.set_result(func(*args))
+    return future
+
+
+class ApiModelUploadsLocalTest(BaseTestCase):
+    __URL = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/model_uploads'
+
+    def setUp(self):
+        super().setUp()
+        create_data_server_model(save=True)
+        self.spool_dir = tempfile.TemporaryDirectory()
+        patcher = patch('rekcurd_dashboard.apis.api_model_upload.MODEL_UPLOAD_SPOOL_DIR', new=self.spool_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.spool_dir.cleanup)
+
+    def initiate(self, checksum=CHECKSUM):
+        response = self.client.post(
+            self.__URL, data={'description': 'resumable', 'checksum': checksum, 'filesize': len(CONTENT)})
+        self.assertEqual(200, response.status_code)
+        return response.json['upload_id']
+
+    @patch('rekcurd_dashboard.apis.api_model_upload.upload_model_to_services')
+    def test_upload(self, upload_model_to_services):
+        received = dict()
+        upload_model_to_services.side_effect = \
+            lambda service_models, application_model, filepath, buffer: received.update(data=bytes(buffer))
+        upload_id = self.initiate()
+        for part_number, data in ((2, CONTENT[4:]), (1, b'xxxx'), (1, CONTENT[:4])):
+            response = self.client.put(f'{self.__URL}/{upload_id}/parts/{part_number}', data=data)
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(response.json['checksum'], hashlib.md5(data).hexdigest())
+
+        response = self.client.get(f'{self.__URL}/{upload_id}')
+        self.assertEqual([(part['part_number'], part['size']) for part in response.json['parts']], [(1, 4), (2, 6)])
+
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(received['data'], CONTENT)
+        model_model = ModelModel.query.filter_by(model_id=response.json['model_id']).one()
+        self.assertEqual((model_model.checksum, model_model.filesize), (CHECKSUM, len(CONTENT)))
+        self.assertEqual(ModelUploadModel.query.count(), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.spool_dir.name, upload_id)))
+
+        response = self.client.post(
+            self.__URL, data={'description': 'again', 'checksum': CHECKSUM, 'filesize': len(CONTENT)})
+        self.assertEqual(response.json['model_id'], model_model.model_id)
+        self.assertIsNone(response.json['upload_id'])
+
+    def test_complete_invalid(self):
+        upload_id = self.initiate()
+        response = self.client.put(f'{self.__URL}/{upload_id}/parts/2', data=CONTENT[4:])
+        self.assertEqual(200, response.status_code)
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(response.json['message'], 'Parts are missing: 1')
+
+        response = self.client.put(f'{self.__URL}/{upload_id}/parts/1', data=b'abcd')
+        self.assertEqual(200, response.status_code)
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(ModelUploadModel.query.count(), 1)
+
+    def test_abort(self):
+        upload_id = self.initiate()
+        self.client.put(f'{self.__URL}/{upload_id}/parts/1', data=CONTENT)
+        response = self.client.delete(f'{self.__URL}/{upload_id}')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(ModelUploadModel.query.count(), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.spool_dir.name, upload_id)))
+        response = self.client.put(f'{self.__URL}/{upload_id}/parts/1', data=CONTENT)
+        self.assertEqual(404, response.status_code)
+
+    def test_initiate_invalid(self):
+        response = self.client.post(
+            self.__URL, data={'description': 'resumable', 'checksum': 'xxx', 'filesize': len(CONTENT)})
+        self.assertEqual(400, response.status_code)
+
+
+class ApiModelUploadsStorageTest(BaseTestCase):
+    __URL = f'/api/projects/{TEST_PROJECT_ID}/applications/{TEST_APPLICATION_ID}/model_uploads'
+
+    def setUp(self):
+        super().setUp()
+        DataServerModel.query.filter(DataServerModel.project_id == TEST_PROJECT_ID).delete()
+        db.session.commit()
+        create_data_server_model(mode=DataServerModeEnum.AWS_S3, save=True)
+        patcher = patch('rekcurd_dashboard.apis.api_model_upload.model_upload_verify_executor')
+        self.executor = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.executor.submit.side_effect = run_now
+        patcher = patch('rekcurd_dashboard.apis.api_model_upload.model_upload_heartbeat')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, data_server, exists=False):
+        data_server.content_addressed_model_path.return_value = 'models/{}.model'.format(CHECKSUM)
+        data_server.model_upload_path.side_effect = lambda upload_id: 'model-uploads/{}.model'.format(upload_id)
+        data_server.return_value.file_exists.return_value = exists
+        data_server.return_value.initiate_multipart_upload.return_value = 'storage-upload-id'
+        data_server.return_value.upload_part.side_effect = \
+            lambda dsm, filepath, upload_id, part_number, fp, size, md5: 'etag-{}'.format(part_number)
+        response = self.client.post(
+            self.__URL, data={'description': 'resumable', 'checksum': CHECKSUM, 'filesize': len(CONTENT)})
+        upload_id = response.json['upload_id']
+        self.client.put(f'{self.__URL}/{upload_id}/parts/1', data=CONTENT[:4])
+        self.client.put(f'{self.__URL}/{upload_id}/parts/2', data=CONTENT[4:])
+        return upload_id
+
+    @patch('rekcurd_dashboard.apis.api_model_upload.DataServer')
+    def test_upload(self, data_server):
+        data_server.return_value.open_file.return_value = (iter([CONTENT[:4], CONTENT[4:]]), len(CONTENT))
+        upload_id = self.upload(data_server)
+        args = data_server.return_value.upload_part.call_args[0]
+        self.assertEqual(args[1:4] + args[5:], (
+            f'model-uploads/{upload_id}.model', 'storage-upload-id', 2, 6, hashlib.md5(CONTENT[4:]).hexdigest()))
+
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(response.json['upload_id'], upload_id)
+        self.assertEqual(data_server.return_value.complete_multipart_upload.call_args[0][1:],
+                         (f'model-uploads/{upload_id}.model', 'storage-upload-id', [(1, 'etag-1'), (2, 'etag-2')]))
+        self.assertEqual(data_server.return_value.copy_file.call_args[0][1:],
+                         (f'model-uploads/{upload_id}.model', 'models/{}.model'.format(CHECKSUM)))
+        data_server.return_value.delete_file.assert_called_once_with(ANY, f'model-uploads/{upload_id}.model')
+
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(ModelModel.query.filter_by(model_id=response.json['model_id']).one().filepath,
+                         'models/{}.model'.format(CHECKSUM))
+        self.assertEqual(data_server.return_value.complete_multipart_upload.call_count, 1)
+        self.assertEqual(data_server.return_value.open_file.call_count, 1)
+        response = self.client.get(f'{self.__URL}/{upload_id}')
+        self.assertEqual(response.json['status'], 'succeeded')
+
+    @patch('rekcurd_dashboard.apis.api_model_upload.DataServer')
+    def test_upload_verifying(self, data_server):
+        self.executor.submit.side_effect = None
+        upload_id = self.upload(data_server)
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(202, response.status_code)
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(self.executor.submit.call_count, 1)
+        self.assertEqual(self.client.get(f'{self.__URL}/{upload_id}').json['status'], 'verifying')
+
+        # the process verifying it has exited
+        ModelUploadModel.query.filter_by(upload_id=upload_id).update({
+            ModelUploadModel.heartbeat_date: datetime.datetime.utcnow() - datetime.timedelta(days=1)})
+        db.session.commit()
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(self.executor.submit.call_count, 2)
+        self.assertEqual(data_server.return_value.complete_multipart_upload.call_count, 1)
+
+    @patch('rekcurd_dashboard.apis.api_model_upload.DataServer')
+    def test_upload_checksum_mismatch(self, data_server):
+        data_server.return_value.open_file.return_value = (iter([b'xxxx', CONTENT[4:]]), len(CONTENT))
+        upload_id = self.upload(data_server)
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(202, response.status_code)
+        data_server.return_value.delete_file.assert_called_once_with(ANY, f'model-uploads/{upload_id}.model')
+        data_server.return_value.copy_file.assert_not_called()
+
+        response = self.client.get(f'{self.__URL}/{upload_id}')
+        self.assertEqual((response.json['status'], response.json['message']),
+                         ('failed', 'Checksum mismatch. The upload is discarded.'))
+        self.assertEqual(ModelModel.query.filter_by(checksum=CHECKSUM).count(), 0)
+        self.assertEqual(200, self.client.delete(f'{self.__URL}/{upload_id}').status_code)
+        data_server.return_value.abort_multipart_upload.assert_not_called()
+
+    @patch('rekcurd_dashboard.apis.api_model_upload.DataServer')
+    def test_already_stored(self, data_server):
+        # the content is stored by another application, so the parts must still be uploaded and verified
+        data_server.return_value.open_file.return_value = (iter([CONTENT]), len(CONTENT))
+        upload_id = self.upload(data_server, exists=True)
+        self.assertIsNotNone(upload_id)
+        self.assertEqual(ModelModel.query.filter_by(checksum=CHECKSUM).count(), 0)
+
+        self.assertEqual(202, self.client.post(f'{self.__URL}/{upload_id}/complete').status_code)
+        response = self.client.post(f'{self.__URL}/{upload_id}/complete')
+        self.assertEqual(ModelModel.query.filter_by(model_id=response.json['model_id']).one().filepath,
+                         'models/{}.model'.format(CHECKSUM))
+        data_server.return_value.copy_file.assert_not_called()
+        data_server.return_value.delete_file.assert_called_once_with(ANY, f'model-uploads/{upload_id}.model')
@@ -4,10 +4,15 @@ from unittest.mock import patch, Mock, mock_open
 from werkzeug.datastructures import FileStorage
 
 from rekcurd_dashboard.apis.kubernetes_handler import (
-    get_full_config_path, save_kubernetes_access_file, remove_kubernetes_access_file
+    get_full_config_path, save_kubernetes_access_file, remove_kubernetes_access_file,
+    get_api_client, evict_api_client, update_kubernetes_deployment_info
 )
+from rekcurd_dashboard.models import KubernetesModel, ApplicationModel, ServiceModel, ModelModel
 
-from test.base import BaseTestCase
+from test.base import (
+    BaseTestCase, TEST_PROJECT_ID, TEST_APPLICATION_ID,
+    create_project_model, create_application_model, create_kubernetes_model
+)
 
 
 def mock_decorator():
@@ -25,6 +30,22 @@ def mock_decorator():
     return test_method
 
 
+def create_deployment(application_id, service_id, filepath, namespace='development'):
+    from kubernetes import client
+    env = [client.V1EnvVar(name="REKCURD_GRPC_PROTO_VERSION", value="v2"),
+           client.V1EnvVar(name="REKCURD_MODEL_FILE_PATH", value=filepath),
+           client.V1EnvVar(name="REKCURD_SERVICE_INSECURE_HOST", value="[::]"),
+           client.V1EnvVar(name="REKCURD_SERVICE_INSECURE_PORT", value="5000")]
+    return client.V1Deployment(
+        metadata=client.V1ObjectMeta(
+            namespace=namespace,
+            labels={"rekcurd-worker": "True", "id": application_id, "name": application_id, "sel": service_id}),
+        spec=client.V1DeploymentSpec(
+            selector=client.V1LabelSelector(),
+            template=client.V1PodTemplateSpec(
+                spec=client.V1PodSpec(containers=[client.V1Container(name="worker", env=env)]))))
+
+
 class ApiSettingsTest(BaseTestCase):
     def setUp(self):
         pass
@@ -40,3 +61,45 @@ class ApiSettingsTest(BaseTestCase):
     @mock_decorator()
     def test_remove_kubernetes_access_file(self):
         self.assertIsNone(remove_kubernetes_access_file('tmp'))
+
+    def test_get_api_client(self):
+        with open('test/dummy', 'rb') as fp:
+            save_kubernetes_access_file(FileStorage(fp), 'tmp')
+        kubernetes_model = KubernetesModel(kubernetes_id=1, config_path='tmp')
+        with patch('kubernetes.config.new_client_from_config',
+                   new=Mock(side_effect=lambda **kwargs: Mock())) as new_client_from_config:
+            api_client = get_api_client(kubernetes_model)
+            self.assertIs(api_client, get_api_client(kubernetes_model))
+            self.assertEqual(new_client_from_config.call_count, 1)
+            evict_api_client(1)
+            self.assertIsNot(api_client, get_api_client(kubernetes_model))
+            self.assertEqual(new_client_from_config.call_count, 2)
+        evict_api_client(1)
+
+    def test_update_kubernetes_deployment_info(self):
+        from kubernetes import client
+        first_page = client.V1DeploymentList(
+            metadata=client.V1ListMeta(_continue='next'),
+            items=[create_deployment(TEST_APPLICATION_ID, 'service-1', 'model-1'),
+                   create_deployment(TEST_APPLICATION_ID, 'service-2', 'model-1', namespace='beta')])
+        last_page = client.V1DeploymentList(
+            metadata=client.V1ListMeta(),
+            items=[create_deployment('new-application', 'service-3', 'model-2')])
+        create_project_model(save=True)
+        create_application_model(save=True)
+        kubernetes_model = create_kubernetes_model(save=True)
+        with patch('rekcurd_dashboard.apis.kubernetes_handler.get_api_client', new=Mock()), \
+                patch('kubernetes.client.AppsV1Api') as apps_v1_api:
+            list_deployment = apps_v1_api.return_value.list_deployment_for_all_namespaces
+            list_deployment.side_effect = [first_page, last_page, first_page, last_page]
+            update_kubernetes_deployment_info(kubernetes_model)
+            update_kubernetes_deployment_info(kubernetes_model)
+            self.assertEqual(list_deployment.call_args_list[0][1]['label_selector'], 'rekcurd-worker=True')
+            self.assertEqual(list_deployment.call_args_list[1][1]['_continue'], 'next')
+        self.assertEqual(ApplicationModel.query.filter_by(project_id=TEST_PROJECT_ID).count(), 2)
+        self.assertEqual(ModelModel.query.count(), 2)
+        self.assertEqual(ServiceModel.query.count(), 3)
+        service_model = ServiceModel.query.filter_by(service_id='service-2').one()
+        self.assertEqual(service_model.display_name, 'beta-service-2')
+        self.assertEqual(service_model.model.filepath, 'model-1')
+        self.assertEqual(service_model.insecure_port, 5000)
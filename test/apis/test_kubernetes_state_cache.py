@@ -0,0 +1,90 @@
+import time
+import unittest
+from unittest.mock import patch, Mock
+
+from kubernetes import client
+
+from rekcurd_dashboard.apis.kubernetes_state_cache import (
+    KubernetesStateCache, DEPLOYMENT, VIRTUAL_SERVICE
+)
+
+
+def create_deployment(service_id, replicas=1):
+    return client.V1Deployment(
+        metadata=client.V1ObjectMeta(
+            name="deploy-{}".format(service_id), namespace="development", resource_version="1",
+            labels={"rekcurd-worker": "True", "id": "test-application", "sel": service_id}),
+        spec=client.V1DeploymentSpec(
+            replicas=replicas, selector=client.V1LabelSelector(), template=client.V1PodTemplateSpec()))
+
+
+def create_virtual_service():
+    return {"metadata": {"namespace": "development", "resourceVersion": "1",
+                         "labels": {"rekcurd-worker": "True", "id": "test-application"}},
+            "spec": {"http": [{"route": []}]}}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class KubernetesStateCacheTest(unittest.TestCase):
+    """Tests for KubernetesStateCache.
+    """
+
+    def setUp(self):
+        events = [{"type": "MODIFIED", "object": create_deployment("service-1", replicas=3)},
+                  {"type": "DELETED", "object": create_deployment("service-2")}]
+
+        def stream(list_function, **kwargs):
+            if list_function is self.apps_v1_api.list_deployment_for_all_namespaces and events:
+                yield events.pop(0)
+            else:
+                time.sleep(0.01)
+
+        self.apps_v1_api = Mock()
+        self.apps_v1_api.list_deployment_for_all_namespaces.return_value = client.V1DeploymentList(
+            metadata=client.V1ListMeta(resource_version="1"),
+            items=[create_deployment("service-1"), create_deployment("service-2")])
+        autoscaling_v1_api = Mock()
+        autoscaling_v1_api.list_horizontal_pod_autoscaler_for_all_namespaces.return_value = \
+            client.V1HorizontalPodAutoscalerList(metadata=client.V1ListMeta(resource_version="1"), items=[])
+        custom_objects_api = Mock()
+        custom_objects_api.list_cluster_custom_object.return_value = {
+            "metadata": {"resourceVersion": "1"}, "items": [create_virtual_service()]}
+        self.patchers = [
+            patch('kubernetes.client.AppsV1Api', new=Mock(return_value=self.apps_v1_api)),
+            patch('kubernetes.client.AutoscalingV1Api', new=Mock(return_value=autoscaling_v1_api)),
+            patch('kubernetes.client.CustomObjectsApi', new=Mock(return_value=custom_objects_api)),
+            patch('kubernetes.watch.Watch', new=Mock(return_value=Mock(stream=stream))),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.state_cache = KubernetesStateCache(Mock, staleness_seconds=60)
+
+    def tearDown(self):
+        self.state_cache.stop()
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_cache(self):
+        self.assertIsNone(self.state_cache.get_deployment("service-1"))
+        self.state_cache.start()
+        self.assertTrue(wait_for(lambda: self.state_cache.get_virtual_service("test-application", "development")))
+        self.assertTrue(wait_for(lambda: self.state_cache.get_deployment("service-2") is None))
+        self.assertEqual(self.state_cache.get_deployment("service-1").spec.replicas, 3)
+        kwargs = self.apps_v1_api.list_deployment_for_all_namespaces.call_args[1]
+        self.assertEqual(kwargs["label_selector"], "rekcurd-worker=True")
+
+    def test_invalidate(self):
+        self.state_cache.start()
+        self.assertTrue(wait_for(lambda: self.state_cache.get_virtual_service("test-application", "development")))
+        self.state_cache.invalidate(VIRTUAL_SERVICE, ("test-application", "development"))
+        self.assertIsNone(self.state_cache.get_virtual_service("test-application", "development"))
+        self.state_cache.invalidate(DEPLOYMENT, "service-1")
+        self.assertIsNone(self.state_cache.get_deployment("service-1"))
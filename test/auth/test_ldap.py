@@ -0,0 +1,69 @@
+import logging
+import unittest
+from unittest.mock import Mock, patch
+
+import ldap
+
+from rekcurd_dashboard.auth import LdapAuthenticator
+
+
+BIND_DN = 'CN=manager, DC=example, DC=com'
+USER_DN = 'CN=test-user, OU=user, DC=example, DC=com'
+CONFIG = {
+    'host': 'ldap.example.com',
+    'port': 389,
+    'bind_dn': BIND_DN,
+    'bind_password': 'secret',
+    'search_filter': '(CN=%s)',
+    'search_base_dns': ['OU=admin, DC=example, DC=com', 'OU=user, DC=example, DC=com'],
+}
+
+
+class LdapAuthenticatorTest(unittest.TestCase):
+    """Tests for LdapAuthenticator.
+    """
+
+    def setUp(self):
+        self.conn = Mock()
+        self.conn.search_ext.side_effect = lambda base_dn, *args, **kwargs: base_dn
+        self.conn.result.side_effect = lambda msgid, **kwargs: (
+            ldap.RES_SEARCH_RESULT,
+            [(USER_DN, {'givenName': [b'Test']})] if msgid.startswith('OU=user') else [(None, ['ldap://referral'])])
+        self.conn.simple_bind_s.side_effect = self.__bind
+        patcher = patch('ldap.initialize', return_value=self.conn)
+        self.initialize = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.authenticator = LdapAuthenticator(CONFIG, logging.getLogger(__name__))
+        self.addCleanup(self.authenticator.pool.close)
+
+    @staticmethod
+    def __bind(dn, password):
+        if (dn, password) not in ((BIND_DN, 'secret'), (USER_DN, 'password')):
+            raise ldap.INVALID_CREDENTIALS({'desc': 'Invalid credentials'})
+
+    def test_auth_user(self):
+        self.assertEqual(self.authenticator.auth_user('test-user', 'password'), {'uid': 'test-user', 'name': 'Test'})
+        self.assertEqual(self.authenticator.auth_user('test-user', 'password'), {'uid': 'test-user', 'name': 'Test'})
+        self.initialize.assert_called_once_with('ldap://ldap.example.com:389')
+        self.assertEqual(self.conn.search_ext.call_count, 2)
+        self.assertEqual(self.conn.simple_bind_s.call_args[0], (BIND_DN, 'secret'))
+
+    def test_auth_user_invalid_credentials(self):
+        self.assertIsNone(self.authenticator.auth_user('test-user', 'wrong'))
+        self.assertIsNone(self.authenticator.auth_user('test-user', ''))
+        self.assertEqual(self.authenticator.auth_user('test-user', 'password'), {'uid': 'test-user', 'name': 'Test'})
+        self.initialize.assert_called_once()
+        self.assertEqual(self.conn.search_ext.call_count, 4)
+        self.conn.unbind_s.assert_not_called()
+
+    def test_auth_user_not_found(self):
+        self.conn.result.side_effect = lambda msgid, **kwargs: (ldap.RES_SEARCH_RESULT, [])
+        self.assertIsNone(self.authenticator.auth_user('test-user', 'password'))
+        self.assertIsNone(self.authenticator.auth_user('test-user', 'password'))
+        self.assertEqual(self.conn.search_ext.call_count, 2)
+
+    def test_auth_user_server_down(self):
+        self.conn.search_ext.side_effect = ldap.SERVER_DOWN({'desc': "Can't contact LDAP server"})
+        self.assertIsNone(self.authenticator.auth_user('test-user', 'password'))
+        self.assertEqual(self.initialize.call_count, 2)
+        self.assertEqual(self.conn.unbind_s.call_count, 2)
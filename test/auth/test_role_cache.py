@@ -0,0 +1,130 @@
+from sqlalchemy import event
+
+from rekcurd_dashboard.auth import Auth, RoleCache
+from rekcurd_dashboard.models import (
+    db, ApplicationModel, ApplicationUserRoleModel, ApplicationRole, ProjectRole, update_acl_enabled
+)
+
+from test.base import (
+    BaseTestCase, create_project_user_role_model, create_application_user_role_model,
+    TEST_PROJECT_ID, TEST_APPLICATION_ID, TEST_USER_ID_1, TEST_USER_ID_2
+)
+
+
+class RoleCacheTest(BaseTestCase):
+    """Tests for RoleCache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        create_project_user_role_model(
+            project_id=TEST_PROJECT_ID, user_id=TEST_USER_ID_1, project_role=ProjectRole.admin, save=True)
+        create_application_user_role_model(
+            application_id=TEST_APPLICATION_ID, user_id=TEST_USER_ID_1,
+            application_role=ApplicationRole.editor, save=True)
+        self.public_application_id = 'public-application'
+        self.statements = []
+        listener = lambda conn, cursor, statement, *args: self.statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, db.engine, 'before_cursor_execute', listener)
+
+    def test_get(self):
+        role_cache = RoleCache()
+        with self.app.app_context():
+            roles = role_cache.get(TEST_USER_ID_1)
+            self.assertEqual(roles.project_role(TEST_PROJECT_ID), ProjectRole.admin)
+            self.assertEqual(roles.application_role(TEST_APPLICATION_ID), ApplicationRole.editor)
+            self.assertEqual(roles.application_role(self.public_application_id), ApplicationRole.admin)
+            roles = role_cache.get(TEST_USER_ID_2)
+            self.assertIsNone(roles.project_role(TEST_PROJECT_ID))
+            self.assertEqual(roles.application_role(TEST_APPLICATION_ID), ApplicationRole.viewer)
+            self.assertEqual(roles.application_role(self.public_application_id), ApplicationRole.admin)
+        self.assertEqual(len(self.statements), 2)
+
+    def test_cache(self):
+        role_cache = RoleCache()
+        with self.app.app_context():
+            role_cache.get(TEST_USER_ID_1)
+        with self.app.app_context():
+            role_cache.get(TEST_USER_ID_1)
+        self.assertEqual(len(self.statements), 1)
+
+        with self.app.app_context():
+            self.assertIsNone(role_cache.get(TEST_USER_ID_2).project_role(TEST_PROJECT_ID))
+        create_project_user_role_model(
+            project_id=TEST_PROJECT_ID, user_id=TEST_USER_ID_2, project_role=ProjectRole.member, save=True)
+        with self.app.app_context():
+            self.assertIsNone(role_cache.get(TEST_USER_ID_2).project_role(TEST_PROJECT_ID))
+            role_cache.invalidate(TEST_USER_ID_2)
+            self.assertEqual(role_cache.get(TEST_USER_ID_2).project_role(TEST_PROJECT_ID), ProjectRole.member)
+
+    def test_ttl(self):
+        role_cache = RoleCache()
+        role_cache.TTL_SECONDS = 0
+        with self.app.app_context():
+            role_cache.get(TEST_USER_ID_1)
+            role_cache.get(TEST_USER_ID_1)
+        with self.app.app_context():
+            role_cache.get(TEST_USER_ID_1)
+        self.assertEqual(len(self.statements), 2)
+
+
+class CredentialTest(BaseTestCase):
+    """Tests for Auth.credential and ApplicationModel.acl_enabled.
+    """
+
+    def setUp(self):
+        super().setUp()
+        create_project_user_role_model(
+            project_id=TEST_PROJECT_ID, user_id=TEST_USER_ID_1, project_role=ProjectRole.admin, save=True)
+        self.public_application_id = 'public-application'
+        db.session.add(ApplicationModel(
+            application_id=self.public_application_id, application_name='public-application',
+            project_id=TEST_PROJECT_ID))
+        db.session.commit()
+
+    def __acl_enabled(self, application_id):
+        return db.session.query(ApplicationModel.acl_enabled).filter(
+            ApplicationModel.application_id == application_id).scalar()
+
+    def test_acl_enabled(self):
+        self.assertFalse(self.__acl_enabled(TEST_APPLICATION_ID))
+        application_user_role_model = create_application_user_role_model(
+            application_id=TEST_APPLICATION_ID, user_id=TEST_USER_ID_1,
+            application_role=ApplicationRole.editor, save=True)
+        self.assertTrue(self.__acl_enabled(TEST_APPLICATION_ID))
+        self.assertFalse(self.__acl_enabled(self.public_application_id))
+        db.session.delete(application_user_role_model)
+        db.session.commit()
+        self.assertFalse(self.__acl_enabled(TEST_APPLICATION_ID))
+
+    def test_acl_enabled_bulk_delete(self):
+        create_application_user_role_model(
+            application_id=TEST_APPLICATION_ID, user_id=TEST_USER_ID_1,
+            application_role=ApplicationRole.editor, save=True)
+        ApplicationUserRoleModel.query.filter(ApplicationUserRoleModel.application_id == TEST_APPLICATION_ID).delete()
+        self.assertTrue(self.__acl_enabled(TEST_APPLICATION_ID))
+        update_acl_enabled(db.session.connection(), TEST_APPLICATION_ID)
+        db.session.commit()
+        self.assertFalse(self.__acl_enabled(TEST_APPLICATION_ID))
+
+    def test_credential(self):
+        create_application_user_role_model(
+            application_id=TEST_APPLICATION_ID, user_id=TEST_USER_ID_1,
+            application_role=ApplicationRole.editor, save=True)
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, db.engine, 'before_cursor_execute', listener)
+        with self.app.app_context():
+            response = Auth().credential(TEST_USER_ID_1)
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(response['user']['user_id'], TEST_USER_ID_1)
+        self.assertEqual(response['projects'], [{'project_id': TEST_PROJECT_ID, 'project_role': 'admin'}])
+        self.assertEqual(response['applications'], [
+            {'application_id': TEST_APPLICATION_ID, 'application_role': 'editor'},
+            {'application_id': self.public_application_id, 'role': 'admin'}])
+
+    def test_credential_not_found(self):
+        with self.app.app_context():
+            self.assertIsNone(Auth().credential(100))
@@ -5,6 +5,7 @@ import grpc
 from grpc.framework.foundation import logging_pool
 import grpc_testing
 
+from rekcurd_dashboard.core import RekcurdDashboardClient
 from rekcurd_dashboard.protobuf import rekcurd_pb2
 from test.core import _client_application
 
@@ -148,3 +149,15 @@ class RekcurdDashboardClientTest(unittest.TestCase):
         self.assertEqual(_client_application.Request.EVALUATION_RESULT_REQUEST.value[1], request.result_path)
         self.assertIs(application_return_value.kind,
                       _client_application.Outcome.Kind.SATISFACTORY)
+
+    def test_decode_evaluation_details(self):
+        raw_response = rekcurd_pb2.EvaluationResultResponse(detail=[
+            _client_application.Response.EVALUATION_RESULT_RESPONSE.value.detail[0],
+            rekcurd_pb2.EvaluationResultResponse.Detail(
+                input=rekcurd_pb2.IO(tensor=rekcurd_pb2.Tensor(shape=[1], val=[0.5])),
+                label=rekcurd_pb2.IO(tensor=rekcurd_pb2.Tensor(shape=[2], val=[0.5, 1.5])),
+                output=rekcurd_pb2.IO(tensor=rekcurd_pb2.Tensor(shape=[2], val=[1.5, 0.5])),
+                score=[0.5, 0.5])])
+        self.assertEqual(RekcurdDashboardClient.decode_evaluation_details(raw_response), [
+            {'input': 'input', 'label': 'label', 'output': 'output', 'score': 1.0, 'is_correct': True},
+            {'input': 0.5, 'label': [0.5, 1.5], 'output': [1.5, 0.5], 'score': [0.5, 0.5], 'is_correct': False}])
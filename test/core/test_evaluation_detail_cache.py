@@ -0,0 +1,108 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from rekcurd_dashboard.core import EvaluationDetailCache, EvaluationDetails
+
+
+DETAILS = [
+    {'input': 'input', 'label': 'test', 'output': 'test', 'score': 1.0, 'is_correct': True},
+    {'input': 0.5, 'label': [0.9, 1.3], 'output': [0.9, 0.3], 'score': 0.5, 'is_correct': False},
+    {'input': 'あ', 'label': 'test', 'output': 'other', 'score': 0.25, 'is_correct': False},
+]
+
+
+class EvaluationDetailsTest(unittest.TestCase):
+    """Tests for EvaluationDetails.
+    """
+
+    def test_from_details(self):
+        details = EvaluationDetails.from_details(iter(DETAILS))
+        self.assertEqual(len(details), 3)
+        self.assertEqual([details.row(i) for i in range(3)], DETAILS)
+        self.assertEqual(list(details.select(offset=1, limit=1)), [1])
+        self.assertEqual(list(details.select(only_incorrect=True, offset=1)), [2])
+
+    def test_from_details_list_score(self):
+        rows = [dict(DETAILS[0], score=[0.5, 0.5]), DETAILS[1]]
+        details = EvaluationDetails.from_details(rows)
+        self.assertEqual([details.row(i) for i in range(2)], rows)
+
+    def test_from_details_max_nbytes(self):
+        rows = iter(DETAILS)
+        self.assertIsNone(EvaluationDetails.from_details(rows, max_nbytes=100))
+        self.assertEqual(next(rows), DETAILS[2])
+        self.assertEqual(len(EvaluationDetails.from_details(DETAILS, max_nbytes=1024)), 3)
+
+    def test_from_details_empty(self):
+        details = EvaluationDetails.from_details([])
+        self.assertEqual(len(details), 0)
+        self.assertEqual(list(details.select()), [])
+
+
+class EvaluationDetailCacheTest(unittest.TestCase):
+    """Tests for EvaluationDetailCache.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.date = datetime.datetime(2019, 1, 1, 12, 0, 0, 123456)
+
+    def test_get_put(self):
+        cache = EvaluationDetailCache(self.directory.name, 1024 * 1024)
+        self.assertIsNone(cache.get(1, self.date))
+        self.assertTrue(cache.put(1, self.date, EvaluationDetails.from_details(DETAILS)))
+        details = cache.get(1, self.date)
+        self.assertEqual([details.row(i) for i in range(3)], DETAILS)
+        self.assertIsNone(cache.get(1, self.date + datetime.timedelta(seconds=1)))
+        self.assertIsNone(cache.get(2, self.date))
+
+        cache.put(1, self.date + datetime.timedelta(seconds=1), EvaluationDetails.from_details(DETAILS[:1]))
+        self.assertIsNone(cache.get(1, self.date))
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+    def test_put_built(self):
+        cache = EvaluationDetailCache(self.directory.name, 100)
+        builder = cache.builder(1, self.date)
+        self.assertFalse(all(builder.add(detail) for detail in DETAILS))
+        self.assertFalse(cache.put_built(1, self.date, builder))
+        self.assertIsNone(cache.get(1, self.date))
+        self.assertIsNone(cache.builder(1, self.date))
+        self.assertIsNotNone(cache.builder(1, self.date + datetime.timedelta(seconds=1)))
+
+        cache.configure(self.directory.name, 1024 * 1024)
+        builder = cache.builder(1, self.date)
+        self.assertTrue(all(builder.add(detail) for detail in DETAILS))
+        self.assertTrue(cache.put_built(1, self.date, builder))
+        self.assertEqual(len(cache.get(1, self.date)), 3)
+
+    def test_invalidate(self):
+        cache = EvaluationDetailCache(self.directory.name, 1024 * 1024)
+        cache.put(1, self.date, EvaluationDetails.from_details(DETAILS))
+        cache.put(10, self.date, EvaluationDetails.from_details(DETAILS))
+        cache.invalidate(1)
+        self.assertIsNone(cache.get(1, self.date))
+        self.assertIsNotNone(cache.get(10, self.date))
+
+    def test_evict(self):
+        details = EvaluationDetails.from_details(DETAILS)
+        cache = EvaluationDetailCache(self.directory.name, 1024 * 1024)
+        cache.put(1, self.date, details)
+        cache.put(2, self.date, details)
+        paths = sorted(os.path.join(self.directory.name, name) for name in os.listdir(self.directory.name))
+        os.utime(paths[0], (0, 0))
+        os.utime(paths[1], (100, 100))
+        cache.get(1, self.date)
+        cache.max_size = os.path.getsize(paths[0]) * 2
+        cache.put(3, self.date, details)
+        self.assertIsNotNone(cache.get(1, self.date))
+        self.assertIsNone(cache.get(2, self.date))
+        self.assertIsNotNone(cache.get(3, self.date))
+
+    def test_disabled(self):
+        cache = EvaluationDetailCache(self.directory.name, 0)
+        self.assertFalse(cache.put(1, self.date, EvaluationDetails.from_details(DETAILS)))
+        self.assertIsNone(cache.get(1, self.date))
+        self.assertEqual(os.listdir(self.directory.name), [])
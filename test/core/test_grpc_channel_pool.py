@@ -0,0 +1,32 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from rekcurd_dashboard.core import GrpcChannelPool
+
+
+class GrpcChannelPoolTest(unittest.TestCase):
+    """Tests for GrpcChannelPool.
+    """
+
+    @patch('rekcurd_dashboard.core.grpc_channel_pool.grpc.insecure_channel')
+    def test_get_stub(self, insecure_channel):
+        insecure_channel.side_effect = lambda *args, **kwargs: Mock()
+        pool = GrpcChannelPool()
+        stub_class = Mock(side_effect=lambda channel: Mock(channel=channel))
+        stub = pool.get_stub('localhost', 5000, stub_class)
+        self.assertIs(stub, pool.get_stub('localhost', 5000, stub_class))
+        self.assertIsNot(stub, pool.get_stub('localhost', 5001, stub_class))
+        self.assertEqual(insecure_channel.call_count, 2)
+        self.assertEqual(stub_class.call_count, 2)
+        pool.close()
+        stub.channel.close.assert_called_once_with()
+
+    @patch('rekcurd_dashboard.core.grpc_channel_pool.grpc.insecure_channel')
+    def test_evict_idle_channels(self, insecure_channel):
+        insecure_channel.side_effect = lambda *args, **kwargs: Mock()
+        pool = GrpcChannelPool()
+        pool.IDLE_SECONDS = -1
+        stub_class = Mock(side_effect=lambda channel: Mock(channel=channel))
+        stub = pool.get_stub('localhost', 5000, stub_class)
+        self.assertIsNot(stub, pool.get_stub('localhost', 5000, stub_class))
+        stub.channel.close.assert_not_called()
@@ -1,4 +1,8 @@
+import io
 import unittest
+from unittest.mock import patch, Mock
+
+from botocore.exceptions import ClientError
 
 from rekcurd_dashboard.models import DataServerModel, DataServerModeEnum
 from rekcurd_dashboard.data_servers import AwsS3Handler
@@ -23,3 +27,74 @@ class AwsS3HandlerTest(unittest.TestCase):
     @patch_predictor()
     def test_upload(self):
         self.assertIsNone(self.handler.upload(self.data_server_model, "remote", "local"))
+
+    @patch('rekcurd_dashboard.data_servers.aws_s3_handler.boto3.session.Session')
+    def test_upload_stream(self, session):
+        AwsS3Handler.invalidate_clients(1)
+        stream = io.BytesIO(b"dummy")
+        handler = AwsS3Handler(part_size=5 * 1024 * 1024, max_concurrency=2)
+        self.assertIsNone(handler.upload_stream(self.data_server_model, "remote", stream))
+        args, kwargs = session.return_value.client.return_value.upload_fileobj.call_args
+        self.assertEqual(args, (stream, "xxx", "remote"))
+        self.assertEqual(kwargs["Config"].multipart_chunksize, 5 * 1024 * 1024)
+        self.assertEqual(kwargs["Config"].max_request_concurrency, 2)
+
+    @patch('rekcurd_dashboard.data_servers.aws_s3_handler.boto3.session.Session')
+    def test_multipart_upload(self, session):
+        AwsS3Handler.invalidate_clients(1)
+        client = session.return_value.client.return_value
+        client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+        client.upload_part.return_value = {"ETag": "etag"}
+        self.assertEqual(self.handler.initiate_multipart_upload(self.data_server_model, "remote"), "upload-id")
+        stream = io.BytesIO(b"dummy")
+        self.assertEqual(self.handler.upload_part(
+            self.data_server_model, "remote", "upload-id", 1, stream, 5, "275876e34cf609db118f3d84b799a790"), "etag")
+        client.upload_part.assert_called_once_with(
+            Bucket="xxx", Key="remote", UploadId="upload-id", PartNumber=1, Body=stream, ContentLength=5,
+            ContentMD5="J1h240z2CdsRjz2Et5mnkA==")
+        self.handler.complete_multipart_upload(self.data_server_model, "remote", "upload-id", [(1, "etag")])
+        client.complete_multipart_upload.assert_called_once_with(
+            Bucket="xxx", Key="remote", UploadId="upload-id",
+            MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": "etag"}]})
+
+    @patch('rekcurd_dashboard.data_servers.aws_s3_handler.boto3.session.Session')
+    def test_exists(self, session):
+        AwsS3Handler.invalidate_clients(1)
+        client = session.return_value.client.return_value
+        self.assertTrue(self.handler.exists(self.data_server_model, "remote"))
+        client.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        self.assertFalse(self.handler.exists(self.data_server_model, "remote"))
+        client.head_object.side_effect = ClientError({"Error": {"Code": "403"}}, "HeadObject")
+        with self.assertRaises(ClientError):
+            self.handler.exists(self.data_server_model, "remote")
+
+    @patch('rekcurd_dashboard.data_servers.aws_s3_handler.boto3.session.Session')
+    def test_copy(self, session):
+        AwsS3Handler.invalidate_clients(1)
+        client = session.return_value.client.return_value
+        self.assertIsNone(self.handler.copy(self.data_server_model, "src", "dst"))
+        args, kwargs = client.copy.call_args
+        self.assertEqual(args, ({"Bucket": "xxx", "Key": "src"}, "xxx", "dst"))
+        self.assertEqual(kwargs["Config"].multipart_chunksize, AwsS3Handler.DEFAULT_PART_SIZE)
+
+    @patch('rekcurd_dashboard.data_servers.aws_s3_handler.boto3.session.Session')
+    def test_open_read(self, session):
+        AwsS3Handler.invalidate_clients(1)
+        client = session.return_value.client.return_value
+        client.get_object.return_value = {"Body": io.BytesIO(b"2345"), "ContentLength": 4}
+        chunks, content_length = self.handler.open_read(self.data_server_model, "remote", 2, 5)
+        self.assertEqual(b"".join(chunks), b"2345")
+        self.assertEqual(content_length, 4)
+        client.get_object.assert_called_once_with(Bucket="xxx", Key="remote", Range="bytes=2-5")
+
+    @patch('rekcurd_dashboard.data_servers.aws_s3_handler.boto3.session.Session')
+    def test_client_cache(self, session):
+        AwsS3Handler.invalidate_clients(1)
+        session.return_value.client.side_effect = lambda *args, **kwargs: Mock()
+        client, _ = self.handler._initialize(self.data_server_model)
+        self.assertIs(client, self.handler._initialize(self.data_server_model)[0])
+        self.data_server_model.aws_secret_key = "yyy"
+        self.assertIsNot(client, self.handler._initialize(self.data_server_model)[0])
+        client, _ = self.handler._initialize(self.data_server_model)
+        AwsS3Handler.invalidate_clients(1)
+        self.assertIsNot(client, self.handler._initialize(self.data_server_model)[0])
@@ -1,4 +1,6 @@
+import io
 import unittest
+from unittest.mock import patch
 
 from rekcurd_dashboard.models import DataServerModel, DataServerModeEnum
 from rekcurd_dashboard.data_servers import CephHandler
@@ -24,3 +26,39 @@ class CephHandlerTest(unittest.TestCase):
     @patch_predictor()
     def test_upload(self):
         self.assertIsNone(self.handler.upload(self.data_server_model, "remote", "local"))
+
+    @patch('rekcurd_dashboard.data_servers.ceph_handler.boto.connect_s3')
+    def test_upload_stream(self, connect_s3):
+        CephHandler.invalidate_clients(1)
+        bucket = connect_s3.return_value.get_bucket.return_value
+        multipart_upload = bucket.initiate_multipart_upload.return_value
+        multipart_upload.id = "upload-id"
+        handler = CephHandler(part_size=4, max_concurrency=2)
+        with patch('rekcurd_dashboard.data_servers.ceph_handler.boto.s3.multipart.MultiPartUpload') as part_upload:
+            parts = dict()
+            part_upload.return_value.upload_part_from_file.side_effect = \
+                lambda fp, part_num, size: parts.update({part_num: fp.read()})
+            self.assertIsNone(handler.upload_stream(self.data_server_model, "remote", io.BytesIO(b"0123456789")))
+        self.assertEqual(parts, {1: b"0123", 2: b"4567", 3: b"89"})
+        multipart_upload.complete_upload.assert_called_once_with()
+
+    @patch('rekcurd_dashboard.data_servers.ceph_handler.boto.connect_s3')
+    def test_upload_stream_small(self, connect_s3):
+        CephHandler.invalidate_clients(1)
+        bucket = connect_s3.return_value.get_bucket.return_value
+        handler = CephHandler(part_size=4, max_concurrency=2)
+        self.assertIsNone(handler.upload_stream(self.data_server_model, "remote", io.BytesIO(b"012")))
+        bucket.new_key.return_value.set_contents_from_string.assert_called_once_with(b"012", replace=False)
+        bucket.initiate_multipart_upload.assert_not_called()
+
+    @patch('rekcurd_dashboard.data_servers.ceph_handler.boto.connect_s3')
+    def test_open_read(self, connect_s3):
+        CephHandler.invalidate_clients(1)
+        key = connect_s3.return_value.get_bucket.return_value.get_key.return_value
+        key.size = 10
+        key.read.side_effect = io.BytesIO(b"23456789").read
+        chunks, content_length = self.handler.open_read(self.data_server_model, "remote", 2)
+        self.assertEqual(b"".join(chunks), b"23456789")
+        self.assertEqual(content_length, 8)
+        key.open_read.assert_called_once_with(headers={"Range": "bytes=2-9"})
+        key.close.assert_called_once_with(fast=True)
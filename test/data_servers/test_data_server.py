@@ -58,6 +58,24 @@ class DataServerTest(unittest.TestCase):
         self.assertIsNotNone(self.data_server.upload_evaluation_data(
             self.data_server_model_local, self.application_model, self.local_filepath))
 
+    @patch_predictor()
+    def test_upload_model_stream(self):
+        with open('test/dummy', 'rb') as fp:
+            self.assertIsNotNone(self.data_server.upload_model(
+                self.data_server_model_ceph, self.application_model, stream=fp))
+
+    @patch_predictor()
+    def test_upload_model_content_addressed(self):
+        handler = self.data_server._get_handler(self.data_server_model_aws)
+        with open('test/dummy', 'rb') as fp:
+            self.assertEqual(self.data_server.upload_model(
+                self.data_server_model_aws, self.application_model, stream=fp, checksum="abc"), "models/abc.model")
+        handler.upload_stream.assert_called_once()
+        handler.exists.return_value = True
+        self.assertEqual(self.data_server.upload_model(
+            self.data_server_model_aws, self.application_model, stream=fp, checksum="abc"), "models/abc.model")
+        handler.upload_stream.assert_called_once()
+
     @patch_predictor()
     def test_delete_file(self):
         self.assertIsNone(self.data_server.delete_file(
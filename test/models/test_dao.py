@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+
+from rekcurd_dashboard.models import InstrumentedQueuePool, PoolStats
+
+
+class PoolStatsTest(unittest.TestCase):
+    """Tests for PoolStats.
+    """
+
+    def test_serialize(self):
+        stats = PoolStats()
+        stats.observe(0.0005)
+        stats.observe(0.05)
+        stats.observe(30.0, timeout=True)
+        result = stats.serialize()
+        self.assertEqual(result['checkouts'], 2)
+        self.assertEqual(result['timeouts'], 1)
+        self.assertEqual(result['wait_seconds_max'], 30.0)
+        self.assertEqual(result['wait_seconds_buckets'],
+                         {'0.001': 1, '0.01': 1, '0.1': 2, '1.0': 2, '10.0': 2, 'inf': 3})
+
+
+class InstrumentedQueuePoolTest(unittest.TestCase):
+    """Tests for InstrumentedQueuePool.
+    """
+
+    def create_engine(self, pool_timeout):
+        return create_engine(
+            'sqlite://', poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=pool_timeout)
+
+    def test_checkout(self):
+        engine = self.create_engine(pool_timeout=5)
+        connection = engine.connect()
+        threading.Timer(0.05, connection.close).start()
+        engine.connect().close()
+        stats = engine.pool.stats.serialize()
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['timeouts'], 0)
+        self.assertGreaterEqual(stats['wait_seconds_max'], 0.05)
+
+    def test_timeout(self):
+        engine = self.create_engine(pool_timeout=0.01)
+        connection = engine.connect()
+        self.assertRaises(TimeoutError, engine.connect)
+        connection.close()
+        self.assertEqual(engine.pool.stats.serialize()['timeouts'], 1)
@@ -0,0 +1,99 @@
+import json
+
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import inspect
+
+from rekcurd_dashboard.console_scripts.db_handler import MIGRATION_DIR
+from rekcurd_dashboard.models import (
+    db, ApplicationModel, ApplicationUserRoleModel, ApplicationRole, EvaluationModel, EvaluationResultModel,
+    KubernetesModel, ModelModel, ServiceModel
+)
+
+from test.base import (
+    BaseTestCase, create_application_user_role_model, create_eval_model, create_eval_result_model,
+    TEST_APPLICATION_ID, TEST_MODEL_ID, TEST_PROJECT_ID,
+    TEST_USER_ID_1
+)
+
+
+class IndexTest(BaseTestCase):
+    """Tests that hot queries of the APIs use indexes.
+    """
+
+    def assertUsingIndex(self, query, index_name):
+        sql = str(query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+        plan = ' '.join(row[-1] for row in db.session.execute('EXPLAIN QUERY PLAN ' + sql))
+        self.assertIn(index_name, plan, msg=sql)
+
+    def test_service(self):
+        self.assertUsingIndex(db.session.query(ServiceModel).filter(
+            ServiceModel.application_id == TEST_APPLICATION_ID,
+            ServiceModel.service_level == 'development'), 'ix_services_application_id_service_level')
+        self.assertUsingIndex(db.session.query(ServiceModel).filter(
+            ServiceModel.model_id == TEST_MODEL_ID), 'ix_services_model_id')
+
+    def test_evaluation(self):
+        self.assertUsingIndex(db.session.query(EvaluationModel).filter(
+            EvaluationModel.application_id == TEST_APPLICATION_ID).order_by(EvaluationModel.register_date),
+            'ix_evaluations_application_id_register_date')
+        self.assertUsingIndex(db.session.query(EvaluationResultModel).filter(
+            EvaluationResultModel.model_id == TEST_MODEL_ID, EvaluationResultModel.evaluation_id == 1),
+            'ix_evaluation_results_model_id_evaluation_id')
+
+    def test_model(self):
+        self.assertUsingIndex(db.session.query(ModelModel).filter(
+            ModelModel.application_id == TEST_APPLICATION_ID, ModelModel.checksum == 'checksum'),
+            'ix_models_application_id_checksum')
+
+    def test_role_and_kubernetes(self):
+        self.assertUsingIndex(db.session.query(ApplicationUserRoleModel).filter(
+            ApplicationUserRoleModel.application_id == TEST_APPLICATION_ID),
+            'sqlite_autoindex_application_user_roles')
+        self.assertUsingIndex(db.session.query(KubernetesModel).filter(
+            KubernetesModel.project_id == TEST_PROJECT_ID), 'ix_kubernetes_project_id')
+
+
+class MigrationTest(BaseTestCase):
+    """Tests for the shipped migrations.
+    """
+
+    def setUp(self):
+        super().setUp()
+        Migrate(self.app, db, directory=MIGRATION_DIR)
+
+    def tearDown(self):
+        db.session.execute('DROP TABLE IF EXISTS alembic_version')
+        super().tearDown()
+
+    def test_upgrade(self):
+        db.session.execute('DROP INDEX ix_services_model_id')
+        db.session.commit()
+        upgrade()
+        index_names = {index['name'] for index in inspect(db.engine).get_indexes('services')}
+        self.assertIn('ix_services_model_id', index_names)
+        upgrade()
+
+    def test_upgrade_acl_enabled(self):
+        create_application_user_role_model(
+            application_id=TEST_APPLICATION_ID, user_id=TEST_USER_ID_1,
+            application_role=ApplicationRole.editor, save=True)
+        db.session.execute('UPDATE applications SET acl_enabled = 0')
+        db.session.commit()
+        upgrade()
+        self.assertTrue(db.session.query(ApplicationModel.acl_enabled).filter(
+            ApplicationModel.application_id == TEST_APPLICATION_ID).scalar())
+
+    def test_upgrade_evaluation_metrics(self):
+        evaluation_model = create_eval_model(TEST_APPLICATION_ID, save=True)
+        for accuracy in (0.5, 0.9):
+            create_eval_result_model(
+                evaluation_id=evaluation_model.evaluation_id,
+                result=json.dumps({'num': 10, 'accuracy': accuracy, 'fvalue': [accuracy, 0.1]}), save=True)
+        EvaluationResultModel.query.update({EvaluationResultModel.num: None, EvaluationResultModel.accuracy: None,
+                                            EvaluationResultModel.fvalue_mean: None})
+        db.session.commit()
+        upgrade()
+        self.assertEqual(
+            db.session.query(EvaluationResultModel.num, EvaluationResultModel.accuracy,
+                             EvaluationResultModel.fvalue_mean).order_by(EvaluationResultModel.accuracy).all(),
+            [(10, 0.5, 0.3), (10, 0.9, 0.5)])
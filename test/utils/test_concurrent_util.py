@@ -0,0 +1,26 @@
+import time
+import unittest
+
+from rekcurd_dashboard.utils import ConcurrentUtil
+
+
+class ConcurrentUtilTest(unittest.TestCase):
+    """Tests for ConcurrentUtil.
+    """
+
+    def test_run(self):
+        def fail():
+            raise ValueError('failed')
+        results = ConcurrentUtil.run([('a', lambda: 1), ('b', fail), ('c', lambda: 3)])
+        self.assertEqual([r.key for r in results], ['a', 'b', 'c'])
+        self.assertEqual([r.status for r in results], [True, False, True])
+        self.assertEqual(results[0].result, 1)
+        self.assertIsInstance(results[1].error, ValueError)
+
+    def test_run_timeout(self):
+        results = ConcurrentUtil.run([('slow', lambda: time.sleep(1)), ('fast', lambda: 1)], timeout=0.1)
+        self.assertFalse(results[0].status)
+        self.assertTrue(results[1].status)
+
+    def test_run_empty(self):
+        self.assertEqual(ConcurrentUtil.run([]), [])
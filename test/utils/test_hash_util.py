@@ -1,8 +1,9 @@
+import hashlib
 import unittest
 
 from werkzeug.datastructures import FileStorage
 
-from rekcurd_dashboard.utils import HashUtil
+from rekcurd_dashboard.utils import HashUtil, HashingReader
 
 
 class HashUtilTest(unittest.TestCase):
@@ -19,3 +20,23 @@ class HashUtilTest(unittest.TestCase):
         with open('test/dummy', 'rb') as fp:
             file = FileStorage(fp)
             self.assertEqual(HashUtil.checksum(file), '275876e34cf609db118f3d84b799a790')
+
+    def test_chunk_size(self):
+        self.assertEqual(HashUtil.chunk_size(5), HashUtil.MIN_CHUNK_SIZE)
+        self.assertEqual(HashUtil.chunk_size(64 * 1024 * 1024), 2 * 1024 * 1024)
+        self.assertEqual(HashUtil.chunk_size(5 * 1024 * 1024 * 1024), HashUtil.MAX_CHUNK_SIZE)
+        self.assertEqual(HashUtil.chunk_size(None), HashUtil.MAX_CHUNK_SIZE)
+
+
+class HashingReaderTest(unittest.TestCase):
+    """Tests for HashingReader.
+    """
+
+    def test_read(self):
+        with open('test/dummy', 'rb') as fp:
+            reader = HashingReader(fp, algorithms=('md5', 'blake2b'))
+            self.assertEqual(reader.read(2) + reader.read(), b'dummy')
+        self.assertEqual(reader.size, 5)
+        self.assertEqual(reader.hexdigest(), '275876e34cf609db118f3d84b799a790')
+        self.assertEqual(reader.hexdigest('blake2b'), hashlib.blake2b(b'dummy').hexdigest())
+        self.assertFalse(hasattr(reader, 'seek'))